@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Core app configs."""
+from django.apps import AppConfig
+from django.conf import settings
+from django.template.loader import get_template
+
+
+class CoreConfig(AppConfig):
+    """Core app config."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self) -> None:
+        """Connect the app's signal receivers and preload templates."""
+        from . import receivers  # noqa: F401.
+
+        # Compiled once here rather than by the first request to use them.
+        for template_name in settings.TEMPLATE_PRELOAD:
+            get_template(template_name)
@@ -11,6 +11,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from .handlers import StaticFilesASGIApplication
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+# Serves files collected to STATIC_ROOT, pre-compressed and cached far-future:
+application = StaticFilesASGIApplication(get_asgi_application())
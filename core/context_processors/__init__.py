@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Core template context processors."""
+
+from ._template_fragments import template_fragments  # noqa: F401.
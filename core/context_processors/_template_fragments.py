@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest
+
+
+@lru_cache(maxsize=None)
+def static_version() -> str:
+    """A digest of the static files manifest, changing on each new asset.
+
+    Returns:
+        str: The digest, empty without a manifest.
+    """
+    hashed_files = getattr(staticfiles_storage, "hashed_files", None)
+    if not hashed_files:
+        return ""
+    manifest = json.dumps(hashed_files, sort_keys=True).encode()
+    return hashlib.sha256(manifest).hexdigest()[:12]
+
+
+@receiver(setting_changed)
+def _reset_static_version(setting: str, **kwargs: Any) -> None:
+    """Forget the static version when the static files settings change.
+
+    Args:
+        setting (str): The changed setting.
+        kwargs: Other signal arguments.
+    """
+    if setting in ("STATIC_ROOT", "STATIC_URL", "STATICFILES_STORAGE"):
+        static_version.cache_clear()
+
+
+def template_fragments(request: HttpRequest) -> dict[str, Optional[Any]]:
+    """Add the timeout and version for caching site-wide template fragments.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        dict[str, Any | None]: TEMPLATE_FRAGMENT_TIMEOUT and STATIC_VERSION.
+    """
+    return {
+        "TEMPLATE_FRAGMENT_TIMEOUT": settings.TEMPLATE_FRAGMENT_TIMEOUT,
+        "STATIC_VERSION": static_version(),
+    }
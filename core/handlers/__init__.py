@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""Core request handlers."""
+
+from ._static_files import (  # noqa: F401.
+    StaticFiles,
+    StaticFilesASGIApplication,
+    StaticFilesWSGIApplication,
+)
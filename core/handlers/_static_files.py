@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import mimetypes
+import os
+from collections.abc import Awaitable, Iterable, Iterator
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+ENCODINGS = {"br": ".br", "gzip": ".gz"}  # In order of preference.
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class StaticFile:
+    """A collected static file and its compressed variants."""
+
+    path: Path
+    size: int
+    headers: list[tuple[str, str]]
+    etag: str
+    variants: dict[str, tuple[Path, int]] = field(default_factory=dict)
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Parse an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): The header.
+
+    Returns:
+        set[str]: The encodings accepted, without those with a q of 0.
+    """
+    accepted = set()
+    for coding in accept_encoding.lower().split(","):
+        name, _, parameters = coding.partition(";")
+        quality = parameters.strip().removeprefix("q=")
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            pass
+        accepted.add(name.strip())
+    return accepted
+
+
+class StaticFiles:
+    """Index of the collected static files, with their response headers.
+
+    Files in the manifest have content hashed names, so are sent with
+    immutable far-future cache headers. Others must be revalidated.
+    """
+
+    def __init__(self) -> None:
+        """Index the files collected to STATIC_ROOT."""
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        if not self.prefix.startswith("/"):
+            self.prefix = "/" + self.prefix
+        self.files: dict[str, StaticFile] = {}
+        if not settings.STATIC_ROOT or not os.path.isdir(settings.STATIC_ROOT):
+            return
+        hashed = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        root = Path(settings.STATIC_ROOT)
+        for path in root.rglob("*"):
+            if not path.is_file() or path.suffix in (".gz", ".br"):
+                continue
+            name = path.relative_to(root).as_posix()
+            stat = path.stat()
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type.endswith(
+                ("javascript", "json", "xml")
+            ):
+                content_type += "; charset=utf-8"
+            # Weak, as the same for each encoding.
+            etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            static_file = StaticFile(
+                path=path,
+                size=stat.st_size,
+                etag=etag,
+                headers=[
+                    ("Content-Type", content_type),
+                    ("Cache-Control", IMMUTABLE if name in hashed else REVALIDATE),
+                    ("Last-Modified", formatdate(stat.st_mtime, usegmt=True)),
+                    ("ETag", etag),
+                ],
+            )
+            for encoding, extension in ENCODINGS.items():
+                variant = path.with_name(path.name + extension)
+                if variant.is_file():
+                    static_file.variants[encoding] = (variant, variant.stat().st_size)
+            if static_file.variants:
+                static_file.headers.append(("Vary", "Accept-Encoding"))
+            self.files[self.prefix + name] = static_file
+
+    def respond(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+    ) -> Optional[tuple[int, list[tuple[str, str]], Optional[Path]]]:
+        """Build the response to a request for a static file.
+
+        Args:
+            method (str): The request method.
+            path (str): The request path.
+            headers (dict[str, str]): The request headers, lowercase named.
+
+        Returns:
+            tuple[int, list[tuple[str, str]], Path | None], optional: The
+                status, headers and file to send, None if not a static file.
+        """
+        static_file = self.files.get(path)
+        if static_file is None:
+            return None
+        if method not in ("GET", "HEAD"):
+            return 405, [("Allow", "GET, HEAD"), ("Content-Length", "0")], None
+        if static_file.etag in headers.get("if-none-match", ""):
+            return 304, static_file.headers, None
+        accepted = accepted_encodings(headers.get("accept-encoding", ""))
+        for encoding, (variant, size) in static_file.variants.items():
+            if encoding in accepted:
+                response_headers = static_file.headers + [
+                    ("Content-Encoding", encoding),
+                    ("Content-Length", str(size)),
+                ]
+                return 200, response_headers, None if method == "HEAD" else variant
+        response_headers = static_file.headers + [
+            ("Content-Length", str(static_file.size)),
+        ]
+        return 200, response_headers, None if method == "HEAD" else static_file.path
+
+
+def _read_chunks(path: Path) -> Iterator[bytes]:
+    """Read a file in chunks.
+
+    Args:
+        path (Path): The file.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    with path.open("rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+class StaticFilesWSGIApplication:
+    """WSGI application serving collected static files before Django."""
+
+    def __init__(self, application: Callable[..., Iterable[bytes]]) -> None:
+        """Wrap an application.
+
+        Args:
+            application (Callable[..., Iterable[bytes]]): The WSGI application.
+        """
+        self.application = application
+        self.static_files = StaticFiles()
+
+    def __call__(
+        self,
+        environ: dict[str, Any],
+        start_response: Callable[..., Any],
+    ) -> Iterable[bytes]:
+        """Serve a static file or pass the request on.
+
+        Args:
+            environ (dict[str, Any]): The WSGI environ.
+            start_response (Callable[..., Any]): The WSGI start_response.
+
+        Returns:
+            Iterable[bytes]: The response body.
+        """
+        response = self.static_files.respond(
+            environ["REQUEST_METHOD"],
+            environ.get("PATH_INFO", ""),
+            {
+                "if-none-match": environ.get("HTTP_IF_NONE_MATCH", ""),
+                "accept-encoding": environ.get("HTTP_ACCEPT_ENCODING", ""),
+            },
+        )
+        if response is None:
+            return self.application(environ, start_response)
+        status, headers, path = response
+        reasons = {200: "OK", 304: "Not Modified", 405: "Method Not Allowed"}
+        start_response(f"{status} {reasons[status]}", headers)
+        if path is None:
+            return []
+        if "wsgi.file_wrapper" in environ:
+            return environ["wsgi.file_wrapper"](path.open("rb"), CHUNK_SIZE)
+        return _read_chunks(path)
+
+
+class StaticFilesASGIApplication:
+    """ASGI application serving collected static files before Django."""
+
+    def __init__(self, application: Callable[..., Awaitable[None]]) -> None:
+        """Wrap an application.
+
+        Args:
+            application (Callable[..., Awaitable[None]]): The ASGI application.
+        """
+        self.application = application
+        self.static_files = StaticFiles()
+
+    async def __call__(
+        self,
+        scope: dict[str, Any],
+        receive: Callable[[], Awaitable[dict]],
+        send: Callable[[dict], Awaitable[None]],
+    ) -> None:
+        """Serve a static file or pass the request on.
+
+        Args:
+            scope (dict[str, Any]): The connection scope.
+            receive (Callable[[], Awaitable[dict]]): Receives events.
+            send (Callable[[dict], Awaitable[None]]): Sends events.
+        """
+        response = None
+        if scope["type"] == "http":
+            response = self.static_files.respond(
+                scope["method"],
+                scope["path"],
+                {
+                    name.decode("latin-1").lower(): value.decode("latin-1")
+                    for name, value in scope["headers"]
+                },
+            )
+        if response is None:
+            await self.application(scope, receive, send)
+            return
+        status, headers, path = response
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ],
+            }
+        )
+        if path is None:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        loop = asyncio.get_running_loop()
+        with path.open("rb") as file:
+            chunk = await loop.run_in_executor(None, file.read, CHUNK_SIZE)
+            while True:
+                following = await loop.run_in_executor(None, file.read, CHUNK_SIZE)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": bool(following),
+                    }
+                )
+                if not following:
+                    break
+                chunk = following
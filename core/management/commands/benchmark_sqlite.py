@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""Benchmark concurrent SQLite reads and writes for each database profile."""
+
+import json
+import random
+import sqlite3
+import statistics
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+
+def _connect(path: Path, pragmas: dict[str, Any]) -> sqlite3.Connection:
+    """Open a connection the way Django does, then set the pragmas.
+
+    Args:
+        path (Path): The database file.
+        pragmas (dict[str, Any]): The pragmas to set.
+
+    Returns:
+        sqlite3.Connection: The autocommit connection.
+    """
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    for pragma, value in pragmas.items():
+        connection.execute(f"PRAGMA {pragma} = {value}")
+    return connection
+
+
+def _worker(
+    operation: Callable[[sqlite3.Connection, int], None],
+    path: Path,
+    pragmas: dict[str, Any],
+    rows: int,
+    reconnect: bool,
+    start: threading.Barrier,
+    deadline: list[float],
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    """Repeat an operation until the deadline, recording its latencies.
+
+    Args:
+        operation (Callable[[sqlite3.Connection, int], None]): The operation,
+            given a connection and a random row id.
+        path (Path): The database file.
+        pragmas (dict[str, Any]): The pragmas to set on each connection.
+        rows (int): The number of rows in the table.
+        reconnect (bool): Whether to connect for each operation, like a
+            CONN_MAX_AGE of 0, rather than once.
+        start (threading.Barrier): Released when every worker is ready.
+        deadline (list[float]): Holds the time to stop at once started.
+        latencies (list[float]): Receives the operations' latencies in ms.
+        errors (list[str]): Receives the operations' errors.
+    """
+    connection = None if reconnect else _connect(path, pragmas)
+    try:
+        start.wait()
+        while perf_counter() < deadline[0]:
+            started = perf_counter()
+            try:
+                if reconnect:
+                    connection = _connect(path, pragmas)
+                try:
+                    operation(connection, random.randint(1, rows))
+                finally:
+                    if reconnect:
+                        connection.close()
+            except sqlite3.OperationalError as error:
+                errors.append(str(error))
+                continue
+            latencies.append((perf_counter() - started) * 1000)
+    finally:
+        if not reconnect:
+            connection.close()
+
+
+def _read(connection: sqlite3.Connection, row_id: int) -> None:
+    """Read a row.
+
+    Args:
+        connection (sqlite3.Connection): The connection.
+        row_id (int): The row to read.
+    """
+    connection.execute(
+        "SELECT id, email, payload FROM benchmark WHERE id = ?", (row_id,)
+    ).fetchone()
+
+
+def _write(connection: sqlite3.Connection, row_id: int) -> None:
+    """Update a row in its own transaction.
+
+    Args:
+        connection (sqlite3.Connection): The connection.
+        row_id (int): The row to update.
+    """
+    connection.execute(
+        "UPDATE benchmark SET payload = ? WHERE id = ?",
+        (random.randbytes(64).hex(), row_id),
+    )
+
+
+def _summarise(latencies: list[float], errors: list[str], seconds: float) -> dict:
+    """Summarise one kind of operation's results.
+
+    Args:
+        latencies (list[float]): The successful operations' latencies in ms.
+        errors (list[str]): The failed operations' errors.
+        seconds (float): The benchmark's duration.
+
+    Returns:
+        dict: The throughput, latency percentiles and error count.
+    """
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        percentiles = [latencies[0] if latencies else 0.0] * 99
+    return {
+        "operations": len(latencies),
+        "per_second": len(latencies) / seconds,
+        "p50_ms": percentiles[49],
+        "p99_ms": percentiles[98],
+        "errors": len(errors),
+    }
+
+
+class Command(BaseCommand):
+    """Benchmark concurrent SQLite reads and writes for each database profile."""
+
+    help = (
+        "Run reader and writer threads against a scratch SQLite database with"
+        " each profile's pragmas and report the throughput of both."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "--profile",
+            nargs="+",
+            default=list(settings.SQLITE_PROFILES),
+            help="SQLITE_PROFILES to compare. Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Reading threads. Defaults to 4.",
+        )
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=1,
+            help="Writing threads. Defaults to 1.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Rows in the scratch table. Defaults to 10000.",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=5.0,
+            help="Duration per profile. Defaults to 5 seconds.",
+        )
+        parser.add_argument(
+            "--reconnect",
+            action="store_true",
+            help="Connect for each operation, as with a CONN_MAX_AGE of 0.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the results as JSON.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the benchmark.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If a profile doesn't exist.
+        """
+        unknown = set(options["profile"]) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}.")
+        results = []
+        for profile in options["profile"]:
+            with TemporaryDirectory() as directory:
+                results.append(
+                    {
+                        "profile": profile,
+                        **self._benchmark(
+                            Path(directory) / "benchmark.sqlite3",
+                            settings.SQLITE_PROFILES[profile],
+                            options,
+                        ),
+                    }
+                )
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'profile':<12} {'reads/s':>9} {'p99':>9} {'errors':>6}"
+            f" {'writes/s':>9} {'p99':>9} {'errors':>6}"
+        )
+        for result in results:
+            reads, writes = result["reads"], result["writes"]
+            self.stdout.write(
+                f"{result['profile']:<12} {reads['per_second']:>9.0f}"
+                f" {reads['p99_ms']:>7.2f}ms {reads['errors']:>6}"
+                f" {writes['per_second']:>9.0f}"
+                f" {writes['p99_ms']:>7.2f}ms {writes['errors']:>6}"
+            )
+
+    def _benchmark(
+        self,
+        path: Path,
+        pragmas: dict[str, Any],
+        options: dict[str, Any],
+    ) -> dict[str, dict]:
+        """Benchmark a profile's pragmas on a new database.
+
+        Args:
+            path (Path): The scratch database file.
+            pragmas (dict[str, Any]): The profile's pragmas.
+            options (dict[str, Any]): The parsed command options.
+
+        Returns:
+            dict[str, dict]: The reads' and writes' summaries.
+        """
+        connection = _connect(path, pragmas)
+        connection.execute(
+            "CREATE TABLE benchmark"
+            " (id INTEGER PRIMARY KEY, email TEXT NOT NULL, payload TEXT)"
+        )
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT INTO benchmark (email) VALUES (?)",
+            ((f"user{row}@example.com",) for row in range(options["rows"])),
+        )
+        connection.execute("COMMIT")
+        connection.close()
+        operations = [(_read, "reads")] * options["readers"]
+        operations += [(_write, "writes")] * options["writers"]
+        start = threading.Barrier(len(operations) + 1)
+        deadline = [0.0]
+        latencies = {"reads": [], "writes": []}
+        errors = {"reads": [], "writes": []}
+        threads = [
+            threading.Thread(
+                target=_worker,
+                args=(
+                    operation,
+                    path,
+                    pragmas,
+                    options["rows"],
+                    options["reconnect"],
+                    start,
+                    deadline,
+                    latencies[kind],
+                    errors[kind],
+                ),
+            )
+            for operation, kind in operations
+        ]
+        for thread in threads:
+            thread.start()
+        deadline[0] = perf_counter() + options["seconds"]
+        start.wait()
+        for thread in threads:
+            thread.join()
+        return {
+            kind: _summarise(latencies[kind], errors[kind], options["seconds"])
+            for kind in ("reads", "writes")
+        }
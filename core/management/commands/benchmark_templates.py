@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Benchmark rendering templates with each template profile."""
+
+import json
+import statistics
+from time import perf_counter
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.template.backends.django import DjangoTemplates
+from django.template.loader import get_template
+from django.test import RequestFactory, override_settings
+
+
+class Command(BaseCommand):
+    """Benchmark rendering templates with each template profile."""
+
+    help = (
+        "Load and render templates repeatedly, as views do, with an engine"
+        " configured by each of the TEMPLATE_PROFILES, and compare them."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "--template",
+            nargs="+",
+            default=["core/template.html"],
+            help="Templates to render. Defaults to core/template.html.",
+        )
+        parser.add_argument(
+            "--profile",
+            nargs="+",
+            default=list(settings.TEMPLATE_PROFILES),
+            help="TEMPLATE_PROFILES to compare. Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Renders to time per template and profile. Defaults to 2000.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the results as JSON.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the benchmark.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If a profile doesn't exist or no renders are to be
+                timed.
+        """
+        if options["iterations"] < 1:
+            raise CommandError("Time at least one render per template and profile.")
+        unknown = set(options["profile"]) - set(settings.TEMPLATE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}.")
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        for template_name in options["template"]:
+            # Warm up shared state, e.g. imported tag libraries, for the first.
+            get_template(template_name).render({}, request)
+        results = [
+            {
+                "profile": profile,
+                "template": template_name,
+                **self._benchmark(profile, template_name, request, options),
+            }
+            for template_name in options["template"]
+            for profile in options["profile"]
+        ]
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'template':<28} {'profile':<12} {'first':>9} {'p50':>9}"
+            f" {'p99':>9} {'renders/s':>10}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['template']:<28} {result['profile']:<12}"
+                f" {result['first_ms']:>7.2f}ms {result['p50_ms']:>7.3f}ms"
+                f" {result['p99_ms']:>7.3f}ms {result['per_second']:>10.0f}"
+            )
+
+    def _benchmark(
+        self,
+        profile: str,
+        template_name: str,
+        request: Any,
+        options: dict[str, Any],
+    ) -> dict[str, float]:
+        """Time loading and rendering a template with a new engine.
+
+        Args:
+            profile (str): The template profile.
+            template_name (str): The template.
+            request (Any): The request to render for.
+            options (dict[str, Any]): The parsed command options.
+
+        Returns:
+            dict[str, float]: The first render's and later renders' timings.
+        """
+        config = settings.TEMPLATE_PROFILES[profile]
+        base = settings.TEMPLATES[0]
+        options_without_loaders = {
+            name: value for name, value in base["OPTIONS"].items() if name != "loaders"
+        }
+        backend = DjangoTemplates(
+            {
+                "NAME": f"benchmark-{profile}",
+                "DIRS": base["DIRS"],
+                "APP_DIRS": config["APP_DIRS"],
+                "OPTIONS": {**options_without_loaders, **config["OPTIONS"]},
+            }
+        )
+        latencies = []
+        with override_settings(TEMPLATE_FRAGMENT_TIMEOUT=config["FRAGMENT_TIMEOUT"]):
+            for _iteration in range(options["iterations"] + 1):
+                started = perf_counter()
+                backend.get_template(template_name).render({}, request)
+                latencies.append((perf_counter() - started) * 1000)
+        first, latencies = latencies[0], latencies[1:]
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        else:
+            percentiles = latencies * 99
+        return {
+            "first_ms": first,
+            "p50_ms": percentiles[49],
+            "p99_ms": percentiles[98],
+            "per_second": 1000 / statistics.fmean(latencies),
+        }
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""Report the import cost of the project's entry points."""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+PREFIX = "import time:"
+
+
+@dataclass
+class Import:
+    """A module's import and the imports it triggered."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: list["Import"] = field(default_factory=list)
+
+    def as_dict(self, min_us: int, depth: int) -> dict[str, Any]:
+        """Convert the import tree to a dict, pruned like the report.
+
+        Args:
+            min_us (int): The smallest cumulative time to include.
+            depth (int): The levels of imports below this one to include.
+
+        Returns:
+            dict[str, Any]: The import and its included children.
+        """
+        return {
+            "name": self.name,
+            "self_ms": self.self_us / 1000,
+            "cumulative_ms": self.cumulative_us / 1000,
+            "children": [
+                child.as_dict(min_us, depth - 1)
+                for child in self.children
+                if depth > 0 and child.cumulative_us >= min_us
+            ],
+        }
+
+
+def parse_importtime(output: str) -> list[Import]:
+    """Parse python -X importtime output into trees of imports.
+
+    Python writes each import after those it triggered, indented two spaces
+    deeper than its own.
+
+    Args:
+        output (str): The output, written to stderr.
+
+    Returns:
+        list[Import]: The top level imports, in order.
+    """
+    pending: dict[int, list[Import]] = defaultdict(list)
+    for line in output.splitlines():
+        if not line.startswith(PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(PREFIX) :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # The header.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node = Import(name.strip(), int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        pending[depth].append(node)
+    return pending[0]
+
+
+def _walk(node: Import) -> list[Import]:
+    """Flatten an import tree.
+
+    Args:
+        node (Import): The tree's root.
+
+    Returns:
+        list[Import]: The root and every import below it.
+    """
+    nodes = [node]
+    for child in node.children:
+        nodes += _walk(child)
+    return nodes
+
+
+class Command(BaseCommand):
+    """Report the import cost of the project's entry points."""
+
+    help = (
+        "Import each module in a fresh interpreter with python -X importtime,"
+        " then report its cold start time, the import tree's costliest"
+        " branches and the time spent in each top level package."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            default=["core.settings", "core.wsgi", "core.asgi"],
+            help="Modules to import. Defaults to core.settings, core.wsgi and"
+            " core.asgi, which sets Django up.",
+        )
+        parser.add_argument(
+            "--min-ms",
+            type=float,
+            default=5.0,
+            help="Smallest cumulative import time to show. Defaults to 5ms.",
+        )
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=4,
+            help="Levels of the import tree to show. Defaults to 4.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Cold starts to time, without -X importtime. Defaults to 5.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the results as JSON.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the imports and report them.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+        """
+        min_us = int(options["min_ms"] * 1000)
+        results = []
+        for module in options["modules"]:
+            roots = parse_importtime(self._run(module, "-X", "importtime"))
+            root = next(node for node in reversed(roots) if node.name == module)
+            packages: dict[str, int] = defaultdict(int)
+            for node in _walk(root):
+                packages[node.name.split(".")[0]] += node.self_us
+            cold_starts = [
+                self._time(module) for _repeat in range(max(options["repeat"], 1))
+            ]
+            results.append(
+                {
+                    "module": module,
+                    "cold_start_ms": statistics.median(cold_starts),
+                    "imports": len(_walk(root)),
+                    "tree": root.as_dict(min_us, options["depth"]),
+                    "packages_ms": {
+                        package: us / 1000
+                        for package, us in sorted(
+                            packages.items(), key=lambda item: -item[1]
+                        )
+                    },
+                }
+            )
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"{result['module']}: {result['cold_start_ms']:.0f}ms cold"
+                    f" start, {result['tree']['cumulative_ms']:.0f}ms importing"
+                    f" {result['imports']} modules"
+                )
+            )
+            self._write_tree(result["tree"], 0)
+            self.stdout.write("  By package (self time):")
+            for package, ms in result["packages_ms"].items():
+                if ms * 1000 >= min_us:
+                    self.stdout.write(f"    {ms:>8.1f}ms  {package}")
+
+    def _environment(self) -> dict[str, str]:
+        """The environment for the interpreters, with these settings.
+
+        Returns:
+            dict[str, str]: The environment variables.
+        """
+        environment = dict(os.environ)
+        environment.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+        return environment
+
+    def _run(self, module: str, *flags: str) -> str:
+        """Import a module in a fresh interpreter.
+
+        Args:
+            module (str): The module.
+            flags (str): Interpreter options.
+
+        Returns:
+            str: The interpreter's stderr.
+
+        Raises:
+            CommandError: If the import fails.
+        """
+        process = subprocess.run(
+            [sys.executable, *flags, "-c", f"import {module}"],
+            cwd=settings.BASE_DIR,
+            env=self._environment(),
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            errors = [
+                line for line in process.stderr.splitlines() if PREFIX not in line
+            ]
+            raise CommandError(f"Importing {module} failed:\n" + "\n".join(errors))
+        return process.stderr
+
+    def _time(self, module: str) -> float:
+        """Time a fresh interpreter starting and importing a module.
+
+        Args:
+            module (str): The module.
+
+        Returns:
+            float: The time in ms.
+        """
+        started = perf_counter()
+        self._run(module)
+        return (perf_counter() - started) * 1000
+
+    def _write_tree(self, node: dict[str, Any], depth: int) -> None:
+        """Write an import tree, costliest branches first.
+
+        Args:
+            node (dict[str, Any]): The import and its children.
+            depth (int): The import's depth.
+        """
+        self.stdout.write(
+            f"  {node['cumulative_ms']:>8.1f}ms {node['self_ms']:>8.1f}ms"
+            f"  {'  ' * depth}{node['name']}"
+        )
+        for child in sorted(node["children"], key=lambda c: -c["cumulative_ms"]):
+            self._write_tree(child, depth + 1)
@@ -0,0 +1,618 @@
+# -*- coding: utf-8 -*-
+"""Load test the ASGI or WSGI application in process."""
+
+import asyncio
+import io
+import json
+import statistics
+import sys
+from collections.abc import Awaitable
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from itertools import count
+from time import perf_counter
+from typing import Any, Callable, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from user.benchmarks import seed_users
+from user.models import User
+
+HOST = "testserver"
+PASSWORD = "Load-Test;Pass;42"
+ADMIN_EMAIL = "loadtest-admin@example.com"
+# Numbers the users registered, unique across runs sharing the database:
+_registrations = count()
+
+
+class Response(NamedTuple):
+    """A response to a virtual user's request."""
+
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class UnexpectedResponse(Exception):
+    """A response with a status the scenario didn't expect."""
+
+
+class AsgiTransport:
+    """Sends requests to an ASGI application, in the event loop."""
+
+    def __init__(self, application: Callable[..., Awaitable[None]]) -> None:
+        """Set up the transport.
+
+        Args:
+            application (Callable[..., Awaitable[None]]): The ASGI application.
+        """
+        self.application = application
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        query: str,
+        headers: list[tuple[str, str]],
+        body: bytes,
+    ) -> Response:
+        """Send a request.
+
+        Args:
+            method (str): The request method.
+            path (str): The path.
+            query (str): The query string.
+            headers (list[tuple[str, str]]): The request headers.
+            body (bytes): The request body.
+
+        Returns:
+            Response: The response.
+        """
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": (HOST, 80),
+        }
+        finished = asyncio.Event()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = 500
+        response_headers: list[tuple[str, str]] = []
+        chunks: list[bytes] = []
+
+        async def receive() -> dict[str, Any]:
+            if messages:
+                return messages.pop()
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished.set()
+
+        await self.application(scope, receive, send)
+        finished.set()
+        return Response(status, response_headers, b"".join(chunks))
+
+    def close(self) -> None:
+        """Release the transport's resources, of which there are none."""
+
+
+class WsgiTransport:
+    """Sends requests to a WSGI application, on a pool of threads.
+
+    With a thread per virtual user, it serves like a threaded WSGI server.
+    """
+
+    def __init__(self, application: Callable[..., Any], threads: int) -> None:
+        """Set up the transport.
+
+        Args:
+            application (Callable[..., Any]): The WSGI application.
+            threads (int): The number of threads.
+        """
+        self.application = application
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="loadtest-wsgi"
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        query: str,
+        headers: list[tuple[str, str]],
+        body: bytes,
+    ) -> Response:
+        """Send a request.
+
+        Args:
+            method (str): The request method.
+            path (str): The path.
+            query (str): The query string.
+            headers (list[tuple[str, str]]): The request headers.
+            body (bytes): The request body.
+
+        Returns:
+            Response: The response.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._call, method, path, query, headers, body
+        )
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        query: str,
+        headers: list[tuple[str, str]],
+        body: bytes,
+    ) -> Response:
+        """Call the application, on a thread of the pool.
+
+        Args:
+            method (str): The request method.
+            path (str): The path.
+            query (str): The query string.
+            headers (list[tuple[str, str]]): The request headers.
+            body (bytes): The request body.
+
+        Returns:
+            Response: The response.
+        """
+        environ = {
+            "REQUEST_METHOD": method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": HOST,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers:
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = f"HTTP_{key}"
+            environ[key] = value
+        started: list[Any] = []
+
+        def start_response(status: str, response_headers: list, *args: Any) -> None:
+            started[:] = [int(status.split(" ", 1)[0]), response_headers]
+
+        result = self.application(environ, start_response)
+        try:
+            body = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return Response(started[0], started[1], body)
+
+    def close(self) -> None:
+        """Stop the threads."""
+        self._executor.shutdown()
+
+
+class VirtualUser:
+    """A client with its own cookies, making one request at a time."""
+
+    def __init__(self, transport: Any, number: int) -> None:
+        """Set up the virtual user.
+
+        Args:
+            transport (Any): The AsgiTransport or WsgiTransport to send with.
+            number (int): The virtual user's number.
+        """
+        self.transport = transport
+        self.number = number
+        self.cookies: dict[str, str] = {}
+        self.requests = 0
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        query: Optional[dict[str, str]] = None,
+        form: Optional[dict[str, str]] = None,
+        json_body: Optional[Any] = None,
+        expect: tuple[int, ...] = (200,),
+    ) -> Response:
+        """Send a request, keeping the cookies the response sets.
+
+        Args:
+            method (str): The request method.
+            path (str): The path.
+            query (dict[str, str], optional): The query parameters.
+            form (dict[str, str], optional): A form to send, with the CSRF
+                token.
+            json_body (Any, optional): A JSON value to send.
+            expect (tuple[int, ...]): The statuses expected. Defaults to 200.
+
+        Returns:
+            Response: The response.
+
+        Raises:
+            UnexpectedResponse: If the status isn't expected.
+        """
+        headers = [("Host", HOST)]
+        body = b""
+        if form is not None:
+            form = {"csrfmiddlewaretoken": self.cookies.get("csrftoken", ""), **form}
+            body = urlencode(form).encode()
+            headers.append(("Content-Type", "application/x-www-form-urlencoded"))
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers.append(("Content-Type", "application/json"))
+        if self.cookies:
+            headers.append(
+                ("Cookie", "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+            )
+        headers.append(("Content-Length", str(len(body))))
+        self.requests += 1
+        response = await self.transport.request(
+            method, path, urlencode(query or {}), headers, body
+        )
+        for name, value in response.headers:
+            if name.lower() == "set-cookie":
+                for key, morsel in SimpleCookie(value).items():
+                    if morsel["max-age"] == "0" or not morsel.value:
+                        self.cookies.pop(key, None)
+                    else:
+                        self.cookies[key] = morsel.value
+        if response.status not in expect:
+            raise UnexpectedResponse(f"{method} {path}: {response.status}")
+        return response
+
+    async def log_in(self) -> None:
+        """Log in to the admin as the load test's admin user."""
+        self.cookies.clear()
+        await self.request("GET", "/admin/login/")
+        await self.request(
+            "POST",
+            "/admin/login/",
+            form={"username": ADMIN_EMAIL, "password": PASSWORD, "next": "/admin/"},
+            expect=(302,),
+        )
+
+
+async def _no_setup(user: VirtualUser) -> None:
+    """Prepare nothing.
+
+    Args:
+        user (VirtualUser): The virtual user.
+    """
+
+
+async def _admin_login(user: VirtualUser, iteration: int) -> None:
+    """Log in to the admin from the login page, as a new visitor.
+
+    Args:
+        user (VirtualUser): The virtual user.
+        iteration (int): The virtual user's iteration.
+    """
+    await user.log_in()
+
+
+async def _changelist(user: VirtualUser, iteration: int) -> None:
+    """Browse the user changelist: its first page, the next, then a search.
+
+    Args:
+        user (VirtualUser): The virtual user, logged in.
+        iteration (int): The virtual user's iteration.
+    """
+    if iteration % 3 == 0:
+        await user.request("GET", "/admin/user/user/")
+    elif iteration % 3 == 1:
+        await user.request("GET", "/admin/user/user/", {"after": "seed-0000100"})
+    else:
+        await user.request("GET", "/admin/user/user/", {"q": f"seed-00{iteration:03}"})
+
+
+async def _create_user(user: VirtualUser, iteration: int) -> None:
+    """Register a new user through the JSON API.
+
+    Args:
+        user (VirtualUser): The virtual user.
+        iteration (int): The virtual user's iteration.
+    """
+    await user.request(
+        "POST",
+        "/api/users/register",
+        json_body={
+            "email": f"loadtest-{next(_registrations)}@example.com",
+            "password": PASSWORD,
+        },
+        expect=(201,),
+    )
+
+
+class Scenario(NamedTuple):
+    """What each virtual user does, repeatedly."""
+
+    setup: Callable[[VirtualUser], Awaitable[None]]
+    operation: Callable[[VirtualUser, int], Awaitable[None]]
+
+
+SCENARIOS = {
+    "admin_login": Scenario(_no_setup, _admin_login),
+    "changelist": Scenario(VirtualUser.log_in, _changelist),
+    "create_user": Scenario(_no_setup, _create_user),
+}
+
+
+async def _run_user(
+    user: VirtualUser,
+    operation: Callable[[VirtualUser, int], Awaitable[None]],
+    deadline: float,
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    """Repeat a scenario's operation until the deadline, recording latencies.
+
+    Args:
+        user (VirtualUser): The virtual user, set up for the scenario.
+        operation (Callable[[VirtualUser, int], Awaitable[None]]): The
+            operation.
+        deadline (float): The perf_counter() time to stop at.
+        latencies (list[float]): Receives the operations' latencies in ms.
+        errors (list[str]): Receives the operations' errors.
+    """
+    for iteration in count():
+        if perf_counter() >= deadline:
+            return
+        started = perf_counter()
+        try:
+            await operation(user, iteration)
+        except Exception as error:  # Counted, as a server would log it.
+            errors.append(f"{type(error).__name__}: {error}")
+            continue
+        latencies.append((perf_counter() - started) * 1000)
+
+
+def _summarise(
+    latencies: list[float],
+    errors: list[str],
+    requests: int,
+    seconds: float,
+) -> dict[str, Any]:
+    """Summarise a run's results.
+
+    Args:
+        latencies (list[float]): The successful operations' latencies in ms.
+        errors (list[str]): The failed operations' errors.
+        requests (int): The number of requests sent.
+        seconds (float): The run's duration.
+
+    Returns:
+        dict[str, Any]: The throughput, latency percentiles and error rate.
+    """
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        percentiles = [latencies[0] if latencies else 0.0] * 99
+    operations = len(latencies) + len(errors)
+    return {
+        "operations": operations,
+        "requests": requests,
+        "per_second": len(latencies) / seconds,
+        "requests_per_second": requests / seconds,
+        "p50_ms": percentiles[49],
+        "p90_ms": percentiles[89],
+        "p99_ms": percentiles[98],
+        "max_ms": max(latencies, default=0.0),
+        "errors": len(errors),
+        "error_rate": len(errors) / operations if operations else 0.0,
+        "first_errors": sorted(set(errors))[:5],
+    }
+
+
+class Command(BaseCommand):
+    """Load test the ASGI or WSGI application in process."""
+
+    help = (
+        "Drive core.asgi.application, or core.wsgi.application on a thread per"
+        " virtual user, with concurrent virtual users repeating a scenario on"
+        " a test database, and report throughput, latency percentiles and"
+        " error rates."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "--scenario",
+            nargs="+",
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+            help="Scenarios to run. Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--interface",
+            nargs="+",
+            choices=["asgi", "wsgi"],
+            default=["asgi"],
+            help="Applications to drive. Defaults to asgi.",
+        )
+        parser.add_argument(
+            "--users",
+            nargs="+",
+            type=int,
+            default=[10],
+            help="Numbers of concurrent virtual users to run with. Defaults to 10.",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=5.0,
+            help="Duration of each run. Defaults to 5 seconds.",
+        )
+        parser.add_argument(
+            "--seed-users",
+            type=int,
+            default=1000,
+            help="Users to add for the changelist to page through. Defaults to"
+            " 1000.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the results as JSON.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the load test.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If a number of users isn't positive.
+        """
+        if min(options["users"]) < 1:
+            raise CommandError("Run with at least one virtual user.")
+        # Not setup_test_environment(), which instruments template rendering.
+        test_settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, HOST],
+            DEBUG=False,
+        )
+        test_settings.enable()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self._seed(options["seed_users"])
+            results = [
+                {
+                    "interface": interface,
+                    "scenario": scenario,
+                    "users": users,
+                    **self._run(interface, SCENARIOS[scenario], users, options),
+                }
+                for interface in options["interface"]
+                for scenario in options["scenario"]
+                for users in options["users"]
+            ]
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            test_settings.disable()
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'interface':<9} {'scenario':<12} {'users':>5} {'ops/s':>8}"
+            f" {'p50':>9} {'p90':>9} {'p99':>9} {'errors':>7}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['interface']:<9} {result['scenario']:<12}"
+                f" {result['users']:>5} {result['per_second']:>8.1f}"
+                f" {result['p50_ms']:>7.1f}ms {result['p90_ms']:>7.1f}ms"
+                f" {result['p99_ms']:>7.1f}ms {result['error_rate']:>7.1%}"
+            )
+
+    def _seed(self, users: int) -> None:
+        """Add the admin user and the users for the changelist.
+
+        Args:
+            users (int): The number of users wanted.
+        """
+        User.objects.create_superuser(ADMIN_EMAIL, PASSWORD)
+        seed_users(users)
+
+    def _run(
+        self,
+        interface: str,
+        scenario: Scenario,
+        users: int,
+        options: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Run a scenario with a number of virtual users.
+
+        Args:
+            interface (str): "asgi" or "wsgi".
+            scenario (Scenario): The scenario.
+            users (int): The number of virtual users.
+            options (dict[str, Any]): The parsed command options.
+
+        Returns:
+            dict[str, Any]: The run's summary.
+        """
+        # Imported when needed, as importing builds the application.
+        if interface == "asgi":
+            from core.asgi import application
+
+            transport = AsgiTransport(application)
+        else:
+            from core.wsgi import application
+
+            transport = WsgiTransport(application, users)
+        try:
+            return asyncio.run(self._drive(transport, scenario, users, options))
+        finally:
+            transport.close()
+
+    async def _drive(
+        self,
+        transport: Any,
+        scenario: Scenario,
+        users: int,
+        options: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Drive the virtual users until the run's duration is up.
+
+        Args:
+            transport (Any): The AsgiTransport or WsgiTransport.
+            scenario (Scenario): The scenario.
+            users (int): The number of virtual users.
+            options (dict[str, Any]): The parsed command options.
+
+        Returns:
+            dict[str, Any]: The run's summary.
+        """
+        virtual_users = [VirtualUser(transport, number) for number in range(users)]
+        # Set every virtual user up, e.g. logged in, before timing.
+        await asyncio.gather(*map(scenario.setup, virtual_users))
+        requests = sum(user.requests for user in virtual_users)
+        latencies: list[float] = []
+        errors: list[str] = []
+        deadline = perf_counter() + options["seconds"]
+        await asyncio.gather(
+            *(
+                _run_user(user, scenario.operation, deadline, latencies, errors)
+                for user in virtual_users
+            )
+        )
+        requests = sum(user.requests for user in virtual_users) - requests
+        return _summarise(latencies, errors, requests, options["seconds"])
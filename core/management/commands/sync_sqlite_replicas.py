@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Copy the default SQLite database over its local stand-in replicas."""
+
+import sqlite3
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """Copy the default SQLite database over its local stand-in replicas."""
+
+    help = (
+        "Back up the default SQLite database into each SQLite database in"
+        " DATABASE_REPLICAS, standing in for replication during development."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "replicas",
+            nargs="*",
+            help="Replica aliases to copy to. Defaults to all of them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Copy the database.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If a database isn't an SQLite replica.
+        """
+        aliases = options["replicas"] or settings.DATABASE_REPLICAS
+        for alias in [DEFAULT_DB_ALIAS, *aliases]:
+            if alias != DEFAULT_DB_ALIAS and alias not in settings.DATABASE_REPLICAS:
+                raise CommandError(f"{alias} isn't in DATABASE_REPLICAS.")
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"{alias} isn't an SQLite database.")
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in aliases:
+            name = connections[alias].settings_dict["NAME"]
+            connections[alias].close()
+            target = sqlite3.connect(name)
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            if options["verbosity"]:
+                self.stdout.write(f"Copied {primary.settings_dict['NAME']} to {name}.")
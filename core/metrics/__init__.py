@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""Core metrics."""
+
+from ._instruments import (  # noqa: F401.
+    db_connections,
+    db_queries,
+    db_query_seconds,
+    logins,
+    password_hash_duration,
+    registry,
+    request_duration,
+    responses,
+)
+from ._metrics import Counter, Histogram, MetricsStore, Registry  # noqa: F401.
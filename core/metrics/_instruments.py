@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from ._metrics import Counter, Histogram, Registry
+
+registry = Registry()
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to respond to requests, by URL name and method.",
+    registry,
+)
+responses = Counter(
+    "http_responses_total",
+    "Responses sent, by URL name, method and status code.",
+    registry,
+)
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify passwords, by operation.",
+    registry,
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+logins = Counter(
+    "user_logins_total",
+    "Login attempts, by result.",
+    registry,
+)
+db_connections = Counter(
+    "db_connections_total",
+    "Database connections opened, by database alias.",
+    registry,
+)
+db_queries = Counter(
+    "db_queries_total",
+    "Database queries run, by database alias.",
+    registry,
+)
+db_query_seconds = Counter(
+    "db_query_seconds_total",
+    "Time spent running database queries, by database alias.",
+    registry,
+)
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+from ._mmap_dict import MmapDict, read_entries
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class MetricsStore:
+    """Metric samples shared between processes through a directory.
+
+    Each process writes its own memory mapped file, so samples are updated
+    without locking other processes, and collecting sums every process's
+    file. Clear the directory when deploying, as counters add up forever.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """Set up the store.
+
+        Args:
+            directory (Path, optional): Directory of the processes' files.
+                Defaults to settings.METRICS["DIRECTORY"].
+        """
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._values: Optional[MmapDict] = None
+
+    @property
+    def directory(self) -> Path:
+        """The directory of the processes' files.
+
+        Returns:
+            Path: The directory.
+        """
+        return Path(self._directory or settings.METRICS["DIRECTORY"])
+
+    def _process_values(self) -> MmapDict:
+        """This process's file, opened again after a fork.
+
+        Returns:
+            MmapDict: The process's values.
+        """
+        if self._pid != os.getpid():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._values = MmapDict(self.directory / f"{os.getpid()}.db")
+            self._pid = os.getpid()
+        return self._values
+
+    def increment(self, amounts: Iterable[tuple[str, float]]) -> None:
+        """Add to samples.
+
+        Args:
+            amounts (Iterable[tuple[str, float]]): The sample keys and amounts.
+        """
+        with self._lock:
+            values = self._process_values()
+            for key, amount in amounts:
+                values.set(key, values.get(key) + amount)
+
+    def collect(self) -> dict[str, float]:
+        """Sum every process's samples.
+
+        Returns:
+            dict[str, float]: The totals by sample key.
+        """
+        totals: dict[str, float] = defaultdict(float)
+        for path in self.directory.glob("*.db"):
+            for key, value, _offset in read_entries(path.read_bytes()):
+                totals[key] += value
+        return totals
+
+
+def _key(name: str, labels: dict[str, str]) -> str:
+    """The store key of a sample.
+
+    Args:
+        name (str): The sample's name.
+        labels (dict[str, str]): The sample's labels.
+
+    Returns:
+        str: The key.
+    """
+    return json.dumps([name, sorted(labels.items())])
+
+
+class Metric:
+    """A named metric with labelled samples."""
+
+    type = "untyped"
+    suffixes: tuple[str, ...] = ("",)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        registry: "Registry",
+    ) -> None:
+        """Register the metric.
+
+        Args:
+            name (str): The metric's name.
+            documentation (str): The metric's help text.
+            registry (Registry): The registry to add it to.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.store = registry.store
+        registry.metrics[name] = self
+
+
+class Counter(Metric):
+    """A count that only goes up, e.g. of requests."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add to the count.
+
+        Args:
+            amount (float): The amount to add. Defaults to 1.
+            labels: The sample's labels.
+        """
+        self.store.increment([(_key(self.name, labels), amount)])
+
+
+class Histogram(Metric):
+    """Counts of observations, e.g. durations, in cumulative buckets."""
+
+    type = "histogram"
+    suffixes = ("_bucket", "_sum", "_count")
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        registry: "Registry",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Register the histogram.
+
+        Args:
+            name (str): The metric's name.
+            documentation (str): The metric's help text.
+            registry (Registry): The registry to add it to.
+            buckets (tuple[float, ...]): The buckets' upper bounds.
+        """
+        super().__init__(name, documentation, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value (float): The observed value.
+            labels: The sample's labels.
+        """
+        amounts = [
+            (_key(f"{self.name}_bucket", {**labels, "le": repr(bound)}), 1.0)
+            for bound in self.buckets
+            if value <= bound
+        ]
+        amounts += [
+            (_key(f"{self.name}_bucket", {**labels, "le": "+Inf"}), 1.0),
+            (_key(f"{self.name}_count", labels), 1.0),
+            (_key(f"{self.name}_sum", labels), value),
+        ]
+        self.store.increment(amounts)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format.
+
+    Args:
+        value (str): The value.
+
+    Returns:
+        str: The escaped value.
+    """
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _sort_key(sample: tuple[tuple, float]) -> tuple[list, float]:
+    """Order samples by their labels, with each histogram's buckets in order.
+
+    Args:
+        sample (tuple[tuple, float]): The sample's labels and value.
+
+    Returns:
+        tuple[list, float]: The sort key.
+    """
+    labels = dict(sample[0])
+    bound = labels.pop("le", "0")
+    return sorted(labels.items()), float(bound)
+
+
+class Registry:
+    """The metrics exposed together, and their store."""
+
+    def __init__(self, store: Optional[MetricsStore] = None) -> None:
+        """Set up the registry.
+
+        Args:
+            store (MetricsStore, optional): The store. Defaults to a new one
+                in settings.METRICS["DIRECTORY"].
+        """
+        self.store = store or MetricsStore()
+        self.metrics: dict[str, Metric] = {}
+
+    def expose(self) -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Buckets a process hasn't reached are missing from its file, so each
+        histogram's buckets are filled in from the others with the same labels.
+
+        Returns:
+            str: The metrics.
+        """
+        samples: dict[str, dict[tuple, float]] = defaultdict(dict)
+        for key, value in self.store.collect().items():
+            name, labels = json.loads(key)
+            samples[name][tuple(map(tuple, labels))] = value
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            if isinstance(metric, Histogram):
+                self._fill_buckets(metric, samples)
+            for suffix in metric.suffixes:
+                for labels, value in sorted(
+                    samples[metric.name + suffix].items(), key=_sort_key
+                ):
+                    label_text = ",".join(
+                        f'{name}="{_escape(label)}"' for name, label in labels
+                    )
+                    lines.append(f"{metric.name}{suffix}{{{label_text}}} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _fill_buckets(
+        metric: Histogram,
+        samples: dict[str, dict[tuple, float]],
+    ) -> None:
+        """Add the buckets missing from a histogram's collected samples.
+
+        Args:
+            metric (Histogram): The histogram.
+            samples (dict[str, dict[tuple, float]]): The collected samples by
+                name, then label set.
+        """
+        buckets = samples[f"{metric.name}_bucket"]
+        for labels in samples[f"{metric.name}_count"]:
+            for bound in (*map(repr, metric.buckets), "+Inf"):
+                buckets.setdefault(tuple(sorted((*labels, ("le", bound)))), 0.0)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import mmap
+import os
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+
+HEADER = struct.Struct("i4x")  # Bytes used, padded to 8.
+KEY_LENGTH = struct.Struct("i")
+VALUE = struct.Struct("d")
+INITIAL_SIZE = 64 * 1024
+
+
+def _padded(length: int) -> int:
+    """Pad a key's length so the value after it is 8 byte aligned.
+
+    Args:
+        length (int): The encoded key's length.
+
+    Returns:
+        int: The padded length.
+    """
+    return length + (8 - (KEY_LENGTH.size + length) % 8) % 8
+
+
+def read_entries(data: bytes) -> Iterator[tuple[str, float, int]]:
+    """Read the entries of an MmapDict's file.
+
+    Args:
+        data (bytes): The file's content.
+
+    Yields:
+        tuple[str, float, int]: Each key, value and the value's offset.
+    """
+    if len(data) < HEADER.size:
+        return
+    used = HEADER.unpack_from(data, 0)[0]
+    position = HEADER.size
+    while position < used:
+        length = KEY_LENGTH.unpack_from(data, position)[0]
+        position += KEY_LENGTH.size
+        key = data[position : position + length].decode()
+        position += _padded(length)
+        yield key, VALUE.unpack_from(data, position)[0], position
+        position += VALUE.size
+
+
+class MmapDict:
+    """Float values by key, written in place to a memory mapped file.
+
+    Only one process may write a file, but any may read it at any time, as
+    entries are complete before the used length in the header includes them.
+    Not thread safe, callers must lock.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open or create the file.
+
+        Args:
+            path (Path): The file.
+        """
+        self._file = open(path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < INITIAL_SIZE:
+            self._file.truncate(INITIAL_SIZE)
+            size = INITIAL_SIZE
+        self._size = size
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._used = HEADER.unpack_from(self._map, 0)[0] or HEADER.size
+        self._offsets = {
+            key: offset for key, _value, offset in read_entries(self._map[:])
+        }
+
+    def get(self, key: str) -> float:
+        """Get a value.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            float: The value, 0 if not set.
+        """
+        offset = self._offsets.get(key)
+        return 0.0 if offset is None else VALUE.unpack_from(self._map, offset)[0]
+
+    def set(self, key: str, value: float) -> None:
+        """Set a value.
+
+        Args:
+            key (str): The key.
+            value (float): The value.
+        """
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._add(key)
+        VALUE.pack_into(self._map, offset, value)
+
+    def _add(self, key: str) -> int:
+        """Add an entry for a key, growing the file if needed.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            int: The offset of the key's value.
+        """
+        encoded = key.encode()
+        entry_size = KEY_LENGTH.size + _padded(len(encoded)) + VALUE.size
+        while self._used + entry_size > self._size:
+            self._size *= 2
+            self._map.close()
+            self._file.truncate(self._size)
+            self._map = mmap.mmap(self._file.fileno(), self._size)
+        position = self._used
+        KEY_LENGTH.pack_into(self._map, position, len(encoded))
+        start = position + KEY_LENGTH.size
+        self._map[start : start + len(encoded)] = encoded
+        offset = start + _padded(len(encoded))
+        VALUE.pack_into(self._map, offset, 0.0)
+        self._used += entry_size
+        HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def close(self) -> None:
+        """Close the file."""
+        self._map.close()
+        self._file.close()
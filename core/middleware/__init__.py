@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""Core middleware."""
+
+from ._metrics_middleware import MetricsMiddleware  # noqa: F401.
+from ._profiling_middleware import (  # noqa: F401.
+    ProfilingCheckpointMiddleware,
+    ProfilingMiddleware,
+)
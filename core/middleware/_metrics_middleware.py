@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from time import perf_counter
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from .. import metrics
+
+UNMATCHED = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Record requests' latencies and response codes by URL name.
+
+    URL names rather than paths label the samples, so their number stays
+    bounded. Unless settings.METRICS is enabled the middleware removes itself
+    when loaded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Set up the middleware, if metrics are enabled.
+
+        Args:
+            get_response (Callable): The next handler.
+
+        Raises:
+            MiddlewareNotUsed: If metrics aren't enabled.
+        """
+        if not settings.METRICS["ENABLED"]:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Time handling the request.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Time handling the request asynchronously.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        started = perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, started)
+        return response
+
+    @staticmethod
+    def _record(
+        request: HttpRequest,
+        response: HttpResponse,
+        started: float,
+    ) -> None:
+        """Record a request's latency and response code.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+            started (float): The perf_counter() time the request came in.
+        """
+        match = request.resolver_match
+        view = match.view_name if match is not None else UNMATCHED
+        metrics.request_duration.observe(
+            perf_counter() - started, view=view, method=request.method
+        )
+        metrics.responses.inc(
+            view=view, method=request.method, status=str(response.status_code)
+        )
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+import cProfile
+import json
+import logging
+import random
+import re
+import statistics
+import threading
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from math import ceil
+from time import perf_counter, time
+from typing import Any, Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+from user.signals import password_hashed
+
+logger = logging.getLogger("core.profiling")
+
+PROFILING = "core.middleware.ProfilingMiddleware"
+CHECKPOINT = "core.middleware.ProfilingCheckpointMiddleware"
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "core_request_profile", default=None
+)
+
+
+@dataclass
+class RequestProfile:
+    """Timings collected while handling a request."""
+
+    started: float = field(default_factory=perf_counter)
+    entered: list[float] = field(default_factory=list)
+    exited: list[float] = field(default_factory=list)
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    hash_count: int = 0
+    hash_seconds: float = 0.0
+
+    def spans(self, finished: float, labels: list[str]) -> dict[str, float]:
+        """Each middleware's and the view's own time, excluding inner ones'.
+
+        Args:
+            finished (float): The perf_counter() time the response was ready.
+            labels (list[str]): The middleware's names, outermost first.
+
+        Returns:
+            dict[str, float]: The seconds by middleware name, and "view".
+        """
+        # Checkpoints exit innermost first.
+        bounds = [(self.started, finished), *zip(self.entered, self.exited[::-1])]
+        durations = [end - start for start, end in bounds] + [0.0]
+        return {
+            (labels[index] if index < len(labels) else "view"): (
+                durations[index] - durations[index + 1]
+            )
+            for index in range(len(bounds))
+        }
+
+
+def _record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Count and time a query towards the current request's profile.
+
+    Args:
+        execute (Callable[..., Any]): The next execute function.
+        sql (str): The query.
+        params (Any): The query's parameters.
+        many (bool): Whether this is an executemany().
+        context (dict[str, Any]): The connection and cursor.
+
+    Returns:
+        Any: The execute function's result.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.sql_count += 1
+        profile.sql_seconds += perf_counter() - started
+
+
+def _wrap_connection(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Add the query recorder to a new connection.
+
+    Args:
+        connection (BaseDatabaseWrapper): The connection.
+        kwargs: Other signal arguments.
+    """
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _record_hash(seconds: float, **kwargs: Any) -> None:
+    """Time a password hash or check towards the current request's profile.
+
+    Args:
+        seconds (float): The time it took.
+        kwargs: Other signal arguments.
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.hash_count += 1
+        profile.hash_seconds += seconds
+
+
+class ProfilingMiddleware:
+    """Time requests' middleware, views, SQL and password hashing.
+
+    Sends the timings in a Server-Timing header and logs them to
+    core.profiling. Of a random sample of sync requests, cProfile dumps of
+    the slowest are kept. Unless settings.PROFILING is enabled the middleware
+    removes itself, and its checkpoints, when loaded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Set up profiling, if enabled.
+
+        Args:
+            get_response (Callable): The next handler.
+
+        Raises:
+            MiddlewareNotUsed: If profiling isn't enabled.
+        """
+        if not settings.PROFILING["ENABLED"]:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        names = settings.MIDDLEWARE
+        self.labels = [
+            name.rsplit(".", 1)[-1]
+            for name in names[names.index(PROFILING) + 1 :]
+            if name != CHECKPOINT
+        ]
+        self.slowest_percent = settings.PROFILING["SLOWEST_PERCENT"]
+        # Keeping none of the profiles, there's no need to take them.
+        self.profile_rate = (
+            settings.PROFILING["PROFILE_RATE"] if self.slowest_percent > 0 else 0
+        )
+        self.profile_dir = settings.PROFILING["PROFILE_DIR"]
+        self._durations: deque[float] = deque(maxlen=1000)
+        self._durations_lock = threading.Lock()
+        connection_created.connect(_wrap_connection, dispatch_uid=__name__)
+        for connection in connections.all(initialized_only=True):
+            _wrap_connection(connection)
+        password_hashed.connect(_record_hash, dispatch_uid=__name__)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Profile handling the request.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response, with a Server-Timing header.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        profiler = None
+        if self.profile_rate and random.random() < self.profile_rate:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            _current_profile.reset(token)
+        duration = self._finish(request, response, profile)
+        if profiler is not None and self._is_slowest(duration):
+            self._dump(request, profiler, duration)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Profile handling the request asynchronously, without cProfile.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response, with a Server-Timing header.
+        """
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        self._finish(request, response, profile)
+        return response
+
+    def _finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        profile: RequestProfile,
+    ) -> float:
+        """Add the Server-Timing header and log the timings.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+            profile (RequestProfile): The request's timings.
+
+        Returns:
+            float: The request's duration in seconds.
+        """
+        finished = perf_counter()
+        duration = finished - profile.started
+        spans = profile.spans(finished, self.labels)
+        timings = [f"total;dur={duration * 1000:.2f}"]
+        timings += [
+            f"{'' if name == 'view' else 'mw.'}{name};dur={seconds * 1000:.2f}"
+            for name, seconds in spans.items()
+        ]
+        timings.append(
+            f'sql;dur={profile.sql_seconds * 1000:.2f};desc="{profile.sql_count}'
+            f' queries"'
+        )
+        if profile.hash_count:
+            timings.append(
+                f'hash;dur={profile.hash_seconds * 1000:.2f};desc="'
+                f'{profile.hash_count} hashes"'
+            )
+        response.headers["Server-Timing"] = ", ".join(timings)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "spans_ms": {name: round(s * 1000, 3) for name, s in spans.items()},
+            "sql_count": profile.sql_count,
+            "sql_ms": round(profile.sql_seconds * 1000, 3),
+            "hash_count": profile.hash_count,
+            "hash_ms": round(profile.hash_seconds * 1000, 3),
+        }
+        logger.info(json.dumps(record), extra={"profile": record})
+        with self._durations_lock:
+            self._durations.append(duration)
+        return duration
+
+    def _is_slowest(self, duration: float) -> bool:
+        """Whether a duration is among the slowest recent requests'.
+
+        Args:
+            duration (float): The request's duration in seconds.
+
+        Returns:
+            bool: True if in the slowest SLOWEST_PERCENT, once enough requests
+                have been seen to tell.
+        """
+        with self._durations_lock:
+            durations = list(self._durations)
+        if len(durations) < ceil(100 / self.slowest_percent):
+            return False
+        percentiles = statistics.quantiles(durations, n=1000, method="inclusive")
+        index = min(998, max(0, round(1000 - self.slowest_percent * 10) - 1))
+        return duration >= percentiles[index]
+
+    def _dump(
+        self,
+        request: HttpRequest,
+        profiler: cProfile.Profile,
+        duration: float,
+    ) -> None:
+        """Save a request's profile, for e.g. snakeviz or pstats.
+
+        Args:
+            request (HttpRequest): The request.
+            profiler (cProfile.Profile): The request's profile.
+            duration (float): The request's duration in seconds.
+        """
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w-]+", "-", request.path).strip("-")[:80] or "root"
+        path = (
+            self.profile_dir
+            / f"{time():.0f}-{duration * 1000:.0f}ms-{request.method}-{slug}.prof"
+        )
+        profiler.dump_stats(path)
+        logger.info("Saved the profile of a slow request to %s.", path)
+
+
+class ProfilingCheckpointMiddleware:
+    """Marks where the previous middleware hands over to the next.
+
+    settings.MIDDLEWARE has one after each middleware while profiling is
+    enabled, so ProfilingMiddleware can tell each middleware's own time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Set up the checkpoint, if profiling is enabled.
+
+        Args:
+            get_response (Callable): The next handler.
+
+        Raises:
+            MiddlewareNotUsed: If profiling isn't enabled.
+        """
+        if not settings.PROFILING["ENABLED"]:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Record the times the request passes in and the response out.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = _current_profile.get()
+        if profile is None:
+            return self.get_response(request)
+        profile.entered.append(perf_counter())
+        try:
+            return self.get_response(request)
+        finally:
+            profile.exited.append(perf_counter())
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Record the times the request passes in and the response out.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        profile = _current_profile.get()
+        if profile is None:
+            return await self.get_response(request)
+        profile.entered.append(perf_counter())
+        try:
+            return await self.get_response(request)
+        finally:
+            profile.exited.append(perf_counter())
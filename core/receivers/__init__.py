@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Core signal receivers."""
+
+from . import _metrics, _sqlite_pragmas  # noqa: F401.
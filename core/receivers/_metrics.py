@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from time import perf_counter
+from typing import Any, Callable
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from user.signals import password_hashed
+
+from .. import metrics
+
+
+def _count_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Count and time a query.
+
+    Args:
+        execute (Callable[..., Any]): The next execute function.
+        sql (str): The query.
+        params (Any): The query's parameters.
+        many (bool): Whether this is an executemany().
+        context (dict[str, Any]): The connection and cursor.
+
+    Returns:
+        Any: The execute function's result.
+    """
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        alias = context["connection"].alias
+        metrics.db_queries.inc(alias=alias)
+        metrics.db_query_seconds.inc(perf_counter() - started, alias=alias)
+
+
+@receiver(connection_created)
+def count_connection(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Count each new connection and its queries, if METRICS are enabled.
+
+    Args:
+        connection (BaseDatabaseWrapper): The new connection.
+        kwargs: Other signal arguments.
+    """
+    if not settings.METRICS["ENABLED"]:
+        return
+    metrics.db_connections.inc(alias=connection.alias)
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+@receiver(password_hashed)
+def observe_password_hash(operation: str, seconds: float, **kwargs: Any) -> None:
+    """Record a password hash or check's duration, if METRICS are enabled.
+
+    Args:
+        operation (str): "make_password" or "verify".
+        seconds (float): The time it took.
+        kwargs: Other signal arguments.
+    """
+    if settings.METRICS["ENABLED"]:
+        metrics.password_hash_duration.observe(seconds, operation=operation)
+
+
+@receiver(user_logged_in)
+def count_login(**kwargs: Any) -> None:
+    """Count a successful login, if METRICS are enabled.
+
+    Args:
+        kwargs: The signal arguments.
+    """
+    if settings.METRICS["ENABLED"]:
+        metrics.logins.inc(result="success")
+
+
+@receiver(user_login_failed)
+def count_login_failure(**kwargs: Any) -> None:
+    """Count a failed login, if METRICS are enabled.
+
+    Args:
+        kwargs: The signal arguments.
+    """
+    if settings.METRICS["ENABLED"]:
+        metrics.logins.inc(result="failure")
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def set_sqlite_pragmas(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Set the SQLITE_PRAGMAS on each new SQLite connection.
+
+    Args:
+        connection (BaseDatabaseWrapper): The new connection.
+        kwargs: Other signal arguments.
+    """
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
@@ -10,7 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
-from os import getenv
+from importlib.util import find_spec
+from os import cpu_count, getenv
 from pathlib import Path
 
 CORE_DIR = Path(__file__).resolve().parent
@@ -32,89 +33,277 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    "user.apps.UserConfig",  # App dirs.
+    "core.apps.CoreConfig",  # App dirs.
+    "user.apps.UserConfig",
     "django.contrib.admin",  # Default Django.
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "bootstrap5",
 ]
+# bootstrap5 reads its package metadata when imported, so rather than being an
+# installed app, imported on every start, it's loaded by the template engine:
+BOOTSTRAP5_DIR = Path(find_spec("bootstrap5").origin).parent
 
 MIDDLEWARE = [
+    "core.middleware.ProfilingMiddleware",  # Removes itself unless PROFILING.
+    "core.middleware.MetricsMiddleware",  # Removes itself unless METRICS.
     "django.middleware.security.SecurityMiddleware",
+    "user.middleware.ReplicaPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "user.middleware.CachedAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+# PROFILING=1 sends each request's middleware, view, SQL and password hashing
+# times in a Server-Timing header and logs them to "core.profiling". cProfile
+# runs for a PROFILE_RATE share of sync requests, keeping the SLOWEST_PERCENT, or
+# none with 0:
+PROFILING = {
+    "ENABLED": getenv("PROFILING", "0") == "1",
+    "PROFILE_RATE": float(getenv("PROFILING_PROFILE_RATE", 0)),
+    "SLOWEST_PERCENT": float(getenv("PROFILING_SLOWEST_PERCENT", 1)),
+    "PROFILE_DIR": Path(getenv("PROFILING_PROFILE_DIR", BASE_DIR / "profiles")),
+}
+if PROFILING["ENABLED"]:
+    # Checkpoints between middleware to time each separately:
+    MIDDLEWARE = MIDDLEWARE[:1] + [
+        name
+        for middleware in MIDDLEWARE[1:]
+        for name in (middleware, "core.middleware.ProfilingCheckpointMiddleware")
+    ]
+# METRICS=1 records request, password hashing, login and database metrics for
+# /metrics, optionally behind a bearer TOKEN. Each process writes its samples to
+# a file in DIRECTORY, which should be emptied when deploying or restarting:
+METRICS = {
+    "ENABLED": getenv("METRICS", "0") == "1",
+    "DIRECTORY": Path(getenv("METRICS_DIRECTORY", BASE_DIR / "metrics")),
+    "TOKEN": getenv("METRICS_TOKEN", ""),
+}
 
 ROOT_URLCONF = "core.urls"
 
+# TEMPLATE_PROFILE=production keeps compiled templates, loads the PRELOAD ones
+# on start and caches site-wide fragments until the static files change, see
+# `manage.py benchmark_templates`:
+TEMPLATE_PROFILE = getenv("TEMPLATE_PROFILE", "default")
+TEMPLATE_PROFILES = {
+    "default": {
+        "APP_DIRS": True,
+        "OPTIONS": {},
+        "PRELOAD": [],
+        "FRAGMENT_TIMEOUT": 0,
+    },
+    "production": {
+        "APP_DIRS": False,
+        "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+        "PRELOAD": [
+            "core/template.html",
+            "core/nav_bar.html",
+            "core/footer.html",
+        ],
+        "FRAGMENT_TIMEOUT": None,  # Forever, keyed by STATIC_VERSION.
+    },
+}
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [CORE_DIR / "templates" / CORE_DIR.name],
-        "APP_DIRS": True,
+        "DIRS": [CORE_DIR / "templates" / CORE_DIR.name, BOOTSTRAP5_DIR / "templates"],
+        "APP_DIRS": TEMPLATE_PROFILES[TEMPLATE_PROFILE]["APP_DIRS"],
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "core.context_processors.template_fragments",
             ],
+            "libraries": {"bootstrap5": "bootstrap5.templatetags.bootstrap5"},
+            **TEMPLATE_PROFILES[TEMPLATE_PROFILE]["OPTIONS"],
         },
     },
 ]
+TEMPLATE_PRELOAD = TEMPLATE_PROFILES[TEMPLATE_PROFILE]["PRELOAD"]
+TEMPLATE_FRAGMENT_TIMEOUT = TEMPLATE_PROFILES[TEMPLATE_PROFILE]["FRAGMENT_TIMEOUT"]
 
 WSGI_APPLICATION = "core.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
+# DATABASE_PROFILE=production keeps connections open between requests and lets
+# readers run alongside a writer, see `manage.py benchmark_sqlite`:
+DATABASE_PROFILE = getenv("DATABASE_PROFILE", "default")
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": getenv("DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+        "CONN_MAX_AGE": int(
+            getenv(
+                "DATABASE_CONN_MAX_AGE",
+                600 if DATABASE_PROFILE == "production" else 0,
+            )
+        ),
+        "CONN_HEALTH_CHECKS": DATABASE_PROFILE == "production",
     }
 }
+# Set on each new SQLite connection:
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # Durable on power loss only at checkpoints.
+        "mmap_size": int(getenv("SQLITE_MMAP_SIZE", 256 * 1024**2)),
+        "cache_size": -int(getenv("SQLITE_CACHE_KIB", 64 * 1024)),
+        "busy_timeout": int(getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "temp_store": "MEMORY",
+    },
+}
+SQLITE_PRAGMAS = SQLITE_PROFILES[DATABASE_PROFILE]
+# Read replicas of default as "alias=name,...", e.g. "replica=replica.sqlite3"
+# with a copy of db.sqlite3 locally, see `manage.py sync_sqlite_replicas`:
+_replicas = dict(
+    replica.split("=", 1)
+    for replica in getenv("DATABASE_REPLICAS", "").split(",")
+    if replica
+)
+DATABASES.update(
+    {
+        alias: {**DATABASES["default"], "NAME": name, "TEST": {"MIRROR": "default"}}
+        for alias, name in _replicas.items()
+    }
+)
+DATABASE_REPLICAS = list(_replicas)
+DATABASE_ROUTERS = [
+    "user.routers.ReplicaRouter",
+]
+# User reads go to replicas, except for LAG seconds after a client's write:
+USER_REPLICA_ROUTER = {
+    "LAG": int(getenv("USER_REPLICA_ROUTER_LAG", 5)),
+    "COOKIE": "user_primary_pinned_until",
+}
+
+# Authentication:
+AUTHENTICATION_BACKENDS = [
+    "user.backends.UserBackend",
+]
+# Authenticated users' rows are cached, keyed by user and checked against the
+# session auth hash:
+USER_AUTH_CACHE = {
+    "CACHE": "default",
+    "TIMEOUT": int(getenv("USER_AUTH_CACHE_TIMEOUT", 300)),
+}
+# Users' permission sets are shared between processes, see warm_permission_cache:
+USER_PERMISSION_CACHE = {
+    "CACHE": "default",
+    "TIMEOUT": int(getenv("USER_PERMISSION_CACHE_TIMEOUT", 3600)),
+}
+# USER_LAST_LOGIN_BUFFER=1 buffers last_login in CACHE rather than writing it on
+# every login, writing it for MAX_PENDING logins at a time, at least every WINDOW
+# seconds and on `manage.py flush_last_logins`. The cache must be shared by every
+# process, kept, as logins not yet written are lost with it, and have atomic add
+# and incr, so Redis or Memcached rather than the file or database caches:
+USER_LAST_LOGIN_BUFFER = {
+    "ENABLED": getenv("USER_LAST_LOGIN_BUFFER", "0") == "1",
+    "CACHE": "default",
+    "WINDOW": int(getenv("USER_LAST_LOGIN_BUFFER_WINDOW", 60)),
+    "MAX_PENDING": int(getenv("USER_LAST_LOGIN_BUFFER_MAX_PENDING", 1000)),
+}
+# Failed logins are counted per email and client IP before any hashing:
+USER_LOGIN_THROTTLE = {
+    "CACHE": "default",
+    "WINDOW": int(getenv("USER_LOGIN_THROTTLE_WINDOW", 300)),
+    "EMAIL_LIMIT": int(getenv("USER_LOGIN_THROTTLE_EMAIL_LIMIT", 5)),
+    "IP_LIMIT": int(getenv("USER_LOGIN_THROTTLE_IP_LIMIT", 50)),
+    "BACKOFF": int(getenv("USER_LOGIN_THROTTLE_BACKOFF", 60)),
+    "MAX_BACKOFF": int(getenv("USER_LOGIN_THROTTLE_MAX_BACKOFF", 3600)),
+}
+# The user admin searches "indexed" fields by prefix, or "contains" anywhere, and
+# estimates counts over ESTIMATE_OVER users, paginating by email either way. Its
+# bulk actions update and delete ACTION_BATCH_SIZE users per statement:
+USER_ADMIN_CHANGELIST = {
+    "SEARCH": getenv("USER_ADMIN_CHANGELIST_SEARCH", "indexed"),
+    "ESTIMATE_OVER": int(getenv("USER_ADMIN_CHANGELIST_ESTIMATE_OVER", 100000)),
+    "ACTION_BATCH_SIZE": int(getenv("USER_ADMIN_CHANGELIST_ACTION_BATCH_SIZE", 1000)),
+}
+# `manage.py benchmark_user` fails if a median is THRESHOLD slower than BASELINE:
+USER_BENCHMARKS = {
+    "BASELINE": Path(getenv("USER_BENCHMARKS_BASELINE", BASE_DIR / "benchmarks.json")),
+    "THRESHOLD": float(getenv("USER_BENCHMARKS_THRESHOLD", 0.25)),
+    "SCALES": [1000, 100000, 1000000],
+}
 
 # Password hashing:
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "user.hashers.TunedScryptPasswordHasher",
 ]
+# Tune with `manage.py benchmark_scrypt`, stored hashes are upgraded on login:
+USER_SCRYPT = {
+    "WORK_FACTOR": int(getenv("USER_SCRYPT_WORK_FACTOR", 2**14)),
+    "BLOCK_SIZE": int(getenv("USER_SCRYPT_BLOCK_SIZE", 8)),
+    "PARALLELISM": int(getenv("USER_SCRYPT_PARALLELISM", 1)),
+}
+# Hashing runs on a pool of threads, limited so concurrent hashes fit the budget:
+USER_HASHING = {
+    "WORKERS": int(getenv("USER_HASHING_WORKERS", cpu_count())),
+    "MEMORY_BUDGET": int(getenv("USER_HASHING_MEMORY_BUDGET", 256 * 1024**2)),
+}
 # Password validation:
+# Passwords are checked against the breached password INDEX, built from breach
+# dumps by `manage.py build_breached_password_index` (with --include-common to
+# keep rejecting Django's common passwords), or without one against that list:
+USER_BREACHED_PASSWORDS = {
+    "INDEX": Path(
+        getenv("USER_BREACHED_PASSWORDS_INDEX", BASE_DIR / "breached_passwords.idx")
+    ),
+}
 AUTH_PASSWORD_VALIDATORS = [
     {
-        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",  # noqa: E501.
+        "NAME": "user.validators.UserAttributeSimilarityValidator",
     },
     {
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
     },
     {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+        "NAME": "user.validators.BreachedPasswordValidator",
+        "OPTIONS": {"index_path": USER_BREACHED_PASSWORDS["INDEX"]},
     },
     {
-        "NAME": "user.validators.AlphaAndNumericValidator",
+        "NAME": "user.validators.PasswordPolicyValidator",
         "OPTIONS": {
             "min_alpha": 2,
             "min_numeric": 2,
-        },
-    },
-    {
-        "NAME": "user.validators.EachCaseValidator",
-        "OPTIONS": {
             "min_uppercase": 2,
             "min_lowercase": 2,
+            "min_special": 1,
         },
     },
-    {
-        "NAME": "user.validators.SpecialCharactersValidator",
-    },
 ]
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/ref/settings/#caches
+# Use a shared backend, e.g. Redis or Memcached, to share across processes.
+CACHES = {
+    "default": {
+        "BACKEND": getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": getenv("CACHE_LOCATION", ""),
+    }
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 LANGUAGE_CODE = "en-gb"
@@ -125,6 +314,15 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.0/howto/static-files/
 STATIC_URL = "static/"
+STATIC_ROOT = getenv("STATIC_ROOT", BASE_DIR / "staticfiles")
+# With STATIC_MANIFEST=1, `collectstatic` writes content hashed names with gzip
+# variants, and brotli ones when installed with `poetry install --extras compression`.
+# Pages need it to have run to render with DEBUG off:
+STATICFILES_STORAGE = (
+    "core.storages.CompressedManifestStaticFilesStorage"
+    if getenv("STATIC_MANIFEST", "0") == "1"
+    else "django.contrib.staticfiles.storage.StaticFilesStorage"
+)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
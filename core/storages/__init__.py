@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Core storages."""
+
+from ._compressed_manifest_static_files_storage import (  # noqa: F401.
+    CompressedManifestStaticFilesStorage,
+)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import gzip
+from collections.abc import Iterator
+from typing import Any, Callable, Optional, Union
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Optional, only gzip variants are written without it.
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    ".css",
+    ".js",
+    ".map",
+    ".json",
+    ".svg",
+    ".txt",
+    ".html",
+    ".xml",
+    ".ico",
+    ".ttf",
+    ".otf",
+    ".eot",
+)
+MIN_SIZE = 256  # Smaller responses fit in a packet anyway.
+
+
+def _gzip(content: bytes) -> bytes:
+    """Gzip content reproducibly at the highest level.
+
+    Args:
+        content (bytes): The content.
+
+    Returns:
+        bytes: The compressed content.
+    """
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest static files storage also writing compressed variants.
+
+    After hashing, each hashed text file gets a `.gz` variant, and a `.br`
+    variant if the brotli package is installed, where compressing shrinks
+    it. Hashed names change with content, so existing variants are kept.
+    """
+
+    def encoders(self) -> dict[str, Callable[[bytes], bytes]]:
+        """The compressions to write, by file extension.
+
+        Returns:
+            dict[str, Callable[[bytes], bytes]]: The compressors.
+        """
+        encoders = {".gz": _gzip}
+        if brotli is not None:
+            encoders[".br"] = lambda content: brotli.compress(
+                content, quality=brotli.MAX_QUALITY
+            )
+        return encoders
+
+    def post_process(
+        self,
+        paths: dict[str, Any],
+        dry_run: bool = False,
+        **options: Any,
+    ) -> Iterator[tuple[str, Optional[str], Union[bool, Exception]]]:
+        """Hash the collected files then compress the hashed ones.
+
+        Args:
+            paths (dict[str, Any]): The collected files' storages and paths.
+            dry_run (bool): Whether to not change anything.
+            options: Other options.
+
+        Yields:
+            tuple[str, str | None, bool | Exception]: The original name, the
+                processed name and whether it was processed, or the error.
+        """
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        encoders = self.encoders()
+        for hashed_name in set(self.hashed_files.values()):
+            if not hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            missing = {
+                extension: encoder
+                for extension, encoder in encoders.items()
+                if not self.exists(hashed_name + extension)
+            }
+            if not missing:
+                continue
+            with self.open(hashed_name) as original:
+                content = original.read()
+            if len(content) < MIN_SIZE:
+                continue
+            for extension, encoder in missing.items():
+                compressed = encoder(content)
+                if len(compressed) < len(content):
+                    self._save(hashed_name + extension, ContentFile(compressed))
+                    yield hashed_name, hashed_name + extension, True
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Template tags for caching site-wide template fragments."""
+
+from django import template
+from django.conf import settings
+from django.template import Context
+from django.template.base import Parser, Token
+from django.templatetags.cache import CacheNode
+
+from ..context_processors._template_fragments import static_version
+
+register = template.Library()
+
+
+class SiteCacheNode(CacheNode):
+    """A cache node timed out by settings and varying on the static version."""
+
+    def render(self, context: Context) -> str:
+        """Render the fragment, from the cache if there.
+
+        Args:
+            context (Context): The template context.
+
+        Returns:
+            str: The rendered fragment.
+        """
+        with context.push(
+            TEMPLATE_FRAGMENT_TIMEOUT=settings.TEMPLATE_FRAGMENT_TIMEOUT,
+            STATIC_VERSION=static_version(),
+        ):
+            return super().render(context)
+
+
+@register.tag
+def sitecache(parser: Parser, token: Token) -> SiteCacheNode:
+    """Cache a site-wide fragment, as {% sitecache "name" %}...{% endsitecache %}.
+
+    As {% cache TEMPLATE_FRAGMENT_TIMEOUT "name" STATIC_VERSION %}, but reading
+    both from settings rather than the context, so it renders without the
+    template_fragments context processor, e.g. with render_to_string().
+
+    Args:
+        parser (Parser): The template parser.
+        token (Token): The tag's token.
+
+    Returns:
+        SiteCacheNode: The node.
+
+    Raises:
+        TemplateSyntaxError: If not given just the fragment name.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a fragment name.")
+    nodelist = parser.parse(("endsitecache",))
+    parser.delete_first_token()
+    return SiteCacheNode(
+        nodelist,
+        parser.compile_filter("TEMPLATE_FRAGMENT_TIMEOUT"),
+        bits[1],
+        [parser.compile_filter("STATIC_VERSION")],
+        None,
+    )
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Core views."""
+
+from ._metrics import metrics  # noqa: F401.
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from ..metrics import registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@never_cache
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Expose every process's metrics for Prometheus to scrape.
+
+    Args:
+        request (HttpRequest): The request, with the METRICS token as a bearer
+            token if one is set.
+
+    Returns:
+        HttpResponse: The metrics in the text exposition format.
+
+    Raises:
+        Http404: If metrics aren't enabled, or the token is wrong.
+    """
+    if not settings.METRICS["ENABLED"]:
+        raise Http404()
+    token = settings.METRICS["TOKEN"]
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        raise Http404()
+    return HttpResponse(registry.expose(), content_type=CONTENT_TYPE)
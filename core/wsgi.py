@@ -11,6 +11,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from .handlers import StaticFilesWSGIApplication
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_wsgi_application()
+# Serves files collected to STATIC_ROOT, pre-compressed and cached far-future:
+application = StaticFilesWSGIApplication(get_wsgi_application())
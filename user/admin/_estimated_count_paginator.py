@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from typing import Optional
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Max, Min, QuerySet
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator estimating the count of large unfiltered querysets.
+
+    Counting every row of a large table is a full scan, so unfiltered
+    querysets are counted from the database's statistics instead. Estimates
+    below estimate_over are replaced by an exact count.
+    """
+
+    def __init__(self, *args, estimate_over: int = 100000, **kwargs) -> None:
+        """Initialise the paginator.
+
+        Args:
+            *args: Paginator arguments.
+            estimate_over (int): The estimated count above which it is used.
+            **kwargs: Paginator keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.estimate_over = estimate_over
+        self.is_estimated = False
+
+    @cached_property
+    def count(self) -> int:
+        """The exact or estimated number of objects.
+
+        Returns:
+            int: The number of objects.
+        """
+        if isinstance(self.object_list, QuerySet) and not self.object_list.query.where:
+            estimate = self.estimate(self.object_list)
+            if estimate is not None and estimate > self.estimate_over:
+                self.is_estimated = True
+                return estimate
+        return super().count
+
+    @staticmethod
+    def estimate(queryset: QuerySet) -> Optional[int]:
+        """Estimate the number of rows of the queryset's table.
+
+        Args:
+            queryset (QuerySet): The unfiltered queryset.
+
+        Returns:
+            int, optional: The estimate, None if there is none.
+        """
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        if connection.vendor == "postgresql":
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+        elif connection.vendor == "sqlite":
+            # The first number of each stat is the table's row count on ANALYZE.
+            sql = "SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 WHERE tbl = %s"
+        else:
+            sql = None
+        if sql is not None:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, [table])
+                    row = cursor.fetchone()
+            except DatabaseError:  # No statistics table before ANALYZE.
+                row = None
+            if row is not None and row[0] is not None and row[0] >= 0:
+                return row[0]
+        # The primary key range is an index lookup and an upper bound.
+        bounds = queryset.order_by().aggregate(low=Min("pk"), high=Max("pk"))
+        if not isinstance(bounds["low"], int):
+            return None
+        return bounds["high"] - bounds["low"] + 1
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+from django import forms
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth.models import Group
+from django.utils.translation import gettext_lazy as _
+
+
+class UserActionForm(ActionForm):
+    """Action form with the group for the group actions."""
+
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.order_by("name"),
+        required=False,
+        label=_("Group:"),
+    )
@@ -1,7 +1,83 @@
 # -*- coding: utf-8 -*-
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from operator import and_, or_
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections, router, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+from django.http import HttpRequest, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, smart_split, unescape_string_literal
 from django.utils.translation import gettext_lazy as _
 
+from ..caches import LastLoginBuffer, PermissionCache, UserCache
+from ..exports import CONTENT_TYPES, exportable_fields, stream_users
+from ._estimated_count_paginator import EstimatedCountPaginator
+from ._user_action_form import UserActionForm
+from ._user_change_list import UserChangeList
+
+FTS_TABLE = "user_user_fts"
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def _in_thread(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Build a response's chunks in a thread of their own.
+
+    Django 4.1's ASGI handler iterates streaming responses on the event loop,
+    where querying the database raises SynchronousOnlyOperation. Each chunk
+    is built in the same worker thread, so a streamed query keeps its
+    connection, which is closed when the response is.
+
+    Args:
+        chunks (Iterable[bytes]): The response's chunks, built lazily.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    done = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        iterator = executor.submit(iter, chunks).result()
+        try:
+            while (chunk := executor.submit(next, iterator, done).result()) is not done:
+                yield chunk
+        finally:
+            if hasattr(iterator, "close"):
+                executor.submit(iterator.close).result()
+            executor.submit(connections.close_all).result()
+
+
+def _has_fts_table(connection: BaseDatabaseWrapper) -> bool:
+    """Whether the database has the search index table, checked per connection.
+
+    Args:
+        connection (BaseDatabaseWrapper): The connection.
+
+    Returns:
+        bool: Whether the table exists.
+    """
+    connection.ensure_connection()
+    # Kept with the DB-API connection it was checked on, so rechecked on reconnect.
+    checked = getattr(connection, "_user_fts_table", None)
+    if checked is None or checked[0] is not connection.connection:
+        checked = (
+            connection.connection,
+            FTS_TABLE in connection.introspection.table_names(),
+        )
+        connection._user_fts_table = checked
+    return checked[1]
+
 
 class UserAdmin(DjangoUserAdmin):
     """Define admin model for custom User model with no username field."""
@@ -44,3 +120,436 @@ class UserAdmin(DjangoUserAdmin):
         "last_name",
     )
     ordering = ("email",)
+    show_full_result_count = False  # A second COUNT(*) of the whole table.
+    action_form = UserActionForm
+    actions = (
+        "activate_users",
+        "deactivate_users",
+        "grant_staff",
+        "revoke_staff",
+        "add_to_group",
+        "remove_from_group",
+        "export_csv",
+        "export_jsonl",
+    )
+
+    def get_changelist(self, request: HttpRequest, **kwargs) -> type:
+        """Return the keyset paginated change list.
+
+        Args:
+            request (HttpRequest): The request.
+            **kwargs: Unused keyword arguments.
+
+        Returns:
+            type: The change list class.
+        """
+        return UserChangeList
+
+    def get_object(
+        self,
+        request: HttpRequest,
+        object_id: str,
+        from_field: Optional[str] = None,
+    ) -> Optional[Any]:
+        """Return the user, with any last login not yet written.
+
+        Args:
+            request (HttpRequest): The request.
+            object_id (str): The user's primary key, or from_field value.
+            from_field (str, optional): The field to look the user up by.
+
+        Returns:
+            user.models.User, optional: The user, None if there isn't one.
+        """
+        user = super().get_object(request, object_id, from_field)
+        if user is not None and settings.USER_LAST_LOGIN_BUFFER["ENABLED"]:
+            LastLoginBuffer.from_settings().apply([user])
+        return user
+
+    def get_paginator(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        per_page: int,
+        orphans: int = 0,
+        allow_empty_first_page: bool = True,
+    ) -> EstimatedCountPaginator:
+        """Return a paginator estimating large unfiltered counts.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The users to paginate.
+            per_page (int): The number of users per page.
+            orphans (int): The minimum number of users on the last page.
+            allow_empty_first_page (bool): Whether the first page may be empty.
+
+        Returns:
+            EstimatedCountPaginator: The paginator.
+        """
+        return EstimatedCountPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            estimate_over=settings.USER_ADMIN_CHANGELIST["ESTIMATE_OVER"],
+        )
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> tuple[QuerySet, bool]:
+        """Search on indexes, unless the search is set to contains.
+
+        Full text search is used on SQLite with FTS5 and trigram indexes serve
+        the default contains search on PostgreSQL. Otherwise each term must
+        prefix one of the lowercase indexed search fields.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The users to search.
+            search_term (str): The search.
+
+        Returns:
+            tuple[QuerySet, bool]: The users found and whether they may
+                include duplicates.
+        """
+        connection = connections[queryset.db]
+        if (
+            settings.USER_ADMIN_CHANGELIST["SEARCH"] != "indexed"
+            or connection.vendor == "postgresql"
+        ):
+            return super().get_search_results(request, queryset, search_term)
+        terms = []
+        for term in smart_split(search_term):
+            if term.startswith(('"', "'")) and term[0] == term[-1]:
+                term = unescape_string_literal(term)
+            if term:
+                terms.append(term.lower())
+        if not terms:
+            return queryset, False
+        if connection.vendor == "sqlite" and _has_fts_table(connection):
+            match = " ".join('"%s"*' % term.replace('"', '""') for term in terms)
+            rowids = RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [match],
+            )
+            return queryset.filter(pk__in=rowids), False
+        queryset = queryset.alias(
+            **{f"{field}_lower": Lower(field) for field in self.search_fields}
+        )
+        conditions = []
+        for term in terms:
+            # Ranges rather than LIKE, which most backends can't index.
+            successor = term[:-1] + chr(ord(term[-1]) + 1)
+            conditions.append(
+                reduce(
+                    or_,
+                    (
+                        Q(
+                            **{
+                                f"{field}_lower__gte": term,
+                                f"{field}_lower__lt": successor,
+                            }
+                        )
+                        for field in self.search_fields
+                    ),
+                )
+            )
+        return queryset.filter(reduce(and_, conditions)), False
+
+    def _batches(self, queryset: QuerySet) -> Iterator[list[Any]]:
+        """Split users into batches of primary keys, fetched as needed.
+
+        Args:
+            queryset (QuerySet): The users.
+
+        Yields:
+            list[Any]: The next ACTION_BATCH_SIZE primary keys, in order.
+        """
+        batch_size = settings.USER_ADMIN_CHANGELIST["ACTION_BATCH_SIZE"]
+        primary_keys = queryset.order_by("pk").values_list("pk", flat=True)
+        batch = list(primary_keys[:batch_size])
+        while batch:
+            yield batch
+            batch = list(primary_keys.filter(pk__gt=batch[-1])[:batch_size])
+
+    def _update_users(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        message: str,
+        **values: Any,
+    ) -> None:
+        """Update the users not already set, a batch per statement.
+
+        update() sends no signals, so the users' cached rows and permissions
+        are invalidated here.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+            message (str): The message for the count of users updated, with
+                count and batches placeholders.
+            values: The fields to set.
+        """
+        if values.get("is_active") is False or values.get("is_staff") is False:
+            # Don't let staff lock themselves out.
+            if queryset.filter(pk=request.user.pk).exists():
+                queryset = queryset.exclude(pk=request.user.pk)
+                self.message_user(
+                    request, _("Your own account was skipped."), messages.WARNING
+                )
+        queryset = queryset.exclude(**values)
+        model = queryset.model
+        user_cache = UserCache.from_settings()
+        permission_cache = PermissionCache.from_settings()
+        updated = batches = 0
+        for batch in self._batches(queryset):
+            with transaction.atomic(using=router.db_for_write(model)):
+                updated += model._default_manager.filter(pk__in=batch).update(**values)
+            user_cache.invalidate(batch)
+            permission_cache.invalidate(batch)
+            batches += 1
+        self.message_user(
+            request,
+            message % {"count": updated, "batches": batches},
+            messages.SUCCESS,
+        )
+
+    @admin.action(description=_("Activate selected users"), permissions=["change"])
+    def activate_users(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Activate the selected users.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+        """
+        self._update_users(
+            request,
+            queryset,
+            _("Activated %(count)d users in %(batches)d batches."),
+            is_active=True,
+        )
+
+    @admin.action(description=_("Deactivate selected users"), permissions=["change"])
+    def deactivate_users(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Deactivate the selected users.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+        """
+        self._update_users(
+            request,
+            queryset,
+            _("Deactivated %(count)d users in %(batches)d batches."),
+            is_active=False,
+        )
+
+    @admin.action(
+        description=_("Grant staff status to selected users"),
+        permissions=["change"],
+    )
+    def grant_staff(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Grant the selected users staff status.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+        """
+        self._update_users(
+            request,
+            queryset,
+            _("Granted staff status to %(count)d users in %(batches)d batches."),
+            is_staff=True,
+        )
+
+    @admin.action(
+        description=_("Revoke staff status from selected users"),
+        permissions=["change"],
+    )
+    def revoke_staff(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Revoke the selected users' staff status.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+        """
+        self._update_users(
+            request,
+            queryset,
+            _("Revoked staff status from %(count)d users in %(batches)d batches."),
+            is_staff=False,
+        )
+
+    def _action_group(self, request: HttpRequest) -> Optional[Group]:
+        """Get the group chosen for a group action.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            Group, optional: The group, None after messaging the user if none
+                or an invalid one was chosen.
+        """
+        try:
+            group = self.action_form.base_fields["group"].clean(
+                request.POST.get("group")
+            )
+        except ValidationError as error:
+            self.message_user(request, error.messages[0], messages.ERROR)
+            return None
+        if group is None:
+            self.message_user(request, _("Choose a group."), messages.ERROR)
+        return group
+
+    @admin.action(description=_("Add selected users to group"), permissions=["change"])
+    def add_to_group(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Add the selected users to the chosen group, a batch per insert.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+        """
+        group = self._action_group(request)
+        if group is None:
+            return
+        membership = queryset.model.groups.through
+        permission_cache = PermissionCache.from_settings()
+        added = batches = 0
+        for batch in self._batches(queryset.exclude(groups=group)):
+            membership.objects.bulk_create(
+                [membership(user_id=pk, group_id=group.pk) for pk in batch],
+                ignore_conflicts=True,
+            )
+            permission_cache.invalidate(batch)
+            added += len(batch)
+            batches += 1
+        self.message_user(
+            request,
+            _("Added %(count)d users to %(group)s in %(batches)d batches.")
+            % {"count": added, "group": group, "batches": batches},
+            messages.SUCCESS,
+        )
+
+    @admin.action(
+        description=_("Remove selected users from group"),
+        permissions=["change"],
+    )
+    def remove_from_group(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Remove the selected users from the chosen group, a batch per delete.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+        """
+        group = self._action_group(request)
+        if group is None:
+            return
+        membership = queryset.model.groups.through
+        permission_cache = PermissionCache.from_settings()
+        removed = batches = 0
+        for batch in self._batches(queryset.filter(groups=group)):
+            removed += membership.objects.filter(
+                group_id=group.pk, user_id__in=batch
+            ).delete()[0]
+            permission_cache.invalidate(batch)
+            batches += 1
+        self.message_user(
+            request,
+            _("Removed %(count)d users from %(group)s in %(batches)d batches.")
+            % {"count": removed, "group": group, "batches": batches},
+            messages.SUCCESS,
+        )
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet) -> None:
+        """Delete users a batch per transaction, not all in one.
+
+        Each batch is still collected, so related rows are deleted and the
+        caches invalidated by the delete signals, but locks are held briefly.
+        The delete action reports the count.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The users to delete.
+        """
+        model = queryset.model
+        for batch in self._batches(queryset):
+            with transaction.atomic(using=router.db_for_write(model)):
+                model._default_manager.filter(pk__in=batch).delete()
+
+    @admin.action(description=_("Export selected users as CSV"), permissions=["view"])
+    def export_csv(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+    ) -> StreamingHttpResponse:
+        """Stream the selected users as a CSV download.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+
+        Returns:
+            StreamingHttpResponse: The download.
+        """
+        return self._export(request, queryset, "csv")
+
+    @admin.action(
+        description=_("Export selected users as JSON lines"),
+        permissions=["view"],
+    )
+    def export_jsonl(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+    ) -> StreamingHttpResponse:
+        """Stream the selected users as a JSON lines download.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The selected users.
+
+        Returns:
+            StreamingHttpResponse: The download.
+        """
+        return self._export(request, queryset, "jsonl")
+
+    def _export(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        output_format: str,
+    ) -> StreamingHttpResponse:
+        """Stream users as a download, gzipped if the client accepts it.
+
+        Args:
+            request (HttpRequest): The request.
+            queryset (QuerySet): The users.
+            output_format (str): "csv" or "jsonl".
+
+        Returns:
+            StreamingHttpResponse: The download.
+        """
+        content = (
+            chunk.encode()
+            for chunk in stream_users(queryset, exportable_fields(), output_format)
+        )
+        compress = ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", ""))
+        if compress:
+            content = compress_sequence(content)
+        if isinstance(request, ASGIRequest):
+            content = _in_thread(content)
+        response = StreamingHttpResponse(
+            content,
+            content_type=CONTENT_TYPES[output_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="users.{output_format}"'
+            },
+        )
+        if compress:
+            response.headers["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from typing import Optional
+
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.http import HttpRequest
+
+AFTER_VAR = "after"
+
+
+class UserChangeList(ChangeList):
+    """Change list paginating on the email ordering key.
+
+    Pages after the first are selected by email greater than the last one
+    shown, rather than an OFFSET reading every row before the page. Page
+    numbers still work but only First and Next are linked.
+    """
+
+    def __init__(self, request: HttpRequest, *args, **kwargs) -> None:
+        """Initialise the change list.
+
+        Args:
+            request (HttpRequest): The request.
+            *args: ChangeList arguments.
+            **kwargs: ChangeList keyword arguments.
+        """
+        self.after = request.GET.get(AFTER_VAR) or None
+        self.next_after: Optional[str] = None
+        self.keyset = False
+        super().__init__(request, *args, **kwargs)
+        # Sorting, filtering and searching start again from the first page.
+        self.params.pop(AFTER_VAR, None)
+
+    def get_filters_params(self, params: Optional[dict] = None) -> dict:
+        """Return the lookup parameters, without the keyset cursor.
+
+        Args:
+            params (dict, optional): The parameters, defaults to the query's.
+
+        Returns:
+            dict: The lookup parameters.
+        """
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        return lookup_params
+
+    def get_results(self, request: HttpRequest) -> None:
+        """Get the page of results, after the cursor when sorted by email.
+
+        Args:
+            request (HttpRequest): The request.
+        """
+        super().get_results(request)
+        if ORDER_VAR in self.params or not self.multi_page or self.show_all:
+            return
+        if self.after is None and self.page_num != 1:
+            return
+        queryset = self.queryset
+        if self.after is not None:
+            queryset = queryset.filter(email__gt=self.after)
+        results = list(queryset[: self.list_per_page + 1])
+        if len(results) > self.list_per_page:
+            results = results[: self.list_per_page]
+            self.next_after = results[-1].email
+        self.result_list = results
+        self.keyset = True
+
+    def get_next_url(self) -> Optional[str]:
+        """Get the next page's URL.
+
+        Returns:
+            str, optional: The URL, None on the last page.
+        """
+        if self.next_after is None:
+            return None
+        return self.get_query_string({AFTER_VAR: self.next_after})
+
+    def get_first_url(self) -> Optional[str]:
+        """Get the first page's URL.
+
+        Returns:
+            str, optional: The URL, None on the first page.
+        """
+        if self.after is None:
+            return None
+        return self.get_query_string(remove=[AFTER_VAR])
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
 """User app configs."""
 from django.apps import AppConfig
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_migrate
+
+# Django's create_permissions receiver's, which must run before the cache is
+# invalidated.
+CREATE_PERMISSIONS_DISPATCH_UID = "django.contrib.auth.management.create_permissions"
 
 
 class UserConfig(AppConfig):
@@ -8,3 +15,28 @@ class UserConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self) -> None:
+        """Connect the app's signal receivers and register its checks."""
+        from django.contrib.auth.management import create_permissions
+
+        from . import checks, receivers  # noqa: F401.
+
+        # Under Django's dispatch_uid, so whichever app is ready first, it's
+        # connected once and before the invalidation.
+        post_migrate.connect(
+            create_permissions, dispatch_uid=CREATE_PERMISSIONS_DISPATCH_UID
+        )
+        post_migrate.connect(
+            receivers.invalidate_migrated_permissions,
+            dispatch_uid="user.invalidate_migrated_permissions",
+        )
+
+        if settings.USER_LAST_LOGIN_BUFFER["ENABLED"]:
+            # Under Django's dispatch_uid, so whichever app is ready first, only
+            # the buffer is connected.
+            user_logged_in.disconnect(dispatch_uid=receivers.LAST_LOGIN_DISPATCH_UID)
+            user_logged_in.connect(
+                receivers.buffer_last_login,
+                dispatch_uid=receivers.LAST_LOGIN_DISPATCH_UID,
+            )
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""User related authentication backends."""
+
+from ._user_backend import UserBackend  # noqa: F401.
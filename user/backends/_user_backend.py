@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest
+
+from ..caches import PermissionCache
+from ..throttles import LoginThrottle
+
+if TYPE_CHECKING:
+    from ..models import User
+
+
+class UserBackend(ModelBackend):
+    """Model backend with login throttling and shared permission caching.
+
+    Failed logins are throttled before any hashing, and permission sets are
+    cached between requests and processes.
+    """
+
+    def authenticate(
+        self,
+        request: Optional[HttpRequest],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Optional["User"]:
+        """Authenticate unless the email or client IP is locked out.
+
+        Args:
+            request (HttpRequest, optional): The login request.
+            username (str, optional): The email logged in with.
+            password (str, optional): The password logged in with.
+            kwargs: Other credentials.
+
+        Raises:
+            PermissionDenied: If too many logins for the email or
+                from the client IP have failed recently.
+
+        Returns:
+            user.models.User, optional: The user, if authenticated.
+        """
+        if username is None:
+            username = kwargs.get(get_user_model().USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        throttle = LoginThrottle.from_settings()
+        ip = request.META.get("REMOTE_ADDR") if request is not None else None
+        if throttle.blocked_for(username, ip):
+            raise PermissionDenied
+        user = super().authenticate(request, username=username, password=password)
+        if user is None:
+            throttle.record_failure(username, ip)
+        else:
+            throttle.reset(username)
+        return user
+
+    def get_all_permissions(
+        self,
+        user_obj: "User",
+        obj: Optional[Any] = None,
+    ) -> set[str]:
+        """All of a user's permissions, from the shared permission cache.
+
+        As parent, but a set missing from the shared cache is added to it.
+
+        Args:
+            user_obj (User): The user.
+            obj (Any, optional): Object permissions are for, unsupported.
+                Defaults to None.
+
+        Returns:
+            set[str]: The permission names.
+        """
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            permission_cache = PermissionCache.from_settings()
+            keys = permission_cache.keys([user_obj.pk])
+            permissions = permission_cache.get_many(keys).get(user_obj.pk)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                permission_cache.set_many({user_obj.pk: permissions}, keys)
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
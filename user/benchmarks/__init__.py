@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""User related benchmarks."""
+
+from ._cases import get_benchmarks, seed_users  # noqa: F401.
+from ._suite import Benchmark, BenchmarkResult, find_regressions  # noqa: F401.
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Iterator
+from itertools import cycle, islice
+from typing import Any, Callable, Optional
+
+from django.contrib.auth import authenticate, password_validation
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import (
+    get_default_password_validators,
+    validate_password,
+)
+from django.core.exceptions import ValidationError
+from django.test import Client, RequestFactory
+
+from ..models import User
+from ..validators import UserAttributeSimilarityValidator
+from ._suite import Benchmark
+
+PASSWORD = "Bench-Mark-42-Pass!"
+# Passing and failing the default validators, checked in turn:
+PASSWORDS = (
+    PASSWORD,
+    "password",
+    "benchmark",
+    "Aa1!",
+    "correct horse battery staple",
+    "ZZyy99!!" * 16,
+)
+# Long passwords, as bulk imports of passphrases and generated secrets have:
+LONG_PASSWORDS = (
+    "bench-mark@example.com" * 4,
+    "Bench Mark's correct horse battery staple, " * 8,
+    "x7#Qp2!Lm9$Vr4&" * 32,
+)
+SEED_BATCH_SIZE = 10000
+
+
+def _user(email: str = "bench-mark@example.com") -> User:
+    """An unsaved user for validators to compare passwords with.
+
+    Args:
+        email (str): The user's email.
+
+    Returns:
+        User: The user.
+    """
+    return User(email=email, first_name="Bench", last_name="Mark")
+
+
+def _validate(
+    validators: Optional[list],
+    passwords: tuple[str, ...] = PASSWORDS,
+) -> Callable[[Optional[int]], Callable]:
+    """Build the setup for a benchmark validating each of some passwords.
+
+    Args:
+        validators (list, optional): The validators, None for the default
+            AUTH_PASSWORD_VALIDATORS chain.
+        passwords (tuple[str, ...]): The passwords. Defaults to PASSWORDS.
+
+    Returns:
+        Callable[[int | None], Callable]: The setup.
+    """
+
+    def setup(scale: Optional[int]) -> Callable[[int], None]:
+        user = _user()
+
+        def operation(iteration: int) -> None:
+            for password in passwords:
+                try:
+                    validate_password(password, user, validators)
+                except ValidationError:
+                    pass
+
+        return operation
+
+    return setup
+
+
+def _create_user(scale: Optional[int]) -> Callable[[int], User]:
+    """Set up creating users, hashing each password.
+
+    Args:
+        scale (int, optional): Unused.
+
+    Returns:
+        Callable[[int], User]: The operation.
+    """
+    return lambda iteration: User.objects.create_user(
+        f"create-user-{iteration}@example.com", PASSWORD
+    )
+
+
+def _create_superuser(scale: Optional[int]) -> Callable[[int], User]:
+    """Set up creating superusers, hashing each password.
+
+    Args:
+        scale (int, optional): Unused.
+
+    Returns:
+        Callable[[int], User]: The operation.
+    """
+    return lambda iteration: User.objects.create_superuser(
+        f"create-superuser-{iteration}@example.com", PASSWORD
+    )
+
+
+def _login(scale: Optional[int]) -> Callable[[int], Any]:
+    """Set up authenticating a user, hashing the password given.
+
+    Args:
+        scale (int, optional): Unused.
+
+    Returns:
+        Callable[[int], Any]: The operation.
+    """
+    User.objects.filter_by_email("login@example.com").delete()
+    User.objects.create_user("login@example.com", PASSWORD)
+    request = RequestFactory().post("/admin/login/")
+
+    def operation(iteration: int) -> User:
+        user = authenticate(request, username="login@example.com", password=PASSWORD)
+        assert user is not None, "The benchmark user couldn't log in."
+        return user
+
+    return operation
+
+
+def seed_users(scale: int) -> None:
+    """Add users sharing a precomputed password hash until there are enough.
+
+    Args:
+        scale (int): The number of users wanted.
+    """
+    existing = User.objects.count()
+    encoded = make_password(PASSWORD)
+    rows: Iterator[User] = (
+        User(
+            email=f"seed-{number:07d}@example.com",
+            first_name=first_name,
+            last_name=f"Seed{number}",
+            password=encoded,
+        )
+        for number, first_name in islice(
+            enumerate(cycle(("Ann", "Bob", "Cat", "Dan"))), existing, scale
+        )
+    )
+    while batch := list(islice(rows, SEED_BATCH_SIZE)):
+        User.objects.bulk_create(batch)
+
+
+def _changelist(query: dict[str, str]) -> Callable[[Optional[int]], Callable]:
+    """Build the setup for a benchmark of the user admin changelist.
+
+    Args:
+        query (dict[str, str]): The changelist's query parameters.
+
+    Returns:
+        Callable[[int | None], Callable]: The setup.
+    """
+
+    def setup(scale: Optional[int]) -> Callable[[int], None]:
+        seed_users(scale)
+        admin, _created = User.objects.get_or_create(
+            email="changelist-admin@example.com",
+            defaults={"is_staff": True, "is_superuser": True},
+        )
+        client = Client()
+        client.force_login(admin)
+
+        def operation(iteration: int) -> None:
+            response = client.get("/admin/user/user/", query)
+            assert response.status_code == 200, response.status_code
+
+        return operation
+
+    return setup
+
+
+def _read_users(projection: bool) -> Callable[[Optional[int]], Callable]:
+    """Build the setup for a benchmark reading and holding every user.
+
+    Projections are of id, email and is_active, as jobs mostly need.
+
+    Args:
+        projection (bool): Read projections rather than model instances.
+
+    Returns:
+        Callable[[int | None], Callable]: The setup.
+    """
+
+    def setup(scale: Optional[int]) -> Callable[[int], list]:
+        seed_users(scale)
+        if projection:
+            return lambda iteration: list(User.objects.projection())
+        return lambda iteration: list(User.objects.iterator(chunk_size=2000))
+
+    return setup
+
+
+def get_benchmarks() -> list[Benchmark]:
+    """The user subsystem's benchmarks, including each configured validator.
+
+    Returns:
+        list[Benchmark]: The benchmarks.
+    """
+    return [
+        Benchmark("manager.create_user", _create_user, iterations=20),
+        Benchmark("manager.create_superuser", _create_superuser, iterations=20),
+        *(
+            Benchmark(
+                f"validators.{type(validator).__name__}",
+                _validate([validator]),
+                iterations=200,
+            )
+            for validator in get_default_password_validators()
+        ),
+        Benchmark("validators.chain", _validate(None), iterations=200),
+        Benchmark(
+            "validators.similarity_long.django",
+            _validate(
+                [password_validation.UserAttributeSimilarityValidator()],
+                LONG_PASSWORDS,
+            ),
+            iterations=200,
+        ),
+        Benchmark(
+            "validators.similarity_long",
+            _validate([UserAttributeSimilarityValidator()], LONG_PASSWORDS),
+            iterations=200,
+        ),
+        Benchmark("auth.login", _login, iterations=20),
+        Benchmark("admin.changelist", _changelist({}), iterations=20, scaled=True),
+        Benchmark(
+            "admin.changelist_search",
+            _changelist({"q": "seed-00012"}),
+            iterations=20,
+            scaled=True,
+        ),
+        Benchmark(
+            "manager.instances",
+            _read_users(projection=False),
+            iterations=3,
+            scaled=True,
+            trace_memory=True,
+        ),
+        Benchmark(
+            "manager.projection",
+            _read_users(projection=True),
+            iterations=3,
+            scaled=True,
+            trace_memory=True,
+        ),
+    ]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import statistics
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class BenchmarkResult(NamedTuple):
+    """Timings of a benchmark at a scale, and its peak memory if traced."""
+
+    name: str
+    scale: Optional[int]
+    iterations: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    per_second: float
+    peak_kib: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        """The key identifying the benchmark and scale in a baseline.
+
+        Returns:
+            str: The key.
+        """
+        return self.name if self.scale is None else f"{self.name}@{self.scale}"
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A timed operation, optionally run at several numbers of users.
+
+    The setup is given the scale, or None if unscaled, and returns the
+    operation to time, which is given the iteration number. With
+    trace_memory, the operation is run once more after timing, under
+    tracemalloc, for the peak memory it allocates.
+    """
+
+    name: str
+    setup: Callable[[Optional[int]], Callable[[int], Any]]
+    iterations: int = 100
+    warmup: int = 1
+    scaled: bool = False
+    trace_memory: bool = False
+
+    def run(self, scale: Optional[int] = None) -> BenchmarkResult:
+        """Time the operation.
+
+        Args:
+            scale (int, optional): The number of users to run with.
+                Defaults to None.
+
+        Returns:
+            BenchmarkResult: The timings.
+        """
+        operation = self.setup(scale)
+        for iteration in range(-self.warmup, 0):
+            operation(iteration)
+        latencies = []
+        for iteration in range(self.iterations):
+            started = perf_counter()
+            operation(iteration)
+            latencies.append((perf_counter() - started) * 1000)
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        else:
+            percentiles = latencies * 99
+        mean = statistics.fmean(latencies)
+        peak_kib = None
+        if self.trace_memory:
+            tracemalloc.start()
+            try:
+                operation(self.iterations)
+                peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+        return BenchmarkResult(
+            name=self.name,
+            scale=scale,
+            iterations=self.iterations,
+            mean_ms=mean,
+            p50_ms=percentiles[49],
+            p95_ms=percentiles[94],
+            per_second=1000 / mean if mean else float("inf"),
+            peak_kib=peak_kib,
+        )
+
+
+def find_regressions(
+    results: Iterable[dict[str, Any]],
+    baseline: Iterable[dict[str, Any]],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    """Find results with a median slower than the baseline's by the threshold.
+
+    Args:
+        results (Iterable[dict[str, Any]]): The results, as from _asdict().
+        baseline (Iterable[dict[str, Any]]): The baseline results.
+        threshold (float): The allowed slow down, e.g. 0.25 for 25%.
+
+    Returns:
+        list[dict[str, Any]]: The regressed results, with the baseline's
+            median, their change and key.
+    """
+    baseline_by_key = {BenchmarkResult(**result).key: result for result in baseline}
+    regressions = []
+    for result in results:
+        key = BenchmarkResult(**result).key
+        base = baseline_by_key.get(key)
+        if base is None or not base["p50_ms"]:
+            continue
+        change = result["p50_ms"] / base["p50_ms"] - 1
+        if change > threshold:
+            regressions.append(
+                {
+                    **result,
+                    "key": key,
+                    "baseline_p50_ms": base["p50_ms"],
+                    "change": change,
+                }
+            )
+    return regressions
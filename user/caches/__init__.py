@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""User related caches."""
+
+from ._last_login_buffer import LastLoginBuffer  # noqa: F401.
+from ._permission_cache import PermissionCache  # noqa: F401.
+from ._user_cache import UserCache  # noqa: F401.
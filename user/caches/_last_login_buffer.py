@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router, transaction
+
+from ._user_cache import UserCache
+
+if TYPE_CHECKING:
+    from ..models import User
+
+
+class LastLoginBuffer:
+    """Buffers logins' last_login in a cache, to write in batches.
+
+    Each login is numbered from a shared counter and stored under its number,
+    so any process, or `manage.py flush_last_logins`, can write every pending
+    login since the last flush with a statement per batch. Each user's latest
+    pending login is also kept, for reads to show until it's written.
+    """
+
+    key_prefix = "user:last_login"
+    lock_timeout = 300
+
+    def __init__(
+        self,
+        cache: str = "default",
+        window: int = 60,
+        max_pending: int = 1000,
+    ) -> None:
+        """Sets up the cache to use and when to flush.
+
+        Args:
+            cache (str): Alias of the cache to buffer logins in.
+                Defaults to "default".
+            window (int): Seconds between flushes. Defaults to 60.
+            max_pending (int): Logins to buffer before flushing, and to write
+                per statement. Defaults to 1000.
+        """
+        self._cache = caches[cache]
+        self._window = window
+        self._max_pending = max_pending
+
+    @classmethod
+    def from_settings(cls) -> "LastLoginBuffer":
+        """A buffer configured by settings.USER_LAST_LOGIN_BUFFER.
+
+        Returns:
+            LastLoginBuffer: The buffer.
+        """
+        return cls(
+            **{
+                name.lower(): value
+                for name, value in settings.USER_LAST_LOGIN_BUFFER.items()
+                if name != "ENABLED"
+            }
+        )
+
+    def _key(self, name: Any) -> str:
+        """Cache key of one of the buffer's values.
+
+        Args:
+            name (Any): The value's name.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{self.key_prefix}:{name}"
+
+    def _next_number(self) -> int:
+        """Number a login, after every other buffered.
+
+        Returns:
+            int: The login's number.
+        """
+        key = self._key("number")
+        self._cache.add(key, 0, timeout=None)
+        try:
+            return self._cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr, so number on from the last flush.
+            self._cache.add(key, self._cache.get(self._key("flushed"), 0), None)
+            return self._cache.incr(key)
+
+    def record(self, user_id: Any, when: datetime) -> None:
+        """Buffer a login, flushing the buffer if due.
+
+        Args:
+            user_id (Any): The user's primary key.
+            when (datetime): The time of the login.
+        """
+        self._cache.set(self._key(f"user:{user_id}"), when, timeout=None)
+        number = self._next_number()
+        self._cache.set(self._key(f"login:{number}"), (user_id, when), timeout=None)
+        if number % self._max_pending == 0 or self._cache.add(
+            self._key("window"), True, timeout=self._window
+        ):
+            self.flush()
+
+    def pending(self, user_ids: Iterable[Any]) -> dict[Any, datetime]:
+        """Users' buffered last logins.
+
+        Args:
+            user_ids (Iterable[Any]): The users' primary keys.
+
+        Returns:
+            dict[Any, datetime]: The last logins, by primary key of the users
+                with any buffered.
+        """
+        keys = {self._key(f"user:{user_id}"): user_id for user_id in user_ids}
+        return {
+            keys[key]: when for key, when in self._cache.get_many(list(keys)).items()
+        }
+
+    def apply(self, users: Iterable["User"]) -> None:
+        """Show users' buffered last logins, where later than their rows'.
+
+        Args:
+            users (Iterable[User]): The users, whose last_login is set.
+        """
+        users = list(users)
+        pending = self.pending(user.pk for user in users)
+        for user in users:
+            when = pending.get(user.pk)
+            if when is not None and (user.last_login is None or user.last_login < when):
+                user.last_login = when
+
+    def flush(self) -> Optional[int]:
+        """Write every buffered login.
+
+        Returns:
+            int | None: The number of logins written, None if another flush is
+                running.
+        """
+        lock_key = self._key("lock")
+        if not self._cache.add(lock_key, True, timeout=self.lock_timeout):
+            return None
+        try:
+            return self._flush()
+        finally:
+            self._cache.delete(lock_key)
+
+    def _flush(self) -> int:
+        """Write every buffered login, holding the lock.
+
+        A login numbered but not stored yet is missed, leaving the user's row
+        at their previous login until they log in again.
+
+        Returns:
+            int: The number of logins written.
+        """
+        user_model = get_user_model()
+        using = router.db_for_write(user_model)
+        flushed = self._cache.get(self._key("flushed"), 0)
+        last = self._cache.get(self._key("number"), 0)
+        written: dict[Any, datetime] = {}
+        count = 0
+        for start in range(flushed + 1, last + 1, self._max_pending):
+            keys = [
+                self._key(f"login:{number}")
+                for number in range(start, min(start + self._max_pending, last + 1))
+            ]
+            latest: dict[Any, datetime] = {}
+            for user_id, when in self._cache.get_many(keys).values():
+                if user_id not in latest or latest[user_id] < when:
+                    latest[user_id] = when
+                count += 1
+            with transaction.atomic(using=using):
+                user_model._base_manager.using(using).bulk_update(
+                    [
+                        user_model(pk=user_id, last_login=when)
+                        for user_id, when in latest.items()
+                    ],
+                    ["last_login"],
+                )
+            self._cache.delete_many(keys)
+            self._cache.set(self._key("flushed"), start + len(keys) - 1, None)
+            written.update(latest)
+        # Users who logged in again since keep their later pending login.
+        pending = self.pending(written)
+        self._cache.delete_many(
+            [
+                self._key(f"user:{user_id}")
+                for user_id, when in written.items()
+                if user_id in pending and pending[user_id] <= when
+            ]
+        )
+        UserCache.from_settings().invalidate(written)
+        return count
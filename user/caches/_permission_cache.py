@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import time
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class PermissionCache:
+    """Caches users' permission sets, shared between processes.
+
+    Keys include a generation number, so changes that affect many users at
+    once, such as a group's permissions, invalidate every set by bumping it,
+    and a version number per user, bumped by changes to the user's own.
+    """
+
+    key_prefix = "user:perms"
+
+    def __init__(self, cache: str = "default", timeout: int = 3600) -> None:
+        """Sets up the cache to use.
+
+        Args:
+            cache (str): Alias of the cache to store permissions in.
+                Defaults to "default".
+            timeout (int): Seconds to keep a permission set for.
+                Defaults to 3600.
+        """
+        self._cache = caches[cache]
+        self._timeout = timeout
+
+    @classmethod
+    def from_settings(cls) -> "PermissionCache":
+        """A permission cache configured by settings.USER_PERMISSION_CACHE.
+
+        Returns:
+            PermissionCache: The permission cache.
+        """
+        return cls(
+            **{
+                name.lower(): value
+                for name, value in settings.USER_PERMISSION_CACHE.items()
+            }
+        )
+
+    @property
+    def _generation_key(self) -> str:
+        """Cache key of the generation number.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{self.key_prefix}:generation"
+
+    def _version_key(self, user_id: Any) -> str:
+        """Cache key of a user's version number.
+
+        Args:
+            user_id (Any): The user's primary key.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{self.key_prefix}:version:{user_id}"
+
+    def _number(self, key: str) -> int:
+        """A generation or version number, starting it if missing.
+
+        Numbers start from the time, not 1, so if one is evicted, sets cached
+        under its old value aren't reachable again.
+
+        Args:
+            key (str): The number's cache key.
+
+        Returns:
+            int: The number.
+        """
+        return self._cache.get_or_set(key, time.time_ns, timeout=None)
+
+    def _bump(self, key: str) -> None:
+        """Move a generation or version number on.
+
+        Args:
+            key (str): The number's cache key.
+        """
+        try:
+            self._cache.incr(key)
+        except ValueError:
+            # Missing, so start it afresh, past any value it had.
+            self._number(key)
+
+    def generation(self) -> int:
+        """The current generation number.
+
+        Returns:
+            int: The generation.
+        """
+        return self._number(self._generation_key)
+
+    def keys(
+        self,
+        user_ids: Iterable[Any],
+        generation: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Cache keys for users' permission sets as they are now.
+
+        Keys include the generation and each user's version, which
+        invalidation moves on, so take them before reading permissions from
+        the database. Sets read from before a change are then written under
+        keys no longer read, rather than served until they time out.
+
+        Args:
+            user_ids (Iterable[Any]): The users' primary keys.
+            generation (int, optional): The generation to use, as taken before
+                reading. Defaults to the current generation.
+
+        Returns:
+            dict[str, Any]: The users' primary keys by cache key.
+        """
+        version_keys = {self._version_key(pk): pk for pk in user_ids}
+        numbers = self._cache.get_many([self._generation_key, *version_keys])
+        if generation is None:
+            generation = numbers.get(self._generation_key) or self.generation()
+        return {
+            f"{self.key_prefix}:{generation}:{pk}:"
+            f"{numbers.get(version_key) or self._number(version_key)}": pk
+            for version_key, pk in version_keys.items()
+        }
+
+    def get_many(self, keys: dict[str, Any]) -> dict[Any, set[str]]:
+        """Users' cached permissions.
+
+        Args:
+            keys (dict[str, Any]): The users' keys, from keys().
+
+        Returns:
+            dict[Any, set[str]]: The permission names by primary key of the
+                users with a set cached.
+        """
+        return {keys[key]: names for key, names in self._cache.get_many(keys).items()}
+
+    def set_many(
+        self,
+        permissions: dict[Any, set[str]],
+        keys: dict[str, Any],
+    ) -> None:
+        """Cache users' permissions.
+
+        Args:
+            permissions (dict[Any, set[str]]): Permission names by user
+                primary key.
+            keys (dict[str, Any]): The users' keys, from keys() before the
+                permissions were read.
+        """
+        self._cache.set_many(
+            {key: permissions[pk] for key, pk in keys.items() if pk in permissions},
+            timeout=self._timeout,
+        )
+
+    def invalidate(self, user_ids: Iterable[Any]) -> None:
+        """Forget users' cached permissions, by moving their versions on.
+
+        Args:
+            user_ids (Iterable[Any]): The users' primary keys.
+        """
+        for pk in user_ids:
+            self._bump(self._version_key(pk))
+
+    def invalidate_all(self) -> None:
+        """Forget every user's cached permissions."""
+        self._bump(self._generation_key)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare
+
+if TYPE_CHECKING:
+    from ..models import User
+
+# Not shared through the cache, and loaded from the database if used:
+EXCLUDED_FIELDS = {"password"}
+
+
+def _field_names(user_model: type["User"]) -> list[str]:
+    """The names of the fields cached.
+
+    Args:
+        user_model (type[User]): The user model.
+
+    Returns:
+        list[str]: The field attribute names, in model order.
+    """
+    return [
+        field.attname
+        for field in user_model._meta.concrete_fields
+        if field.attname not in EXCLUDED_FIELDS
+    ]
+
+
+class UserCache:
+    """Caches authenticated users' rows, checked against the session auth hash.
+
+    A cached row is only served to a session whose auth hash matches the one
+    the row was cached with, so a password change never serves a stale row.
+    The password hash isn't cached, so it can't be read from the cache, and is
+    deferred on cached users.
+    """
+
+    key_prefix = "user:auth"
+
+    def __init__(self, cache: str = "default", timeout: int = 300) -> None:
+        """Sets up the cache to use.
+
+        Args:
+            cache (str): Alias of the cache to store rows in.
+                Defaults to "default".
+            timeout (int): Seconds to keep a row for. Defaults to 300.
+        """
+        self._cache = caches[cache]
+        self._timeout = timeout
+
+    @classmethod
+    def from_settings(cls) -> "UserCache":
+        """A user cache configured by settings.USER_AUTH_CACHE.
+
+        Returns:
+            UserCache: The user cache.
+        """
+        return cls(
+            **{name.lower(): value for name, value in settings.USER_AUTH_CACHE.items()}
+        )
+
+    def _key(self, user_id: Any) -> str:
+        """Cache key for a user's row.
+
+        Args:
+            user_id (Any): The user's primary key.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{self.key_prefix}:{user_id}"
+
+    def get(self, user_id: Any, session_hash: str) -> Optional["User"]:
+        """A cached user, if cached for the session auth hash.
+
+        Args:
+            user_id (Any): The user's primary key.
+            session_hash (str): The session's auth hash.
+
+        Returns:
+            user.models.User, optional: The user, None if not cached.
+        """
+        record = self._cache.get(self._key(user_id))
+        if record is None:
+            return None
+        cached_hash, db, field_names, values = record
+        user_model = get_user_model()
+        if not constant_time_compare(
+            cached_hash, session_hash
+        ) or field_names != _field_names(user_model):
+            return None
+        return user_model.from_db(db, field_names, values)
+
+    def set(self, user: "User") -> None:
+        """Cache a user's row.
+
+        Args:
+            user (User): The authenticated user.
+        """
+        field_names = _field_names(type(user))
+        self._cache.set(
+            self._key(user.pk),
+            (
+                user.get_session_auth_hash(),
+                user._state.db,
+                field_names,
+                [getattr(user, name) for name in field_names],
+            ),
+            timeout=self._timeout,
+        )
+
+    def invalidate(self, user_ids: Iterable[Any]) -> None:
+        """Forget cached users, e.g. after they change.
+
+        Args:
+            user_ids (Iterable[Any]): The users' primary keys.
+        """
+        self._cache.delete_many([self._key(user_id) for user_id in user_ids])
+
+    async def ainvalidate(self, user_ids: Iterable[Any]) -> None:
+        """As invalidate(), without blocking the event loop.
+
+        Args:
+            user_ids (Iterable[Any]): The users' primary keys.
+        """
+        await sync_to_async(self.invalidate)(list(user_ids))
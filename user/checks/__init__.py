@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""User related system checks."""
+
+from ._last_login_buffer import check_last_login_buffer_cache  # noqa: F401.
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Optional
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.checks import CheckMessage, Error, Tags, Warning, register
+
+# Caches private to a process, or not kept, which lose buffered logins:
+UNSHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+# Caches whose add and incr are atomic, so concurrent logins get their own
+# numbers and only one process flushes at a time:
+ATOMIC_CACHE_BACKENDS = (
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.redis.RedisCache",
+    "django_redis.cache.RedisCache",
+)
+
+
+@register(Tags.caches)
+def check_last_login_buffer_cache(
+    app_configs: Optional[list[AppConfig]] = None,
+    **kwargs: Any,
+) -> list[CheckMessage]:
+    """Check an enabled last_login buffer has a shared, kept, atomic cache.
+
+    Args:
+        app_configs (list[AppConfig], optional): The apps to check, unused as
+            the buffer is configured by settings. Defaults to None.
+        kwargs: Other check arguments.
+
+    Returns:
+        list[CheckMessage]: An error if the buffer's cache can't hold logins,
+            or a warning if it may not count them atomically.
+    """
+    buffer = settings.USER_LAST_LOGIN_BUFFER
+    if not buffer["ENABLED"]:
+        return []
+    backend = settings.CACHES.get(buffer["CACHE"], {}).get("BACKEND")
+    if backend is None:
+        return [
+            Error(
+                f"USER_LAST_LOGIN_BUFFER's cache {buffer['CACHE']!r} isn't in"
+                " CACHES.",
+                id="user.E001",
+            )
+        ]
+    if backend in UNSHARED_CACHE_BACKENDS:
+        return [
+            Error(
+                f"USER_LAST_LOGIN_BUFFER's cache {buffer['CACHE']!r} uses"
+                f" {backend}, which other processes, such as"
+                " `manage.py flush_last_logins`, can't read and which drops"
+                " logins not yet written.",
+                hint="Use a shared cache, e.g. Redis, or disable the buffer.",
+                id="user.E002",
+            )
+        ]
+    if backend not in ATOMIC_CACHE_BACKENDS:
+        return [
+            Warning(
+                f"USER_LAST_LOGIN_BUFFER's cache {buffer['CACHE']!r} uses"
+                f" {backend}, whose add and incr may not be atomic. Concurrent"
+                " logins could then overwrite each other's before they're"
+                " written, and flushes overlap.",
+                hint="Use Redis or Memcached, or silence this if the backend's"
+                " add and incr are atomic.",
+                id="user.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""User related exports."""
+
+from ._user_export import (  # noqa: F401.
+    CONTENT_TYPES,
+    FORMATS,
+    exportable_fields,
+    stream_users,
+)
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""User related password hashing."""
+
+from ._hashing_service import (  # noqa: F401.
+    HashingService,
+    get_hashing_service,
+    scrypt_memory,
+)
+from ._tuned_scrypt_password_hasher import TunedScryptPasswordHasher  # noqa: F401.
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Optional, TypeVar
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BasePasswordHasher,
+    ScryptPasswordHasher,
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+    make_password,
+)
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from ..signals import password_hashed
+
+T = TypeVar("T")
+
+
+def scrypt_memory(work_factor: int, block_size: int, parallelism: int) -> int:
+    """Bytes of memory a single scrypt hash needs, as checked by OpenSSL.
+
+    Args:
+        work_factor (int): The scrypt N parameter.
+        block_size (int): The scrypt r parameter.
+        parallelism (int): The scrypt p parameter.
+
+    Returns:
+        int: The memory needed in bytes.
+    """
+    return 128 * block_size * (work_factor + parallelism + 2)
+
+
+def hash_memory(hasher: BasePasswordHasher) -> int:
+    """Bytes of memory a single hash by a hasher needs.
+
+    Args:
+        hasher (BasePasswordHasher): The password hasher.
+
+    Returns:
+        int: The memory needed in bytes, 0 if it isn't memory-hard.
+    """
+    if isinstance(hasher, ScryptPasswordHasher):
+        return scrypt_memory(hasher.work_factor, hasher.block_size, hasher.parallelism)
+    if isinstance(hasher, Argon2PasswordHasher):
+        return hasher.memory_cost * 1024
+    return 0
+
+
+def _verify(password: str, encoded: str) -> tuple[bool, bool]:
+    """Check a password, as django.contrib.auth.hashers.check_password.
+
+    The password upgrade is left to the caller so that the database is never
+    touched from a hashing thread.
+
+    Args:
+        password (str): The raw password.
+        encoded (str): The encoded password to check against.
+
+    Returns:
+        tuple[bool, bool]: Whether the password is correct, and whether the
+            encoded password should be upgraded to the preferred hasher.
+    """
+    preferred = get_hasher()
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        # encoded is gibberish or uses a hasher that's no longer installed.
+        return False, False
+    hasher_changed = hasher.algorithm != preferred.algorithm
+    must_update = hasher_changed or preferred.must_update(encoded)
+    is_correct = hasher.verify(password, encoded)
+    if not is_correct and not hasher_changed and must_update:
+        hasher.harden_runtime(password, encoded)
+    return is_correct, must_update
+
+
+class HashingService:
+    """Runs password hashing on a bounded pool of threads.
+
+    The hash functions release the GIL, so the pool lets request threads and
+    event loops wait without doing the work themselves, while capping how many
+    memory-hard hashes run at once.
+    """
+
+    def __init__(self, workers: int, memory_budget: int) -> None:
+        """Sets up the hashing threads.
+
+        Args:
+            workers (int): Maximum number of hashing threads.
+            memory_budget (int): Bytes that concurrent hashes may use
+                between them. Limits the threads further for memory-hard hashers.
+        """
+        per_hash = hash_memory(get_hasher())
+        if per_hash:
+            workers = min(workers, memory_budget // per_hash)
+        self.concurrency = max(1, workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="password-hashing",
+        )
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _submit(self, function: Callable[..., T], *args: Any) -> "Future[T]":
+        """Queue a function to run on a hashing thread.
+
+        Args:
+            function (Callable[..., T]): The function to run.
+            args: The function's arguments.
+
+        Returns:
+            Future[T]: The function's pending result.
+        """
+        with self._lock:
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+        return self._executor.submit(self._run, perf_counter(), function, *args)
+
+    def _run(self, queued: float, function: Callable[..., T], *args: Any) -> T:
+        """Run a queued function, recording how long it waited and ran for.
+
+        Args:
+            queued (float): The perf_counter() time it was queued.
+            function (Callable[..., T]): The function to run.
+            args: The function's arguments.
+
+        Returns:
+            T: The function's result.
+        """
+        started = perf_counter()
+        with self._lock:
+            self._queue_depth -= 1
+            self._wait_seconds += started - queued
+            self._max_wait_seconds = max(self._max_wait_seconds, started - queued)
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self._completed += 1
+                self._run_seconds += perf_counter() - started
+
+    def _hashed(self, operation: str, started: float) -> None:
+        """Send password_hashed for a finished operation.
+
+        Args:
+            operation (str): "make_password" or "verify".
+            started (float): The perf_counter() time it was submitted.
+        """
+        password_hashed.send(
+            sender=type(self),
+            operation=operation,
+            seconds=perf_counter() - started,
+        )
+
+    def make_password(self, password: Optional[str]) -> str:
+        """Encode a password with the default hasher and a new salt.
+
+        Args:
+            password (str, optional): The raw password, None for an unusable one.
+
+        Returns:
+            str: The encoded password.
+        """
+        if password is None:
+            return make_password(None)
+        started = perf_counter()
+        encoded = self._submit(make_password, password).result()
+        self._hashed("make_password", started)
+        return encoded
+
+    async def amake_password(self, password: Optional[str]) -> str:
+        """Encode a password without blocking the event loop.
+
+        Args:
+            password (str, optional): The raw password, None for an unusable one.
+
+        Returns:
+            str: The encoded password.
+        """
+        if password is None:
+            return make_password(None)
+        started = perf_counter()
+        encoded = await asyncio.wrap_future(self._submit(make_password, password))
+        self._hashed("make_password", started)
+        return encoded
+
+    def verify(self, password: Optional[str], encoded: str) -> tuple[bool, bool]:
+        """Check a password against an encoded password.
+
+        Args:
+            password (str, optional): The raw password.
+            encoded (str): The encoded password to check against.
+
+        Returns:
+            tuple[bool, bool]: Whether the password is correct, and whether the
+                encoded password should be upgraded to the preferred hasher.
+        """
+        if password is None or not is_password_usable(encoded):
+            return False, False
+        started = perf_counter()
+        result = self._submit(_verify, password, encoded).result()
+        self._hashed("verify", started)
+        return result
+
+    async def averify(
+        self,
+        password: Optional[str],
+        encoded: str,
+    ) -> tuple[bool, bool]:
+        """Check a password without blocking the event loop.
+
+        Args:
+            password (str, optional): The raw password.
+            encoded (str): The encoded password to check against.
+
+        Returns:
+            tuple[bool, bool]: Whether the password is correct, and whether the
+                encoded password should be upgraded to the preferred hasher.
+        """
+        if password is None or not is_password_usable(encoded):
+            return False, False
+        started = perf_counter()
+        result = await asyncio.wrap_future(self._submit(_verify, password, encoded))
+        self._hashed("verify", started)
+        return result
+
+    def metrics(self) -> dict[str, float]:
+        """Queue and timing metrics since the service started.
+
+        Returns:
+            dict[str, float]: The metrics by name.
+        """
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_max": self._max_wait_seconds,
+                "run_seconds_total": self._run_seconds,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the hashing threads once queued work finishes."""
+        self._executor.shutdown(wait=False)
+
+
+_service: Optional[HashingService] = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service() -> HashingService:
+    """The process-wide hashing service, configured by settings.USER_HASHING.
+
+    Returns:
+        HashingService: The hashing service.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = HashingService(
+                    workers=settings.USER_HASHING["WORKERS"],
+                    memory_budget=settings.USER_HASHING["MEMORY_BUDGET"],
+                )
+    return _service
+
+
+@receiver(setting_changed)
+def _reset_hashing_service(*, setting: str, **kwargs: Any) -> None:
+    """Replace the hashing service when its settings change, e.g. in tests.
+
+    Args:
+        setting (str): The name of the changed setting.
+        kwargs: Other signal arguments.
+    """
+    global _service
+    if setting in ("USER_HASHING", "PASSWORD_HASHERS") and _service is not None:
+        with _service_lock:
+            _service.shutdown()
+            _service = None
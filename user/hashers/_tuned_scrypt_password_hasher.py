@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import base64
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import ScryptPasswordHasher
+
+from ._hashing_service import scrypt_memory
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt hasher with parameters from settings.USER_SCRYPT.
+
+    The algorithm name is unchanged, so existing scrypt hashes still verify
+    and are rehashed on the next successful login when their parameters
+    differ from the configured ones.
+    """
+
+    @property
+    def work_factor(self) -> int:
+        """The scrypt N parameter.
+
+        Returns:
+            int: The configured work factor.
+        """
+        return settings.USER_SCRYPT["WORK_FACTOR"]
+
+    @property
+    def block_size(self) -> int:
+        """The scrypt r parameter.
+
+        Returns:
+            int: The configured block size.
+        """
+        return settings.USER_SCRYPT["BLOCK_SIZE"]
+
+    @property
+    def parallelism(self) -> int:
+        """The scrypt p parameter.
+
+        Returns:
+            int: The configured parallelism.
+        """
+        return settings.USER_SCRYPT["PARALLELISM"]
+
+    def encode(
+        self,
+        password: str,
+        salt: str,
+        n: Optional[int] = None,
+        r: Optional[int] = None,
+        p: Optional[int] = None,
+    ) -> str:
+        """Encode a password, as parent.
+
+        Unlike the parent, the memory limit is raised to what the parameters
+        need, so work factors beyond OpenSSL's default 32MiB limit work.
+
+        Args:
+            password (str): The raw password.
+            salt (str): The salt.
+            n (int, optional): The work factor. Defaults to the configured one.
+            r (int, optional): The block size. Defaults to the configured one.
+            p (int, optional): The parallelism. Defaults to the configured one.
+
+        Returns:
+            str: The encoded password.
+        """
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=scrypt_memory(n, r, p),
+            dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode("ascii").strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash_)
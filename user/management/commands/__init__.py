@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""User related management commands."""
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""Benchmark scrypt parameters on this host and recommend a set."""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import resource
+import secrets
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from time import perf_counter
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...hashers import scrypt_memory
+
+
+def _peak_rss() -> int:
+    """Peak resident memory of this process.
+
+    Returns:
+        int: The peak in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _benchmark(
+    work_factor: int,
+    block_size: int,
+    parallelism: int,
+    iterations: int,
+) -> dict[str, Any]:
+    """Time hashes with a parameter set, in a fresh process.
+
+    Args:
+        work_factor (int): The scrypt N parameter.
+        block_size (int): The scrypt r parameter.
+        parallelism (int): The scrypt p parameter.
+        iterations (int): Number of hashes to time.
+
+    Returns:
+        dict[str, Any]: The parameters, latencies and memory used.
+    """
+    maxmem = scrypt_memory(work_factor, block_size, parallelism)
+    baseline_rss = _peak_rss()
+    latencies = []
+    for _iteration in range(iterations + 1):  # The first is a warm up.
+        password = secrets.token_urlsafe(12).encode()
+        salt = secrets.token_urlsafe(16).encode()
+        started = perf_counter()
+        hashlib.scrypt(
+            password,
+            salt=salt,
+            n=work_factor,
+            r=block_size,
+            p=parallelism,
+            maxmem=maxmem,
+            dklen=64,
+        )
+        latencies.append((perf_counter() - started) * 1000)
+    latencies = latencies[1:]
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        percentiles = latencies * 99
+    return {
+        "work_factor": work_factor,
+        "block_size": block_size,
+        "parallelism": parallelism,
+        "memory_bytes": maxmem,
+        "peak_rss_bytes": max(0, _peak_rss() - baseline_rss),
+        "p50_ms": percentiles[49],
+        "p95_ms": percentiles[94],
+        "p99_ms": percentiles[98],
+        "logins_per_second_per_core": 1000 / statistics.fmean(latencies),
+    }
+
+
+class Command(BaseCommand):
+    """Benchmark scrypt parameters on this host and recommend a set."""
+
+    help = (
+        "Time scrypt hashes for each combination of parameters, each in a fresh"
+        " process, and recommend the costliest set within the target latency."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "--log2-work-factor",
+            type=int,
+            nargs="+",
+            default=[14, 15, 16, 17],
+            help="Work factors (N) to try, as powers of 2. Defaults to 14 to 17.",
+        )
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            nargs="+",
+            default=[8],
+            help="Block sizes (r) to try. Defaults to 8.",
+        )
+        parser.add_argument(
+            "--parallelism",
+            type=int,
+            nargs="+",
+            default=[1],
+            help="Parallelism values (p) to try. Defaults to 1.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Hashes to time per parameter set. Defaults to 20.",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100.0,
+            help="Highest acceptable p95 hash latency. Defaults to 100ms.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the results and recommendation as JSON.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the benchmark.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If no hashes are to be timed.
+        """
+        if options["iterations"] < 1:
+            raise CommandError("Time at least one hash per parameter set.")
+        parameter_sets = list(
+            product(
+                [2**log2 for log2 in options["log2_work_factor"]],
+                options["block_size"],
+                options["parallelism"],
+            )
+        )
+        results = []
+        for work_factor, block_size, parallelism in parameter_sets:
+            # A process per set, so peak memory isn't carried over between sets.
+            with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                results.append(
+                    executor.submit(
+                        _benchmark,
+                        work_factor,
+                        block_size,
+                        parallelism,
+                        options["iterations"],
+                    ).result()
+                )
+        within_target = [
+            result for result in results if result["p95_ms"] <= options["target_ms"]
+        ]
+        recommended = max(
+            within_target,
+            key=lambda result: (result["memory_bytes"], result["work_factor"]),
+            default=None,
+        )
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "cpu_count": os.cpu_count(),
+                        "target_ms": options["target_ms"],
+                        "current": settings.USER_SCRYPT,
+                        "results": results,
+                        "recommended": recommended,
+                    },
+                    indent=2,
+                )
+            )
+            return
+        self.stdout.write(
+            f"{'N':>8} {'r':>3} {'p':>3} {'memory':>9} {'peak rss':>9}"
+            f" {'p50':>9} {'p95':>9} {'p99':>9} {'logins/s/core':>14}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['work_factor']:>8} {result['block_size']:>3}"
+                f" {result['parallelism']:>3}"
+                f" {result['memory_bytes'] / 1024**2:>7.1f}MB"
+                f" {result['peak_rss_bytes'] / 1024**2:>7.1f}MB"
+                f" {result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms"
+                f" {result['p99_ms']:>7.1f}ms"
+                f" {result['logins_per_second_per_core']:>14.1f}"
+            )
+        if recommended is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No parameter set is within {options['target_ms']}ms at p95."
+                )
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recommended within {options['target_ms']}ms at p95:\n"
+                f"  USER_SCRYPT_WORK_FACTOR={recommended['work_factor']}\n"
+                f"  USER_SCRYPT_BLOCK_SIZE={recommended['block_size']}\n"
+                f"  USER_SCRYPT_PARALLELISM={recommended['parallelism']}"
+            )
+        )
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the user subsystem and compare the results with a baseline."""
+
+import json
+import os
+import platform
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from ...benchmarks import find_regressions, get_benchmarks
+
+
+class Command(BaseCommand):
+    """Benchmark the user subsystem and compare the results with a baseline."""
+
+    help = (
+        "Time user creation, password validation, login and the user admin"
+        " changelist on a test database, write the results as JSON and fail"
+        " if any median is slower than the baseline's by the threshold."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "-k",
+            "--filter",
+            default="",
+            help="Only run benchmarks with names containing this.",
+        )
+        parser.add_argument(
+            "--scales",
+            type=int,
+            nargs="+",
+            default=settings.USER_BENCHMARKS["SCALES"],
+            help="Numbers of users to run scaled benchmarks with.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="File to write the results to. Defaults to stdout.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=settings.USER_BENCHMARKS["BASELINE"],
+            help="Results to compare with, if the file exists.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=settings.USER_BENCHMARKS["THRESHOLD"],
+            help="Allowed slow down of a median, e.g. 0.25 for 25%%.",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Replace the baseline with these results.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the benchmarks.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If a benchmark regressed beyond the threshold.
+        """
+        benchmarks = [
+            benchmark
+            for benchmark in get_benchmarks()
+            if options["filter"] in benchmark.name
+        ]
+        results = []
+        # Not setup_test_environment(), which instruments template rendering.
+        test_settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            DEBUG=False,
+        )
+        test_settings.enable()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            for benchmark in benchmarks:
+                for scale in sorted(options["scales"]) if benchmark.scaled else [None]:
+                    result = benchmark.run(scale)
+                    results.append(result._asdict())
+                    if options["output"] is not None or options["verbosity"] > 1:
+                        self.stderr.write(
+                            f"{result.key}: {result.p50_ms:.3f}ms p50,"
+                            f" {result.per_second:.1f}/s"
+                            + (
+                                ""
+                                if result.peak_kib is None
+                                else f", {result.peak_kib / 1024:.1f} MiB peak"
+                            )
+                        )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            test_settings.disable()
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "database": connection.vendor,
+                "password_hashers": settings.PASSWORD_HASHERS,
+            },
+            "results": results,
+        }
+        if options["output"] is None:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            options["output"].write_text(json.dumps(report, indent=2))
+        if options["save_baseline"]:
+            options["baseline"].write_text(json.dumps(report, indent=2))
+            return
+        if not options["baseline"].is_file():
+            return
+        baseline = json.loads(options["baseline"].read_text())
+        regressions = find_regressions(
+            results, baseline["results"], options["threshold"]
+        )
+        for regression in regressions:
+            self.stderr.write(
+                f"{regression['key']}: {regression['p50_ms']:.3f}ms p50, baseline"
+                f" {regression['baseline_p50_ms']:.3f}ms ({regression['change']:+.0%})"
+            )
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmarks regressed by over"
+                f" {options['threshold']:.0%} from {options['baseline']}."
+            )
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""Build the breached password index from breach dumps."""
+
+import gzip
+import heapq
+import re
+import sys
+from array import array
+from collections.abc import Iterator
+from contextlib import ExitStack
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, BinaryIO, TextIO
+
+from django.conf import settings
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...validators import DEFAULT_BUCKET_BITS, hash_prefix, password_prefix, write_index
+
+SHA1_LINE = re.compile(r"^([0-9A-Fa-f]{40})(?::(\d+))?\s*$")
+READ_SIZE = 8192  # Entries read from each run at a time while merging.
+
+
+class Command(BaseCommand):
+    """Build the breached password index from breach dumps."""
+
+    help = (
+        "Build the index BreachedPasswordValidator checks passwords against"
+        " from files of SHA-1 hashes, e.g. Have I Been Pwned's SHA1:COUNT"
+        " lines, or of plain passwords, one per line. Sorts any number of"
+        " entries in runs on disk, in bounded memory."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Files to read, gzipped if ending .gz, or - for stdin.",
+        )
+        parser.add_argument(
+            "--plain",
+            action="store_true",
+            help="The files list passwords rather than SHA-1 hashes.",
+        )
+        parser.add_argument(
+            "--include-common",
+            action="store_true",
+            help="Also index Django's list of 20,000 common passwords.",
+        )
+        parser.add_argument(
+            "--min-count",
+            type=int,
+            default=1,
+            help="Skip hashes seen fewer times in breaches. Defaults to 1.",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=settings.USER_BREACHED_PASSWORDS["INDEX"],
+            help="Index file to write. Defaults to USER_BREACHED_PASSWORDS INDEX.",
+        )
+        parser.add_argument(
+            "--run-size",
+            type=int,
+            default=2_000_000,
+            help="Entries to sort in memory at a time, about 50 bytes each."
+            " Defaults to 2,000,000.",
+        )
+        parser.add_argument(
+            "--bucket-bits",
+            type=int,
+            default=DEFAULT_BUCKET_BITS,
+            help=f"Leading bits indexing buckets. Defaults to {DEFAULT_BUCKET_BITS}.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Build the index.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If there's nothing to index or a file can't be read.
+        """
+        if not options["paths"] and not options["include_common"]:
+            raise CommandError("Give files to index, or --include-common.")
+        self.verbosity = options["verbosity"]
+        started = perf_counter()
+        output = Path(options["output"])
+        with TemporaryDirectory(dir=output.parent) as directory:
+            runs = self._write_runs(Path(directory), options)
+            with ExitStack() as stack:
+                files = [stack.enter_context(open(run, "rb")) for run in runs]
+                merged = heapq.merge(*map(self._read_run, files))
+                partial = output.with_name(output.name + ".partial")
+                count = write_index(merged, partial, options["bucket_bits"])
+        # Replaced whole, so processes with the old index mapped keep reading it.
+        partial.replace(output)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {count} breached passwords to {output}"
+                f" ({output.stat().st_size / 2**20:.1f} MiB) in"
+                f" {perf_counter() - started:.1f}s."
+            )
+        )
+
+    def _prefixes(self, options: dict[str, Any]) -> Iterator[int]:
+        """Read the prefixes to index.
+
+        Args:
+            options (dict[str, Any]): The parsed command options.
+
+        Yields:
+            int: The next prefix, in file order.
+
+        Raises:
+            CommandError: If a file can't be read or a line isn't a hash.
+        """
+        if options["include_common"]:
+            yield from map(password_prefix, CommonPasswordValidator().passwords)
+        for path in options["paths"]:
+            try:
+                with self._open(path) as file:
+                    for line_number, line in enumerate(file, start=1):
+                        if options["plain"]:
+                            yield password_prefix(line.rstrip("\r\n"))
+                            continue
+                        match = SHA1_LINE.match(line)
+                        if match is None:
+                            if line.strip():
+                                raise CommandError(
+                                    f"{path}:{line_number}: Expected a SHA-1 hash."
+                                )
+                            continue
+                        seen = match[2]
+                        if seen is None or int(seen) >= options["min_count"]:
+                            yield hash_prefix(match[1])
+            except OSError as error:
+                raise CommandError(error) from error
+
+    def _open(self, path: str) -> TextIO:
+        """Open a file to read.
+
+        Args:
+            path (str): The file, gzipped if ending .gz, or - for stdin.
+
+        Returns:
+            TextIO: The open file.
+        """
+        if path == "-":
+            return open(sys.stdin.fileno(), encoding="utf-8", closefd=False)
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+        return open(path, encoding="utf-8", errors="replace")
+
+    def _write_runs(self, directory: Path, options: dict[str, Any]) -> list[Path]:
+        """Sort the prefixes in runs, each written to a file.
+
+        Args:
+            directory (Path): The directory for the runs.
+            options (dict[str, Any]): The parsed command options.
+
+        Returns:
+            list[Path]: The run files, each sorted.
+        """
+        runs = []
+        run = array("Q")
+        for prefix in self._prefixes(options):
+            run.append(prefix)
+            if len(run) >= options["run_size"]:
+                runs.append(self._write_run(directory, run, len(runs)))
+                run = array("Q")
+        if run or not runs:
+            runs.append(self._write_run(directory, run, len(runs)))
+        return runs
+
+    def _write_run(self, directory: Path, run: array, number: int) -> Path:
+        """Sort a run and write it to a file.
+
+        Args:
+            directory (Path): The directory for the run.
+            run (array): The run's prefixes.
+            number (int): The run's number.
+
+        Returns:
+            Path: The run file.
+        """
+        path = directory / f"{number}.run"
+        with open(path, "wb") as file:
+            array("Q", sorted(run)).tofile(file)
+        if self.verbosity > 1:
+            self.stdout.write(f"Sorted run {number + 1} of {len(run)} entries.")
+        return path
+
+    def _read_run(self, file: BinaryIO) -> Iterator[int]:
+        """Read a run's prefixes.
+
+        Args:
+            file (BinaryIO): The run file.
+
+        Yields:
+            int: The next prefix.
+        """
+        while True:
+            chunk = array("Q")
+            chunk.frombytes(file.read(READ_SIZE * chunk.itemsize))
+            if not chunk:
+                return
+            yield from chunk
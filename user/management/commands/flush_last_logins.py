@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Write the buffered last logins."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...caches import LastLoginBuffer
+
+
+class Command(BaseCommand):
+    """Write the buffered last logins."""
+
+    help = (
+        "Write every last_login buffered by USER_LAST_LOGIN_BUFFER to the"
+        " database, e.g. before deploying or clearing the cache."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Flush the buffer.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If another process is flushing the buffer.
+        """
+        count = LastLoginBuffer.from_settings().flush()
+        if count is None:
+            raise CommandError("Another process is writing the last logins.")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} last logins."))
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""Import users from a CSV or JSON lines file."""
+
+import csv
+import json
+import sys
+from collections.abc import Iterator
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, TextIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import models
+
+from ...managers import BulkCreateResult
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+TRUE_VALUES = {"1", "t", "true", "y", "yes"}
+FALSE_VALUES = {"0", "f", "false", "n", "no"}
+
+
+class Command(BaseCommand):
+    """Import users from a CSV or JSON lines file."""
+
+    help = (
+        "Import users from a CSV file with a header row, or a JSON lines file"
+        " with one object per line. Users whose email already exists are"
+        " skipped."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(FORMATS.values())),
+            help="Input format. Defaults to guessing from the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users to hash and insert at a time. Defaults to 1000.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes. Defaults to the number of CPUs.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Import the users.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+
+        Raises:
+            CommandError: If the file can't be read or a row is invalid.
+        """
+        path = options["path"]
+        input_format = options["format"] or FORMATS.get(Path(path).suffix.lower())
+        if input_format is None:
+            raise CommandError("Can't guess the format, use --format.")
+        if path == "-":
+            source = nullcontext(sys.stdin)
+        else:
+            try:
+                source = open(path, newline="", encoding="utf-8-sig")
+            except OSError as error:
+                raise CommandError(error) from error
+        with source as file:
+            rows = (
+                self._read_csv(file)
+                if input_format == "csv"
+                else self._read_jsonl(file)
+            )
+            try:
+                result = get_user_model().objects.bulk_create_users(
+                    self._coerce_rows(rows),
+                    batch_size=options["batch_size"],
+                    workers=options["workers"],
+                    progress=self._report_progress,
+                )
+            except ValueError as error:
+                raise CommandError(error) from error
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users and skipped {result.skipped}"
+                f" duplicates in {result.elapsed:.1f}s ({result.rate:.0f} users/s)."
+            )
+        )
+
+    def _report_progress(self, result: BulkCreateResult) -> None:
+        """Write the running totals.
+
+        Args:
+            result (BulkCreateResult): The running totals.
+        """
+        self.stdout.write(
+            f"Created {result.created} users, skipped {result.skipped}"
+            f" ({result.rate:.0f} users/s)."
+        )
+
+    def _read_csv(self, file: TextIO) -> Iterator[dict[str, Any]]:
+        """Read rows from a CSV file with a header row.
+
+        Args:
+            file (TextIO): The open file.
+
+        Returns:
+            Iterator[dict[str, Any]]: The rows.
+        """
+        return csv.DictReader(file)
+
+    def _read_jsonl(self, file: TextIO) -> Iterator[dict[str, Any]]:
+        """Read rows from a JSON lines file.
+
+        Args:
+            file (TextIO): The open file.
+
+        Yields:
+            dict[str, Any]: The next row.
+
+        Raises:
+            CommandError: If a line isn't a JSON object.
+        """
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise CommandError(f"Line {line_number}: {error}") from error
+            if not isinstance(row, dict):
+                raise CommandError(f"Line {line_number}: Expected a JSON object.")
+            yield row
+
+    def _coerce_rows(
+        self,
+        rows: Iterator[dict[str, Any]],
+    ) -> Iterator[dict[str, Any]]:
+        """Convert row values to the user model's field types.
+
+        Empty values are dropped so the field defaults apply, which for the
+        password means an unusable password.
+
+        Args:
+            rows (Iterator[dict[str, Any]]): The raw rows.
+
+        Yields:
+            dict[str, Any]: The next row of create_user keyword arguments.
+
+        Raises:
+            CommandError: If a row has an unknown column or an invalid value.
+        """
+        user_model = get_user_model()
+        fields = {
+            field.name: field
+            for field in user_model._meta.concrete_fields
+            if field.editable and not field.primary_key
+        }
+        for row_number, row in enumerate(rows, start=1):
+            extra_fields = {}
+            for name, value in row.items():
+                if name not in fields:
+                    raise CommandError(f"Row {row_number}: Unknown column {name!r}.")
+                if value is None or value == "":
+                    continue
+                try:
+                    extra_fields[name] = self._to_python(fields[name], value)
+                except ValidationError as error:
+                    raise CommandError(
+                        f"Row {row_number}: Invalid {name!r}: {error.messages[0]}"
+                    ) from error
+            yield extra_fields
+
+    def _to_python(self, field: models.Field, value: Any) -> Any:
+        """Convert a value to a field's type, accepting common boolean spellings.
+
+        Args:
+            field (models.Field): The model field.
+            value (Any): The raw value.
+
+        Raises:
+            ValidationError: If the value isn't valid for the field.
+
+        Returns:
+            Any: The converted value.
+        """
+        if isinstance(field, models.BooleanField) and isinstance(value, str):
+            if value.strip().lower() in TRUE_VALUES:
+                return True
+            if value.strip().lower() in FALSE_VALUES:
+                return False
+            raise ValidationError(f"{value!r} is not a boolean.")
+        return field.to_python(value)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Merge users whose emails differ only by case."""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+
+if TYPE_CHECKING:
+    from ...models import User
+
+
+class Command(BaseCommand):
+    """Merge users whose emails differ only by case."""
+
+    help = (
+        "Merge users whose emails differ only by case, as needed before the"
+        " case-insensitive unique email constraint can be applied. The user"
+        " who logged in most recently is kept, rows referencing the others are"
+        " moved to it, and then they are deleted. Emails whose users differ in"
+        " staff or superuser status, groups or permissions, or where the"
+        " others have one-to-one rows, which can't be moved, are skipped and"
+        " reported. Duplicates are merged in batches in email order, and the"
+        " last merged email can be saved to resume from."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Duplicate emails to merge per transaction. Defaults to 100.",
+        )
+        parser.add_argument(
+            "--state-file",
+            type=Path,
+            help="File to resume from and save the last merged email to.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the merges without making them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Merge the duplicates.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+        """
+        self.verbosity = options["verbosity"]
+        state_file = options["state_file"]
+        after = ""
+        if state_file is not None and state_file.exists():
+            after = state_file.read_text()
+            self.stdout.write(f"Resuming after {after!r}.")
+        duplicates = (
+            get_user_model()
+            .objects.values(email_lower=Lower("email"))
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .order_by("email_lower")
+            .values_list("email_lower", flat=True)
+        )
+        merged = removed = 0
+        skipped = []
+        while batch := list(
+            duplicates.filter(email_lower__gt=after)[: options["batch_size"]]
+        ):
+            with transaction.atomic():
+                for email_lower in batch:
+                    merged_away = self._merge(email_lower, options["dry_run"])
+                    if merged_away is None:
+                        skipped.append(email_lower)
+                        continue
+                    merged += 1
+                    removed += merged_away
+            after = batch[-1]
+            if state_file is not None and not options["dry_run"]:
+                state_file.write_text(after)
+            self.stdout.write(f"Merged {merged} emails, removing {removed} users.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Would merge' if options['dry_run'] else 'Merged'} {merged}"
+                f" duplicate emails, removing {removed} users."
+            )
+        )
+        if skipped:
+            self.stderr.write(
+                f"Skipped {len(skipped)} emails to merge by hand:"
+                f" {', '.join(skipped)}."
+            )
+
+    def _merge(self, email_lower: str, dry_run: bool) -> Optional[int]:
+        """Merge the users with an email into the most recently active one.
+
+        Args:
+            email_lower (str): The lowercase email.
+            dry_run (bool): Whether to only report the merge.
+
+        Returns:
+            int | None: The number of users merged away, None if skipped as
+                the users' privileges differ or the others have rows in
+                one-to-one relations.
+        """
+        user_model = get_user_model()
+        keep, *others = (
+            user_model.objects.filter_by_email(email_lower)
+            .select_for_update()
+            .order_by(F("last_login").desc(nulls_last=True), "date_joined", "pk")
+        )
+        other_ids = [other.pk for other in others]
+        # Not merged, as whoever logged in last, perhaps someone who registered
+        # the admin's email in another case, would get the others' privileges.
+        privileges = self._privileges([keep, *others])
+        if len(set(privileges.values())) > 1:
+            self.stderr.write(
+                f"{email_lower}: skipping, as {', '.join(map(str, privileges))}"
+                " differ in staff or superuser status, groups or permissions."
+            )
+            return None
+        # Deleting the others would cascade to these, and keep may have its own.
+        one_to_one = [
+            relation.related_model._meta.label
+            for relation in user_model._meta.related_objects
+            if relation.one_to_one
+            and relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": other_ids}
+            ).exists()
+        ]
+        if one_to_one:
+            self.stderr.write(
+                f"{email_lower}: skipping, as {', '.join(map(str, other_ids))}"
+                f" have {', '.join(one_to_one)} rows."
+            )
+            return None
+        if self.verbosity >= 2:
+            self.stdout.write(
+                f"{email_lower}: keeping {keep.pk}, merging"
+                f" {', '.join(map(str, other_ids))}."
+            )
+        if dry_run:
+            return len(others)
+        for relation in user_model._meta.related_objects:
+            if relation.one_to_many:
+                relation.related_model._base_manager.filter(
+                    **{f"{relation.field.name}__in": other_ids}
+                ).update(**{relation.field.name: keep})
+        user_model.objects.filter(pk__in=other_ids).delete()
+        return len(others)
+
+    def _privileges(self, users: list["User"]) -> dict[Any, tuple]:
+        """What users may do, to compare.
+
+        Args:
+            users (list[User]): The users.
+
+        Returns:
+            dict[Any, tuple]: Staff and superuser status, groups and
+                permissions, by user primary key.
+        """
+        user_model = get_user_model()
+        groups = defaultdict(set)
+        for user_id, group_id in user_model.groups.through.objects.filter(
+            user_id__in=[user.pk for user in users]
+        ).values_list("user_id", "group_id"):
+            groups[user_id].add(group_id)
+        permissions = defaultdict(set)
+        for (
+            user_id,
+            permission_id,
+        ) in user_model.user_permissions.through.objects.filter(
+            user_id__in=[user.pk for user in users]
+        ).values_list(
+            "user_id", "permission_id"
+        ):
+            permissions[user_id].add(permission_id)
+        return {
+            user.pk: (
+                user.is_staff,
+                user.is_superuser,
+                frozenset(groups[user.pk]),
+                frozenset(permissions[user.pk]),
+            )
+            for user in users
+        }
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Fill the shared permission cache for staff users."""
+
+from collections import defaultdict
+from itertools import islice
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...caches import PermissionCache
+
+
+class Command(BaseCommand):
+    """Fill the shared permission cache for staff users."""
+
+    help = (
+        "Compute the permissions of active staff users, or of all active users,"
+        " in bulk and store them in the shared permission cache."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser (CommandParser): The command argument parser.
+        """
+        parser.add_argument(
+            "--all-users",
+            action="store_true",
+            help="Warm every active user, not only staff.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Users to compute and cache at a time. Defaults to 2000.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Fill the cache.
+
+        Args:
+            args: Positional arguments.
+            options: The parsed command options.
+        """
+        user_model = get_user_model()
+        group_model = user_model.groups.field.related_model
+        permission_cache = PermissionCache.from_settings()
+        # Before reading, so sets read before a group's change aren't served.
+        generation = permission_cache.generation()
+        names = {
+            pk: f"{app_label}.{codename}"
+            for pk, app_label, codename in Permission.objects.values_list(
+                "pk", "content_type__app_label", "codename"
+            )
+        }
+        group_names = defaultdict(set)
+        for (
+            group_id,
+            permission_id,
+        ) in group_model.permissions.through.objects.values_list(
+            "group_id", "permission_id"
+        ):
+            group_names[group_id].add(names[permission_id])
+
+        users = user_model.objects.filter(is_active=True)
+        if not options["all_users"]:
+            users = users.filter(is_staff=True)
+        rows = users.values_list("pk", "is_superuser").iterator(
+            chunk_size=options["chunk_size"]
+        )
+        warmed = 0
+        while chunk := list(islice(rows, options["chunk_size"])):
+            keys = permission_cache.keys(
+                (user_id for user_id, is_superuser in chunk), generation
+            )
+            permission_cache.set_many(
+                self._permissions(chunk, names, group_names), keys
+            )
+            warmed += len(chunk)
+        self.stdout.write(
+            self.style.SUCCESS(f"Cached the permissions of {warmed} users.")
+        )
+
+    def _permissions(
+        self,
+        chunk: list[tuple[Any, bool]],
+        names: dict[int, str],
+        group_names: dict[int, set[str]],
+    ) -> dict[Any, set[str]]:
+        """Compute the permissions of a chunk of users with two queries.
+
+        Args:
+            chunk (list[tuple[Any, bool]]): Primary key and
+                is_superuser of each user.
+            names (dict[int, str]): Permission names by primary key.
+            group_names (dict[int, set[str]]): Permission names by group.
+
+        Returns:
+            dict[Any, set[str]]: Permission names by user primary key.
+        """
+        user_model = get_user_model()
+        permissions = {
+            user_id: set(names.values()) if is_superuser else set()
+            for user_id, is_superuser in chunk
+        }
+        regular_ids = [user_id for user_id, is_superuser in chunk if not is_superuser]
+        for user_id, group_id in user_model.groups.through.objects.filter(
+            user_id__in=regular_ids
+        ).values_list("user_id", "group_id"):
+            permissions[user_id] |= group_names[group_id]
+        for (
+            user_id,
+            permission_id,
+        ) in user_model.user_permissions.through.objects.filter(
+            user_id__in=regular_ids
+        ).values_list(
+            "user_id", "permission_id"
+        ):
+            permissions[user_id].add(names[permission_id])
+        return permissions
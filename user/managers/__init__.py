@@ -1,4 +1,9 @@
 # -*- coding: utf-8 -*-
-"""User related manager."""
+"""User related manager and QuerySet."""
 
-from .user_manager import UserManager  # noqa: F401.
+from .user_manager import BulkCreateResult, UserManager  # noqa: F401.
+from .user_query_set import (  # noqa: F401.
+    DEFAULT_PROJECTION,
+    UserQuerySet,
+    projection_type,
+)
@@ -1,15 +1,106 @@
 # -*- coding: utf-8 -*-
 """A UserManager that doesn't require username."""
 
-from typing import Any
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from time import perf_counter
+from typing import Any, Optional
 
+from django.contrib.auth.hashers import BasePasswordHasher, get_hasher, make_password
 from django.contrib.auth.models import BaseUserManager
+from django.db import connections, router
+from django.db.models import QuerySet, Value
+from django.db.models.functions import Lower
+from django.db.models.sql import Query
+
+from .user_query_set import UserQuerySet
 
 User = Any  # Can't import ..models.User or see how to get type from self.model.
 
+LOWER_BATCH_SIZE = 500  # Emails lowercased per query, within column limits.
+
+_worker_hasher: Optional[BasePasswordHasher] = None
+
+
+def _init_hashing_worker(hasher: BasePasswordHasher) -> None:
+    """Store the parent's hasher in a hashing worker process.
+
+    The hasher is passed in rather than looked up so workers don't depend on
+    Django settings being configured in the child process.
+
+    Args:
+        hasher (BasePasswordHasher): The hasher to encode passwords with.
+    """
+    global _worker_hasher
+    _worker_hasher = hasher
+
+
+def _hash_password(password: Optional[str]) -> str:
+    """Hash a password in a hashing worker process.
+
+    Args:
+        password (str, optional): The raw password, None for an unusable one.
+
+    Returns:
+        str: The encoded password.
+    """
+    if password is None:
+        return make_password(None)
+    return _worker_hasher.encode(password, _worker_hasher.salt())
+
+
+def _batched(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list]:
+    """Split rows into lists of at most size rows without reading ahead.
+
+    Args:
+        rows (Iterable[dict[str, Any]]): The rows to split.
+        size (int): The maximum number of rows per batch.
+
+    Yields:
+        list[dict[str, Any]]: The next batch of rows.
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+@dataclass
+class BulkCreateResult:
+    """Running totals for a bulk user creation."""
+
+    created: int = 0
+    skipped: int = 0
+    started: float = field(default_factory=perf_counter, repr=False)
 
-class UserManager(BaseUserManager):
-    """A UserManager that doesn't require username."""
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the bulk creation started.
+
+        Returns:
+            float: The elapsed seconds.
+        """
+        return perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Users created per second so far.
+
+        Returns:
+            float: The creation throughput.
+        """
+        elapsed = self.elapsed
+        return self.created / elapsed if elapsed else 0.0
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    """A UserManager that doesn't require username.
+
+    Its QuerySets can also stream users as read-only rows, see
+    UserQuerySet.projection().
+    """
 
     def _create_user(
         self,
@@ -40,6 +131,30 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def filter_by_email(self, email: str) -> QuerySet:
+        """Users with an email, ignoring case, using the lowercase email index.
+
+        Args:
+            email (str): The email address.
+
+        Returns:
+            QuerySet: The matching users.
+        """
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=Lower(Value(email))
+        )
+
+    def get_by_natural_key(self, username: str) -> User:
+        """Get a user by email, ignoring case.
+
+        Args:
+            username (str): The email address.
+
+        Returns:
+            User: The user.
+        """
+        return self.filter_by_email(username).get()
+
     def create_user(
         self,
         email: str,
@@ -92,3 +207,157 @@ class UserManager(BaseUserManager):
         if extra_fields.get("is_superuser") is not True:
             raise ValueError("Superuser must have is_superuser=True.")
         return self._create_user(email, password, **extra_fields)
+
+    def bulk_create_users(
+        self,
+        rows: Iterable[dict[str, Any]],
+        batch_size: int = 1000,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[BulkCreateResult], None]] = None,
+    ) -> BulkCreateResult:
+        """Create users from a stream of rows in batches.
+
+        Each row is a dict of create_user keyword arguments. Passwords are
+        hashed over a process pool while the previous batch is inserted with
+        bulk_create. Rows whose email already exists ignoring case, in the
+        database or earlier in the stream, are skipped. Like bulk_create, no
+        save signals are sent.
+
+        Args:
+            rows (Iterable[dict[str, Any]]): The users to create.
+            batch_size (int): Users to hash and insert at a time.
+                Defaults to 1000.
+            workers (int, optional): Hashing processes to use.
+                Defaults to the number of CPUs.
+            progress (Callable[[BulkCreateResult], None], optional): Called
+                with the running totals after each batch. Defaults to None.
+
+        Returns:
+            BulkCreateResult: The final totals.
+        """
+        workers = workers or os.cpu_count()
+        result = BulkCreateResult()
+        seen_emails: set[str] = set()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_hashing_worker,
+            initargs=(get_hasher(),),
+        ) as executor:
+            pending = None
+            for batch in _batched(rows, batch_size):
+                users, passwords = self._prepare_batch(batch, seen_emails, result)
+                hashes = executor.map(
+                    _hash_password,
+                    passwords,
+                    chunksize=max(1, len(passwords) // (workers * 4)),
+                )
+                if pending is not None:
+                    self._insert_batch(*pending, batch_size, result, progress)
+                pending = (users, hashes)
+            if pending is not None:
+                self._insert_batch(*pending, batch_size, result, progress)
+        return result
+
+    def _prepare_batch(
+        self,
+        batch: list[dict[str, Any]],
+        seen_emails: set[str],
+        result: BulkCreateResult,
+    ) -> tuple[list[User], list[Optional[str]]]:
+        """Build unsaved users for a batch, skipping duplicate emails.
+
+        Args:
+            batch (list[dict[str, Any]]): The rows in the batch.
+            seen_emails (set[str]): Lowercased emails from earlier batches,
+                updated.
+            result (BulkCreateResult): The running totals, updated.
+
+        Raises:
+            ValueError: If a row has no email.
+
+        Returns:
+            tuple[list[User], list[str | None]]: The users and their raw passwords.
+        """
+        using = self._db or router.db_for_write(self.model)
+        rows = []
+        for row in batch:
+            extra_fields = dict(row)
+            email = extra_fields.pop("email", None)
+            if not email:
+                raise ValueError("The given email must be set")
+            rows.append((self.normalize_email(email), extra_fields))
+        # Folded as the database folds them for the Lower("email") constraint,
+        # which for SQLite is ASCII only, unlike str.lower().
+        lowered = self._lower([email for email, _extra_fields in rows], using)
+        fields_by_email = {}
+        for email_lower, (email, extra_fields) in zip(lowered, rows):
+            if email_lower in seen_emails or email_lower in fields_by_email:
+                result.skipped += 1
+                continue
+            extra_fields.setdefault("is_staff", False)
+            extra_fields.setdefault("is_superuser", False)
+            fields_by_email[email_lower] = (email, extra_fields)
+        # Checked on the database written to, as a replica may not have them yet.
+        existing = set(
+            self.db_manager(using)
+            .annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=fields_by_email)
+            .values_list("email_lower", flat=True)
+        )
+        result.skipped += len(existing)
+        seen_emails.update(fields_by_email)
+        users, passwords = [], []
+        for email_lower, (email, extra_fields) in fields_by_email.items():
+            if email_lower in existing:
+                continue
+            passwords.append(extra_fields.pop("password", None))
+            users.append(self.model(email=email, **extra_fields))
+        return users, passwords
+
+    def _lower(self, emails: list[str], using: str) -> list[str]:
+        """Lowercase emails with the database's LOWER().
+
+        Args:
+            emails (list[str]): The emails.
+            using (str): Alias of the database.
+
+        Returns:
+            list[str]: The lowercased emails, in order.
+        """
+        compiler = Query(self.model).get_compiler(using)
+        lowered = []
+        with connections[using].cursor() as cursor:
+            for start in range(0, len(emails), LOWER_BATCH_SIZE):
+                columns, params = [], []
+                for email in emails[start : start + LOWER_BATCH_SIZE]:
+                    sql, email_params = compiler.compile(Lower(Value(email)))
+                    columns.append(sql)
+                    params.extend(email_params)
+                cursor.execute(f"SELECT {', '.join(columns)}", params)
+                lowered.extend(cursor.fetchone())
+        return lowered
+
+    def _insert_batch(
+        self,
+        users: list[User],
+        hashes: Iterator[str],
+        batch_size: int,
+        result: BulkCreateResult,
+        progress: Optional[Callable[[BulkCreateResult], None]],
+    ) -> None:
+        """Set the hashed passwords on a batch of users and insert them.
+
+        Args:
+            users (list[User]): The unsaved users.
+            hashes (Iterator[str]): The users' encoded passwords, in order.
+            batch_size (int): The bulk_create batch size.
+            result (BulkCreateResult): The running totals, updated.
+            progress (Callable[[BulkCreateResult], None], optional): Called
+                with the running totals once the batch is inserted.
+        """
+        for user, encoded in zip(users, hashes):
+            user.password = encoded
+        self.bulk_create(users, batch_size=batch_size)
+        result.created += len(users)
+        if progress is not None:
+            progress(result)
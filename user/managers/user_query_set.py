@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""A QuerySet that can stream users as lightweight read-only rows."""
+
+import datetime
+import decimal
+import uuid
+from collections.abc import Iterator
+from functools import lru_cache, partial
+from typing import Any, NamedTuple, Optional, Union
+
+from django.db.models import Field, Model, QuerySet
+
+DEFAULT_PROJECTION = ("id", "email", "is_active")
+# Python types of the values values_list() returns, by get_internal_type():
+PYTHON_TYPES = {
+    "AutoField": int,
+    "BigAutoField": int,
+    "BigIntegerField": int,
+    "BooleanField": bool,
+    "CharField": str,
+    "DateField": datetime.date,
+    "DateTimeField": datetime.datetime,
+    "DecimalField": decimal.Decimal,
+    "DurationField": datetime.timedelta,
+    "FloatField": float,
+    "IntegerField": int,
+    "PositiveBigIntegerField": int,
+    "PositiveIntegerField": int,
+    "PositiveSmallIntegerField": int,
+    "SlugField": str,
+    "SmallAutoField": int,
+    "SmallIntegerField": int,
+    "TextField": str,
+    "TimeField": datetime.time,
+    "UUIDField": uuid.UUID,
+}
+
+
+def _field(model: type[Model], name: str) -> Field:
+    """The concrete field a projection's field name selects.
+
+    Args:
+        model (type[Model]): The model projected.
+        name (str): The field name, or "pk".
+
+    Returns:
+        Field: The field.
+
+    Raises:
+        ValueError: If the field isn't a column of the model's table.
+    """
+    field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+    if not field.concrete or field.many_to_many:
+        raise ValueError(f"{model.__name__}.{name} isn't a column to project.")
+    return field
+
+
+def _python_type(field: Field) -> Any:
+    """The type of a field's values, as values_list() returns them.
+
+    Args:
+        field (Field): The field, following foreign keys to their target.
+
+    Returns:
+        Any: The type, Optional if the field is nullable, or Any if unknown.
+    """
+    python_type = PYTHON_TYPES.get(
+        (field.target_field if field.is_relation else field).get_internal_type(), Any
+    )
+    return Optional[python_type] if field.null else python_type
+
+
+@lru_cache(maxsize=None)
+def projection_type(model: type[Model], fields: tuple[str, ...]) -> type[NamedTuple]:
+    """The typed named tuple for rows of some of a model's fields.
+
+    Built once per model and fields, so rows of the same projection share a
+    class, e.g. UserProjection(id: int, email: str, is_active: bool).
+
+    Args:
+        model (type[Model]): The model projected.
+        fields (tuple[str, ...]): The field names, in order.
+
+    Returns:
+        type[NamedTuple]: The row class.
+    """
+    return NamedTuple(
+        f"{model.__name__}Projection",
+        [(name, _python_type(_field(model, name))) for name in fields],
+    )
+
+
+class UserQuerySet(QuerySet):
+    """A QuerySet that can stream users as lightweight read-only rows."""
+
+    def projection(
+        self,
+        fields: Union[type[tuple], tuple[str, ...]] = DEFAULT_PROJECTION,
+        chunk_size: int = 2000,
+    ) -> Iterator[tuple]:
+        """Stream the users as named tuples of some of their fields.
+
+        Rows are read with values_list() in chunks, so unlike model instances
+        there's no per-row field loading, deferred field tracking or signals,
+        and memory doesn't grow with the number of users. The fields are
+        given by name, getting a typed row class from projection_type(), or by
+        a NamedTuple class whose field names are the model's, e.g.
+
+            class Account(NamedTuple):
+                id: int
+                email: str
+
+            for account in User.objects.filter(is_active=True).projection(Account):
+                ...
+
+        Args:
+            fields (type[tuple] | tuple[str, ...]): The field names, or the
+                NamedTuple class to build rows as.
+                Defaults to ("id", "email", "is_active").
+            chunk_size (int): Rows to fetch from the database at a time.
+                Defaults to 2000.
+
+        Returns:
+            Iterator[tuple]: The users' rows, in the QuerySet's order.
+        """
+        if isinstance(fields, type):
+            row_type = fields
+            for name in row_type._fields:
+                _field(self.model, name)
+        else:
+            row_type = projection_type(self.model, tuple(fields))
+        return map(
+            partial(tuple.__new__, row_type),
+            self.values_list(*row_type._fields).iterator(chunk_size),
+        )
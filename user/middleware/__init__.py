@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""User related middleware."""
+
+from ._cached_authentication_middleware import (  # noqa: F401.
+    CachedAuthenticationMiddleware,
+    aget_user,
+)
+from ._replica_pin_middleware import ReplicaPinMiddleware  # noqa: F401.
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from typing import TYPE_CHECKING, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from django.utils.functional import SimpleLazyObject
+
+from ..caches import UserCache
+
+if TYPE_CHECKING:
+    from ..models import User
+
+
+def get_user(request: HttpRequest) -> Union["User", AnonymousUser]:
+    """The request's user, from the user cache where possible.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        user.models.User | AnonymousUser: The user.
+    """
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = _get_user(request)
+    return request._cached_user
+
+
+async def aget_user(request: HttpRequest) -> Union["User", AnonymousUser]:
+    """The request's user, loaded without blocking the event loop.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        user.models.User | AnonymousUser: The user.
+    """
+    if not hasattr(request, "_cached_user"):
+        # The session is read from the database, which has no async API.
+        request._cached_user = await sync_to_async(_get_user)(request)
+    return request._cached_user
+
+
+def _get_user(request: HttpRequest) -> Union["User", AnonymousUser]:
+    """As django.contrib.auth.get_user, but checks the user cache first.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        user.models.User | AnonymousUser: The user.
+    """
+    try:
+        user_id = get_user_model()._meta.pk.to_python(request.session[auth.SESSION_KEY])
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    user_cache = UserCache.from_settings()
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if session_hash and backend_path in settings.AUTHENTICATION_BACKENDS:
+        user = user_cache.get(user_id, session_hash)
+        if user is not None:
+            # As the backend's get_user() checks, e.g. that the user is active.
+            # Those refused are loaded afresh below, logging them out if so.
+            can_authenticate = getattr(
+                auth.load_backend(backend_path), "user_can_authenticate", None
+            )
+            if can_authenticate is None or can_authenticate(user):
+                return user
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        user_cache.set(user)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """Authentication middleware that loads the user from the user cache."""
+
+    def process_request(self, request: HttpRequest) -> None:
+        """Set the request's lazily loaded user.
+
+        Args:
+            request (HttpRequest): The request.
+        """
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
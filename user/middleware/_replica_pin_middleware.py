@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+from math import ceil
+from time import time
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from ..routers import pin_to_primary, pinned_until, unpin
+
+SALT = "user.middleware.ReplicaPinMiddleware"
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """Pin a client's reads to the primary for the replica lag after a write.
+
+    ReplicaRouter pins the rest of a request to the primary once it writes.
+    This carries the pin to the client's following requests in a signed
+    cookie, so e.g. the page redirected to after a form reads the write.
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        """Pin the request's reads if the client has written recently.
+
+        Args:
+            request (HttpRequest): The request.
+        """
+        unpin()  # Don't inherit a pin from the thread's last request.
+        cookie = settings.USER_REPLICA_ROUTER["COOKIE"]
+        if cookie not in request.COOKIES:
+            request.replica_pinned_until = 0.0
+            return
+        until = request.get_signed_cookie(
+            cookie,
+            default=None,
+            salt=SALT,
+            max_age=settings.USER_REPLICA_ROUTER["LAG"],
+        )
+        try:
+            pin_to_primary(float(until))
+        except (TypeError, ValueError):
+            pass
+        request.replica_pinned_until = pinned_until()
+
+    def process_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+    ) -> HttpResponse:
+        """Set the pin cookie if the request wrote.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        until = pinned_until()
+        if until > getattr(request, "replica_pinned_until", 0.0):
+            response.set_signed_cookie(
+                settings.USER_REPLICA_ROUTER["COOKIE"],
+                repr(until),
+                salt=SALT,
+                max_age=ceil(until - time()),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 4.1.7 on 2026-10-18 19:20
+"""Case-insensitive unique User email migration."""
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_no_duplicate_emails(
+    apps: StateApps,
+    schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    """Fail with instructions if emails differing only by case exist.
+
+    Args:
+        apps (StateApps): The historical apps.
+        schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+
+    Raises:
+        RuntimeError: If duplicate emails exist.
+    """
+    duplicates = (
+        apps.get_model("user", "User")
+        .objects.using(schema_editor.connection.alias)
+        .values(email_lower=Lower("email"))
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    if duplicates.exists():
+        raise RuntimeError(
+            "Users with emails differing only by case exist,"
+            " run `manage.py merge_duplicate_emails` first."
+        )
+
+
+class Migration(migrations.Migration):
+    """Case-insensitive unique User email migration."""
+
+    dependencies = [
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_no_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="user_user_email_lower_unique",
+                violation_error_message=(
+                    "A user with that email address already exists."
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 4.1.7 on 2026-10-18 19:24
+"""User admin search indexes migration.
+
+Besides the lowercase name indexes used for prefix searches, adds an FTS5
+index on SQLite and trigram indexes on PostgreSQL where available.
+
+The FTS5 index is kept up to date by triggers on the user table. SQLite
+migrations that rebuild the table drop its triggers, so such migrations must
+run create_search_index again afterwards.
+"""
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+SEARCH_FIELDS = ("email", "first_name", "last_name")
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE user_user_fts USING fts5"
+    "({columns}, content='user_user', content_rowid='id')",
+    "CREATE TRIGGER user_user_fts_insert AFTER INSERT ON user_user BEGIN"
+    " INSERT INTO user_user_fts(rowid, {columns})"
+    " VALUES (new.id, {new_columns}); END",
+    "CREATE TRIGGER user_user_fts_delete AFTER DELETE ON user_user BEGIN"
+    " INSERT INTO user_user_fts(user_user_fts, rowid, {columns})"
+    " VALUES ('delete', old.id, {old_columns}); END",
+    "CREATE TRIGGER user_user_fts_update AFTER UPDATE OF {columns} ON user_user"
+    " BEGIN"
+    " INSERT INTO user_user_fts(user_user_fts, rowid, {columns})"
+    " VALUES ('delete', old.id, {old_columns});"
+    " INSERT INTO user_user_fts(rowid, {columns})"
+    " VALUES (new.id, {new_columns}); END",
+    "INSERT INTO user_user_fts(user_user_fts) VALUES ('rebuild')",
+)
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS user_user_fts_insert",
+    "DROP TRIGGER IF EXISTS user_user_fts_delete",
+    "DROP TRIGGER IF EXISTS user_user_fts_update",
+    "DROP TABLE IF EXISTS user_user_fts",
+)
+POSTGRESQL_CREATE = ("CREATE EXTENSION IF NOT EXISTS pg_trgm",) + tuple(
+    # Matches the UPPER(...::text) LIKE that icontains lookups compile to.
+    f"CREATE INDEX IF NOT EXISTS user_user_{field}_trgm"
+    f' ON user_user USING gin ((UPPER("{field}"::text)) gin_trgm_ops)'
+    for field in SEARCH_FIELDS
+)
+POSTGRESQL_DROP = tuple(
+    f"DROP INDEX IF EXISTS user_user_{field}_trgm" for field in SEARCH_FIELDS
+)
+
+
+def _sqlite_has_fts5(schema_editor: BaseDatabaseSchemaEditor) -> bool:
+    """Whether the SQLite library was compiled with FTS5.
+
+    Args:
+        schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+
+    Returns:
+        bool: True if FTS5 tables can be created.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_search_index(
+    apps: StateApps,
+    schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    """Create the backend's full text or trigram search index, if it has one.
+
+    Args:
+        apps (StateApps): The historical apps.
+        schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite" and _sqlite_has_fts5(schema_editor):
+        delete_search_index(apps, schema_editor)
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(
+                statement.format(
+                    columns=", ".join(SEARCH_FIELDS),
+                    new_columns=", ".join(f"new.{field}" for field in SEARCH_FIELDS),
+                    old_columns=", ".join(f"old.{field}" for field in SEARCH_FIELDS),
+                )
+            )
+    elif vendor == "postgresql":
+        for statement in POSTGRESQL_CREATE:
+            schema_editor.execute(statement)
+
+
+def delete_search_index(
+    apps: StateApps,
+    schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    """Delete the backend's full text or trigram search index, if it has one.
+
+    Args:
+        apps (StateApps): The historical apps.
+        schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        for statement in POSTGRESQL_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    """User admin search indexes migration."""
+
+    dependencies = [
+        ("user", "0002_email_lower_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("first_name"),
+                name="user_user_first_name_lower",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("last_name"),
+                name="user_user_last_name_lower",
+            ),
+        ),
+        migrations.RunPython(create_search_index, delete_search_index),
+    ]
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
+from typing import Optional
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
+from ..hashers import get_hashing_service
 from ..managers import UserManager
 
 
@@ -22,3 +27,80 @@ class User(AbstractUser):
     ]  # Must not include USERNAME_FIELD.
 
     objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        """User model options."""
+
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="user_user_email_lower_unique",
+                violation_error_message=_(
+                    "A user with that email address already exists."
+                ),
+            ),
+        ]
+        indexes = [
+            models.Index(Lower("first_name"), name="user_user_first_name_lower"),
+            models.Index(Lower("last_name"), name="user_user_last_name_lower"),
+        ]
+
+    def set_password(self, raw_password: Optional[str]) -> None:
+        """Set the password, hashed on the hashing service.
+
+        Args:
+            raw_password (str, optional): The raw password,
+                None for an unusable one.
+        """
+        self.password = get_hashing_service().make_password(raw_password)
+        self._password = raw_password
+
+    async def aset_password(self, raw_password: Optional[str]) -> None:
+        """Set the password without blocking the event loop.
+
+        Args:
+            raw_password (str, optional): The raw password,
+                None for an unusable one.
+        """
+        self.password = await get_hashing_service().amake_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password: Optional[str]) -> bool:
+        """Check the password on the hashing service.
+
+        As parent, upgrading the stored hash if the preferred hasher changed.
+
+        Args:
+            raw_password (str, optional): The raw password to check.
+
+        Returns:
+            bool: Whether the password is correct.
+        """
+        is_correct, must_update = get_hashing_service().verify(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_correct
+
+    async def acheck_password(self, raw_password: Optional[str]) -> bool:
+        """Check the password without blocking the event loop.
+
+        Args:
+            raw_password (str, optional): The raw password to check.
+
+        Returns:
+            bool: Whether the password is correct.
+        """
+        is_correct, must_update = await get_hashing_service().averify(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            await self.aset_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            await sync_to_async(self.save)(update_fields=["password"])
+        return is_correct
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""User related signal receivers."""
+
+from . import _permission_cache, _user_cache  # noqa: F401.
+from ._last_login import LAST_LOGIN_DISPATCH_UID, buffer_last_login  # noqa: F401.
+from ._permission_cache import invalidate_migrated_permissions  # noqa: F401.
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+
+from django.utils import timezone
+
+from ..caches import LastLoginBuffer
+from ..models import User
+
+# Django's update_last_login receiver's, which buffer_last_login replaces.
+LAST_LOGIN_DISPATCH_UID = "update_last_login"
+
+
+def buffer_last_login(user: User, **kwargs: Any) -> None:
+    """Buffer a login's last_login, rather than saving the user.
+
+    Connected by the user app in place of Django's update_last_login, if
+    settings.USER_LAST_LOGIN_BUFFER is enabled.
+
+    Args:
+        user (User): The user logging in.
+        kwargs: Other signal arguments.
+    """
+    user.last_login = timezone.now()
+    LastLoginBuffer.from_settings().record(user.pk, user.last_login)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Optional
+
+from django.contrib.auth.models import Group, Permission
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from ..caches import PermissionCache
+from ..models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_permissions(instance: User, **kwargs: Any) -> None:
+    """Forget a saved or deleted user's cached permissions.
+
+    Saves can change is_active or is_superuser, which decide the permissions.
+
+    Args:
+        instance (User): The saved or deleted user.
+        kwargs: Other signal arguments.
+    """
+    PermissionCache.from_settings().invalidate([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_member_permissions(
+    instance: Model,
+    action: str,
+    reverse: bool,
+    pk_set: Optional[set[Any]],
+    **kwargs: Any,
+) -> None:
+    """Forget the cached permissions of users whose groups or permissions change.
+
+    Args:
+        instance (Model): The user, or the group or permission if reversed.
+        action (str): The kind of change.
+        reverse (bool): Whether the change was made from the group or
+            permission side.
+        pk_set (set[Any], optional): The primary keys added or removed,
+            None when cleared.
+        kwargs: Other signal arguments.
+    """
+    if not action.startswith("post_"):
+        return
+    permission_cache = PermissionCache.from_settings()
+    if not reverse:
+        permission_cache.invalidate([instance.pk])
+    elif pk_set is None:
+        permission_cache.invalidate_all()
+    else:
+        permission_cache.invalidate(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(action: str, **kwargs: Any) -> None:
+    """Forget every cached permission set when a group's permissions change.
+
+    Args:
+        action (str): The kind of change.
+        kwargs: Other signal arguments.
+    """
+    if action.startswith("post_"):
+        PermissionCache.from_settings().invalidate_all()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_all_permissions(**kwargs: Any) -> None:
+    """Forget every cached permission set when groups or permissions go or come.
+
+    Superusers have every permission, so new permissions change their sets too.
+
+    Args:
+        kwargs: Signal arguments.
+    """
+    PermissionCache.from_settings().invalidate_all()
+
+
+def invalidate_migrated_permissions(**kwargs: Any) -> None:
+    """Forget every cached permission set after an app is migrated.
+
+    migrate creates new models' permissions with bulk_create, which sends no
+    post_save. Connected by the user app after Django's create_permissions.
+
+    Args:
+        kwargs: Signal arguments.
+    """
+    PermissionCache.from_settings().invalidate_all()
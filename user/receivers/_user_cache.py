@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..caches import UserCache
+from ..models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(instance: User, **kwargs: Any) -> None:
+    """Forget a saved or deleted user's cached row.
+
+    Args:
+        instance (User): The saved or deleted user.
+        kwargs: Other signal arguments.
+    """
+    UserCache.from_settings().invalidate([instance.pk])
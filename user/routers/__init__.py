@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""User related database routers."""
+
+from ._replica_router import (  # noqa: F401.
+    ReplicaRouter,
+    pin_to_primary,
+    pinned_until,
+    unpin,
+)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import random
+from contextvars import ContextVar
+from time import time
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+
+_pinned_until: ContextVar[float] = ContextVar("user_primary_pinned_until", default=0.0)
+
+
+def pinned_until() -> float:
+    """When reads in this context stop being pinned to the primary.
+
+    Returns:
+        float: The time, as from time.time().
+    """
+    return _pinned_until.get()
+
+
+def pin_to_primary(until: Optional[float] = None) -> None:
+    """Send reads in this context to the primary, e.g. after a write.
+
+    Args:
+        until (float, optional): When to stop, as from time.time().
+            Defaults to the replica lag from now.
+    """
+    if until is None:
+        until = time() + settings.USER_REPLICA_ROUTER["LAG"]
+    _pinned_until.set(max(until, _pinned_until.get()))
+
+
+def unpin() -> None:
+    """Let reads in this context go to replicas again."""
+    _pinned_until.set(0.0)
+
+
+class ReplicaRouter:
+    """Send user app reads to a replica unless recently written to.
+
+    Writes go to the primary and pin the context's reads to it for the
+    replica lag, so a request can read what it has just written.
+    ReplicaPinMiddleware carries the pin to the client's next requests.
+    """
+
+    app_labels = {"user"}
+
+    def _routed(self, model: type[Model]) -> bool:
+        """Whether the model's reads go to replicas.
+
+        Args:
+            model (type[Model]): The model.
+
+        Returns:
+            bool: True if routed to replicas.
+        """
+        return bool(settings.DATABASE_REPLICAS) and (
+            model._meta.app_label in self.app_labels
+        )
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        """Choose a replica to read from, unless pinned to the primary.
+
+        Args:
+            model (type[Model]): The model read.
+            hints: Routing hints.
+
+        Returns:
+            str, optional: The database alias, None for no opinion.
+        """
+        if not self._routed(model):
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db  # Related reads follow the instance.
+        if _pinned_until.get() > time():
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> Optional[str]:
+        """Write to the primary and pin this context's reads to it.
+
+        Args:
+            model (type[Model]): The model written.
+            hints: Routing hints.
+
+        Returns:
+            str, optional: The database alias, None for no opinion.
+        """
+        if not self._routed(model):
+            return None
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        """Allow relations between the primary and its replicas.
+
+        Args:
+            obj1 (Model): A related object.
+            obj2 (Model): The other related object.
+            hints: Routing hints.
+
+        Returns:
+            bool, optional: True if both are on the primary or its replicas,
+                None for no opinion.
+        """
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: Optional[str] = None,
+        **hints: Any,
+    ) -> Optional[bool]:
+        """Only migrate the primary, replicas copy its schema.
+
+        Args:
+            db (str): The database alias.
+            app_label (str): The migrated app.
+            model_name (str, optional): The migrated model.
+            hints: Routing hints.
+
+        Returns:
+            bool, optional: False for replicas, None for no opinion.
+        """
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""User related signals."""
+
+from ._password_hashed import password_hashed  # noqa: F401.
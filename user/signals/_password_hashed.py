@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+from django.dispatch import Signal
+
+# Sent by the hashing service once a password is hashed or checked, from the
+# waiting thread or task, with the operation ("make_password" or "verify") and
+# the seconds it took including any queueing.
+password_hashed = Signal()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Tests for the user admin."""
+
+import csv
+import io
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.test import TransactionTestCase
+from django.utils.http import urlencode
+
+from core.asgi import application
+
+from ..models import User
+
+CSRF_TOKEN = "a" * 32
+
+
+async def _asgi_post(path: str, data: dict[str, Any], cookies: str) -> tuple:
+    """POST a form through the ASGI application, reading the whole response.
+
+    Args:
+        path (str): The path.
+        data (dict[str, Any]): The form fields.
+        cookies (str): The Cookie header.
+
+    Returns:
+        tuple: The status and body.
+    """
+    body = urlencode(data, doseq=True).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cookie", cookies.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = None
+    chunks = []
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await application(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+class UserAdminExportTests(TransactionTestCase):
+    """Test the export actions stream through ASGI."""
+
+    def setUp(self) -> None:
+        """Log an admin in and add users to export."""
+        admin = User.objects.create_superuser("admin@example.com", "unused")
+        User.objects.bulk_create(
+            User(email=f"export-{number}@example.com") for number in range(5)
+        )
+        self.client.force_login(admin)
+        self.cookies = (
+            f"sessionid={self.client.cookies['sessionid'].value};"
+            f" csrftoken={CSRF_TOKEN}"
+        )
+
+    async def test_export_csv_through_asgi(self) -> None:
+        """Every selected user is streamed, not only the header."""
+        users = await sync_to_async(list)(
+            User.objects.filter(email__startswith="export-")
+        )
+        status, body = await _asgi_post(
+            "/admin/user/user/",
+            {
+                "action": "export_csv",
+                "_selected_action": [user.pk for user in users],
+                "index": 0,
+                "csrfmiddlewaretoken": CSRF_TOKEN,
+            },
+            self.cookies,
+        )
+        self.assertEqual(status, 200)
+        rows = csv.DictReader(io.StringIO(body.decode()))
+        self.assertCountEqual(
+            [row["email"] for row in rows], [user.email for user in users]
+        )
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Tests for the last_login buffer."""
+
+import io
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..caches import LastLoginBuffer, UserCache
+from ..models import User
+from ..receivers import buffer_last_login
+
+
+class LastLoginBufferTests(TestCase):
+    """Test buffered logins are merged and written when flushed."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache, with users who have logged in once."""
+        cache.clear()
+        self.started = timezone.now()
+        self.ann = User.objects.create_user("ann@example.com", "unused")
+        self.bob = User.objects.create_user("bob@example.com", "unused")
+        self.buffer = LastLoginBuffer(window=60, max_pending=10)
+        # The window's first login is written at once, opening the window.
+        self.buffer.record(self.ann.pk, self.started)
+
+    def last_logins(self) -> dict[str, timezone.datetime]:
+        """The users' last logins, as written.
+
+        Returns:
+            dict[str, datetime]: The last logins by email.
+        """
+        return dict(User.objects.values_list("email", "last_login"))
+
+    def at(self, minutes: int) -> timezone.datetime:
+        """A time after the test started.
+
+        Args:
+            minutes (int): Minutes after.
+
+        Returns:
+            datetime: The time.
+        """
+        return self.started + timedelta(minutes=minutes)
+
+    def test_buffered_until_flushed(self) -> None:
+        """Logins within the window wait for a flush, which merges them."""
+        self.assertEqual(self.last_logins()[self.ann.email], self.started)
+        self.buffer.record(self.ann.pk, self.at(2))
+        self.buffer.record(self.ann.pk, self.at(1))
+        self.buffer.record(self.bob.pk, self.at(3))
+        self.assertEqual(
+            self.last_logins(),
+            {self.ann.email: self.started, self.bob.email: None},
+        )
+        self.assertEqual(self.buffer.pending([self.ann.pk]), {self.ann.pk: self.at(1)})
+        self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(
+            self.last_logins(),
+            {self.ann.email: self.at(2), self.bob.email: self.at(3)},
+        )
+        # Including ann's pending login, recorded last but earlier.
+        self.assertEqual(self.buffer.pending([self.ann.pk, self.bob.pk]), {})
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_flushed_at_max_pending(self) -> None:
+        """Every max_pending logins are written without waiting for the window."""
+        for minutes in range(1, 9):
+            self.buffer.record(self.bob.pk, self.at(minutes))
+        self.assertIsNone(self.last_logins()[self.bob.email])
+        self.buffer.record(self.bob.pk, self.at(9))  # The 10th.
+        self.assertEqual(self.last_logins()[self.bob.email], self.at(9))
+
+    def test_batches(self) -> None:
+        """Logins are written max_pending at a time, the latest kept."""
+        self.buffer.record(self.ann.pk, self.at(1))
+        self.buffer.record(self.bob.pk, self.at(2))
+        self.buffer.record(self.bob.pk, self.at(3))
+        self.buffer.record(self.ann.pk, self.at(4))
+        flushing = LastLoginBuffer(window=60, max_pending=3)
+        with self.assertNumQueries(6):  # An update per batch, in a savepoint.
+            self.assertEqual(flushing.flush(), 4)
+        self.assertEqual(
+            self.last_logins(),
+            {self.ann.email: self.at(4), self.bob.email: self.at(3)},
+        )
+
+    def test_apply_pending(self) -> None:
+        """Reads show a pending login only if later than the row's."""
+        self.buffer.record(self.ann.pk, self.at(1))
+        self.buffer.record(self.bob.pk, self.at(1))
+        ann, bob = User.objects.order_by("email")
+        bob.last_login = self.at(2)
+        self.buffer.apply([ann, bob])
+        self.assertEqual(ann.last_login, self.at(1))
+        self.assertEqual(bob.last_login, self.at(2))
+
+    def test_flush_forgets_cached_users(self) -> None:
+        """Written users' cached rows are forgotten."""
+        user_cache = UserCache.from_settings()
+        user_cache.set(self.bob)
+        self.buffer.record(self.bob.pk, self.at(1))
+        self.buffer.flush()
+        self.assertIsNone(user_cache.get(self.bob.pk, self.bob.get_session_auth_hash()))
+
+    def test_one_flush_at_a_time(self) -> None:
+        """A flush while another runs does nothing."""
+        self.buffer.record(self.bob.pk, self.at(1))
+        cache.add(f"{LastLoginBuffer.key_prefix}:lock", True)
+        self.assertIsNone(self.buffer.flush())
+        with self.assertRaises(CommandError):
+            call_command("flush_last_logins", stdout=io.StringIO())
+        cache.delete(f"{LastLoginBuffer.key_prefix}:lock")
+        stdout = io.StringIO()
+        call_command("flush_last_logins", stdout=stdout)
+        self.assertIn("Wrote 1 last logins.", stdout.getvalue())
+        self.assertEqual(self.last_logins()[self.bob.email], self.at(1))
+
+    def test_receiver(self) -> None:
+        """Logging in buffers the login and shows it on the user."""
+        buffer_last_login(user=self.bob)
+        self.assertIsNotNone(self.bob.last_login)
+        self.assertEqual(
+            LastLoginBuffer.from_settings().pending([self.bob.pk]),
+            {self.bob.pk: self.bob.last_login},
+        )
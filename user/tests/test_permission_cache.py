@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Tests for the shared permission cache and its invalidation."""
+
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management.sql import emit_post_migrate_signal
+from django.test import TestCase
+
+from ..caches import PermissionCache
+from ..models import User
+
+
+class PermissionCacheTests(TestCase):
+    """Test cached permission sets are forgotten when they change."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache, with a user and a group."""
+        cache.clear()
+        self.user = User.objects.create_user("perms@example.com", "unused")
+        self.group = Group.objects.create(name="Editors")
+        self.permission = Permission.objects.get(codename="change_user")
+        self.name = "user.change_user"
+
+    def permissions(self, user: User) -> set[str]:
+        """A user's permissions, as a new request would see them.
+
+        Args:
+            user (User): The user.
+
+        Returns:
+            set[str]: The permission names.
+        """
+        return User.objects.get(pk=user.pk).get_all_permissions()
+
+    def test_cached_between_requests(self) -> None:
+        """A permission set is read from the database once."""
+        self.user.user_permissions.add(self.permission)
+        self.assertEqual(self.permissions(self.user), {self.name})
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_all_permissions(), {self.name})
+
+    def test_user_permissions_changed(self) -> None:
+        """Adding or removing a user's permissions forgets their set."""
+        self.assertEqual(self.permissions(self.user), set())
+        self.user.user_permissions.add(self.permission)
+        self.assertEqual(self.permissions(self.user), {self.name})
+        self.permission.user_set.remove(self.user)
+        self.assertEqual(self.permissions(self.user), set())
+
+    def test_group_changed(self) -> None:
+        """Group membership and group permission changes forget the sets."""
+        other = User.objects.create_user("other@example.com", "unused")
+        self.group.user_set.add(self.user, other)
+        self.assertEqual(self.permissions(self.user), set())
+        self.assertEqual(self.permissions(other), set())
+        self.group.permissions.add(self.permission)
+        self.assertEqual(self.permissions(self.user), {self.name})
+        self.assertEqual(self.permissions(other), {self.name})
+        self.group.user_set.clear()
+        self.assertEqual(self.permissions(self.user), set())
+        self.assertEqual(self.permissions(other), set())
+
+    def test_user_saved(self) -> None:
+        """Saving a user, e.g. deactivating them, forgets their set."""
+        self.user.user_permissions.add(self.permission)
+        self.assertEqual(self.permissions(self.user), {self.name})
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.permissions(self.user), set())
+
+    def test_set_read_before_change_not_served(self) -> None:
+        """A set read before an invalidation is written under a stale key."""
+        permission_cache = PermissionCache.from_settings()
+        keys = permission_cache.keys([self.user.pk])
+        permission_cache.invalidate([self.user.pk])
+        permission_cache.set_many({self.user.pk: {"stale.permission"}}, keys)
+        self.assertEqual(
+            permission_cache.get_many(permission_cache.keys([self.user.pk])), {}
+        )
+        generation = permission_cache.generation()
+        permission_cache.invalidate_all()
+        self.assertNotEqual(permission_cache.generation(), generation)
+
+    def test_migrate_invalidates(self) -> None:
+        """Permissions migrate creates without signals reach cached sets."""
+        superuser = User.objects.create_superuser("super@example.com", "unused")
+        names = self.permissions(superuser)
+        Permission.objects.bulk_create(
+            [
+                Permission(
+                    codename="audit_user",
+                    name="Can audit user",
+                    content_type=ContentType.objects.get_for_model(User),
+                )
+            ]
+        )
+        self.assertEqual(self.permissions(superuser), names)
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        self.assertEqual(self.permissions(superuser), names | {"user.audit_user"})
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Tests for the replica router and the pin cookie."""
+
+from time import time
+from typing import Optional
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..middleware import ReplicaPinMiddleware
+from ..models import User
+from ..routers import ReplicaRouter, pin_to_primary, pinned_until, unpin
+
+COOKIE = "user_primary_pinned_until"
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    USER_REPLICA_ROUTER={"LAG": 5, "COOKIE": COOKIE},
+)
+class ReplicaRouterTests(SimpleTestCase):
+    """Test user app reads go to replicas until written to."""
+
+    def setUp(self) -> None:
+        """Start unpinned."""
+        unpin()
+        self.addCleanup(unpin)
+        self.router = ReplicaRouter()
+
+    def test_reads_from_replica(self) -> None:
+        """Unpinned user reads go to a replica, others aren't routed."""
+        self.assertEqual(self.router.db_for_read(User), "replica")
+        self.assertIsNone(self.router.db_for_read(Group))
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_write_pins_reads_for_lag(self) -> None:
+        """A write pins reads to the primary until the lag has passed."""
+        self.assertEqual(self.router.db_for_write(User), "default")
+        self.assertAlmostEqual(pinned_until(), time() + 5, delta=1)
+        self.assertEqual(self.router.db_for_read(User), "default")
+        with mock.patch("user.routers._replica_router.time", return_value=time() + 6):
+            self.assertEqual(self.router.db_for_read(User), "replica")
+
+    def test_pin_only_extends(self) -> None:
+        """An earlier pin doesn't shorten a later one."""
+        pin_to_primary(time() + 60)
+        until = pinned_until()
+        pin_to_primary()
+        self.assertEqual(pinned_until(), until)
+
+    def test_related_reads_follow_instance(self) -> None:
+        """Reads through an instance go to the database it came from."""
+        user = User(pk=1)
+        user._state.db = "default"
+        self.assertEqual(self.router.db_for_read(User, instance=user), "default")
+
+    def test_replicas_not_migrated(self) -> None:
+        """Only the primary is migrated."""
+        self.assertIs(self.router.allow_migrate("replica", "user"), False)
+        self.assertIsNone(self.router.allow_migrate("default", "user"))
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    USER_REPLICA_ROUTER={"LAG": 5, "COOKIE": COOKIE},
+)
+class ReplicaPinMiddlewareTests(SimpleTestCase):
+    """Test the pin is carried to a client's next requests in a cookie."""
+
+    def setUp(self) -> None:
+        """Set up a middleware whose view may write."""
+        unpin()
+        self.addCleanup(unpin)
+        self.writes = False
+        self.read_from = None
+        self.middleware = ReplicaPinMiddleware(self.view)
+
+    def view(self, request: HttpRequest) -> HttpResponse:
+        """Read, and write if the test says to.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: An empty response.
+        """
+        self.read_from = ReplicaRouter().db_for_read(User)
+        if self.writes:
+            ReplicaRouter().db_for_write(User)
+        return HttpResponse()
+
+    def get(self, cookie: Optional[str] = None) -> HttpResponse:
+        """Send a request through the middleware.
+
+        Args:
+            cookie (str, optional): The pin cookie's value. Defaults to None.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        request = RequestFactory().get("/")
+        if cookie is not None:
+            request.COOKIES[COOKIE] = cookie
+        return self.middleware(request)
+
+    def test_write_sets_cookie(self) -> None:
+        """A request that writes pins the client's next requests."""
+        self.writes = True
+        response = self.get()
+        self.assertEqual(self.read_from, "replica")
+        self.assertIn(COOKIE, response.cookies)
+        self.assertEqual(response.cookies[COOKIE]["max-age"], 5)
+        self.writes = False
+        response = self.get(response.cookies[COOKIE].value)
+        self.assertEqual(self.read_from, "default")
+        self.assertNotIn(COOKIE, response.cookies)  # Still pinned, not extended.
+
+    def test_no_write_no_cookie(self) -> None:
+        """A request that only reads sets no cookie."""
+        self.assertNotIn(COOKIE, self.get().cookies)
+        self.assertEqual(self.read_from, "replica")
+
+    def test_tampered_cookie_ignored(self) -> None:
+        """A cookie that isn't signed doesn't pin."""
+        self.get(repr(time() + 60))
+        self.assertEqual(self.read_from, "replica")
+
+    def test_pin_not_inherited(self) -> None:
+        """A request doesn't inherit the thread's last request's pin."""
+        pin_to_primary()
+        self.get()
+        self.assertEqual(self.read_from, "replica")
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Tests for the login throttle."""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ..throttles import LoginThrottle
+
+EMAIL = "throttled@example.com"
+IP = "192.0.2.1"
+WINDOW = 300
+
+
+class LoginThrottleTests(SimpleTestCase):
+    """Test LoginThrottle's lockouts, sliding window and backoff."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache, at a window's start."""
+        cache.clear()
+        self.now = 1000 * WINDOW
+        patcher = mock.patch(
+            "user.throttles._login_throttle.time", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.throttle = LoginThrottle(
+            window=WINDOW, email_limit=3, ip_limit=5, backoff=60, max_backoff=200
+        )
+
+    def fail(self, times: int, email: str = EMAIL, ip: str = IP) -> None:
+        """Record failed logins.
+
+        Args:
+            times (int): How many.
+            email (str): The email logged in with. Defaults to EMAIL.
+            ip (str): The client IP. Defaults to IP.
+        """
+        for _ in range(times):
+            self.throttle.record_failure(email, ip)
+
+    def test_lockout_at_limit(self) -> None:
+        """An email is locked out once it reaches its limit."""
+        self.fail(2)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, IP), 0)
+        self.fail(1)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, IP), 61)
+        self.assertEqual(self.throttle.blocked_for(EMAIL.upper(), None), 61)
+        self.assertEqual(self.throttle.blocked_for("other@example.com", IP), 0)
+
+    def test_ip_lockout(self) -> None:
+        """An IP is locked out for every email once it reaches its limit."""
+        for number in range(5):
+            self.fail(1, email=f"user-{number}@example.com")
+        self.assertEqual(self.throttle.blocked_for("other@example.com", IP), 61)
+        self.assertEqual(self.throttle.blocked_for("other@example.com", None), 0)
+
+    def test_sliding_window(self) -> None:
+        """The previous window's failures count less as the current one ends."""
+        self.fail(2)
+        self.now += WINDOW * 1.5
+        self.fail(1)  # 1 + 2 * 0.5 failures.
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 0)
+        self.now += WINDOW * 0.25
+        self.fail(1)  # 2 + 2 * 0.25 failures.
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 0)
+        self.fail(1)
+        self.assertGreater(self.throttle.blocked_for(EMAIL, None), 0)
+
+    def test_failures_expire(self) -> None:
+        """Failures two windows old no longer count."""
+        self.fail(2)
+        self.now += WINDOW * 2
+        self.fail(2)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, IP), 0)
+
+    def test_backoff_doubles_up_to_maximum(self) -> None:
+        """Each repeated lockout lasts twice as long, up to max_backoff."""
+        self.fail(3)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 61)
+        self.fail(1)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 121)
+        self.fail(1)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 201)
+
+    def test_reset(self) -> None:
+        """A successful login forgets the email's failures and strikes."""
+        self.fail(2)
+        self.throttle.reset(EMAIL)
+        self.fail(2)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 0)
+        self.fail(1)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 61)
+        self.throttle.reset(EMAIL)
+        self.now += 1000
+        self.fail(3)
+        self.assertEqual(self.throttle.blocked_for(EMAIL, None), 61)
+
+    async def test_async_api(self) -> None:
+        """The async methods count and reset as the sync ones do."""
+        for _ in range(3):
+            await self.throttle.arecord_failure(EMAIL, IP)
+        self.assertEqual(await self.throttle.ablocked_for(EMAIL, IP), 61)
+        await self.throttle.areset(EMAIL)
+        for _ in range(2):
+            await self.throttle.arecord_failure(EMAIL, None)
+        # Not locked out again, for longer.
+        self.assertEqual(await self.throttle.ablocked_for(EMAIL, None), 61)
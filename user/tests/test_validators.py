@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""Tests for the user password validators."""
+
+import random
+import string
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth import password_validation
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ..models import User
+from ..validators import (
+    BreachedPasswordValidator,
+    PasswordPolicyValidator,
+    UserAttributeSimilarityValidator,
+    password_prefix,
+    write_index,
+)
+
+ALPHABET = string.ascii_letters + string.digits + " .-_@+'" + "éßøΩЖж中文"
+THRESHOLDS = (0.1, 0.5, 0.7, 1.0)
+
+
+def _error(validator: object, password: str, user: User) -> tuple:
+    """A validator's decision, as the error it raises.
+
+    Args:
+        validator (object): The validator.
+        password (str): The password to validate.
+        user (User): The user setting it.
+
+    Returns:
+        tuple: The error's code and params, or () if the password is valid.
+    """
+    try:
+        validator.validate(password, user)
+    except ValidationError as error:
+        return (error.code, error.params)
+    return ()
+
+
+class UserAttributeSimilarityValidatorTests(SimpleTestCase):
+    """Test UserAttributeSimilarityValidator decides as Django's does."""
+
+    def assertSameDecision(
+        self, password: str, user: User, max_similarity: float = 0.7
+    ) -> None:
+        """Assert both validators accept, or reject for the same attribute.
+
+        Args:
+            password (str): The password to validate.
+            user (User): The user setting it.
+            max_similarity (float): The threshold. Defaults to 0.7.
+        """
+        expected = _error(
+            password_validation.UserAttributeSimilarityValidator(
+                max_similarity=max_similarity
+            ),
+            password,
+            user,
+        )
+        actual = _error(
+            UserAttributeSimilarityValidator(max_similarity=max_similarity),
+            password,
+            user,
+        )
+        self.assertEqual(actual, expected, (password, user.__dict__, max_similarity))
+
+    def _user(self, email: str, first_name: str = "", last_name: str = "") -> User:
+        """An unsaved user.
+
+        Args:
+            email (str): The email.
+            first_name (str): The first name. Defaults to "".
+            last_name (str): The last name. Defaults to "".
+
+        Returns:
+            User: The user.
+        """
+        return User(email=email, first_name=first_name, last_name=last_name)
+
+    def test_random_corpus(self) -> None:
+        """Random users and passwords get the same decisions."""
+        rng = random.Random(21)
+
+        def text(max_length: int) -> str:
+            return "".join(rng.choices(ALPHABET, k=rng.randint(0, max_length)))
+
+        for _ in range(2000):
+            user = self._user(text(30), text(12), text(12))
+            if rng.random() < 0.3:
+                # Passwords built from the attributes, to reject some.
+                password = "".join(
+                    rng.sample([user.email, user.first_name, user.last_name], 2)
+                ) + text(4)
+            else:
+                password = text(rng.choice((8, 40, 300)))
+            for max_similarity in THRESHOLDS:
+                self.assertSameDecision(password, user, max_similarity)
+
+    def test_empty_values_and_passwords(self) -> None:
+        """Empty attributes are skipped and empty passwords compared."""
+        for user in (self._user(""), self._user("a@b.c", "", "x")):
+            for password in ("", "a", "a@b.c", "x"):
+                for max_similarity in THRESHOLDS:
+                    self.assertSameDecision(password, user, max_similarity)
+
+    def test_word_split_parts(self) -> None:
+        """Passwords are compared with each word of an attribute."""
+        user = self._user("jane.doe-smith@example.com", "Mary Ann", "O'Neil")
+        for password in ("janedoe", "example", "smith", "maryann", "oneil", "neil"):
+            self.assertSameDecision(password, user)
+        with self.assertRaises(ValidationError):
+            UserAttributeSimilarityValidator().validate("Example", user)
+
+    def test_length_ratio_boundary(self) -> None:
+        """Parts are skipped by length exactly where Django skips them."""
+        user = self._user("ab@cd.ef", "abc")
+        for length in range(1, 60):
+            for max_similarity in THRESHOLDS:
+                self.assertSameDecision("abc" * length, user, max_similarity)
+                self.assertSameDecision("a" * length, user, max_similarity)
+
+    def test_threshold_of_one(self) -> None:
+        """With max_similarity 1.0 only anagrams of a part are rejected."""
+        user = self._user("bob@example.com", "Robert")
+        for password in ("robert", "trebor", "robertx", "bob", "Bob@Example.com"):
+            self.assertSameDecision(password, user, 1.0)
+
+    def test_validate_many(self) -> None:
+        """validate_many() gives each password validate()'s decision."""
+        user = self._user("bench-mark@example.com", "Bench", "Mark")
+        passwords = ["benchmark", "Bench-Mark-42", "correct horse", "", "mark"]
+        validator = UserAttributeSimilarityValidator()
+        errors = validator.validate_many(passwords, user)
+        self.assertEqual(len(errors), len(passwords))
+        for password, error in zip(passwords, errors):
+            self.assertEqual(
+                () if error is None else (error.code, error.params),
+                _error(validator, password, user),
+            )
+        self.assertEqual(validator.validate_many(passwords, None), [None] * 5)
+
+
+class PasswordPolicyValidatorTests(SimpleTestCase):
+    """Test PasswordPolicyValidator's errors."""
+
+    validator = PasswordPolicyValidator(
+        min_alpha=2, min_numeric=2, min_uppercase=2, min_lowercase=2, min_special=1
+    )
+
+    def test_single_error_keeps_code_and_params(self) -> None:
+        """A single violated rule raises its own error, with code and params."""
+        with self.assertRaises(ValidationError) as raised:
+            self.validator.validate("AAbb;;1x")
+        self.assertEqual(raised.exception.code, "password_not_alphanumeric")
+        self.assertEqual(
+            raised.exception.params, {"number_alpha": 2, "number_numeric": 2}
+        )
+        (error,) = self.validator.validate_many(["AAbb;;1x"])
+        self.assertEqual(error.code, "password_not_alphanumeric")
+
+    def test_several_errors(self) -> None:
+        """Several violated rules raise a list, in rule order."""
+        with self.assertRaises(ValidationError) as raised:
+            self.validator.validate("aa")
+        self.assertEqual(
+            [error.code for error in raised.exception.error_list],
+            [
+                "password_not_alphanumeric",
+                "password_case_not_varied",
+                "password_not_enough_specials",
+            ],
+        )
+
+    def test_valid(self) -> None:
+        """Passwords meeting every rule are valid."""
+        self.validator.validate("AAbb;;12")
+        self.assertEqual(self.validator.validate_many(["AAbb;;12"]), [None])
+
+
+class BreachedPasswordValidatorTests(SimpleTestCase):
+    """Test BreachedPasswordValidator's lookups."""
+
+    def test_case_folded_lookup(self) -> None:
+        """Passwords are looked up as given, and lowercased and stripped."""
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "breached.idx"
+            write_index(sorted(map(password_prefix, ("password1", "Hunter2"))), path)
+            validator = BreachedPasswordValidator(path)
+            for password in ("password1", "PassWord1", " PASSWORD1 ", "Hunter2"):
+                with self.assertRaises(ValidationError) as raised:
+                    validator.validate(password)
+                self.assertEqual(raised.exception.code, "password_breached")
+            validator.validate("hunter2x")
+            validator._index.close()
+
+    def test_empty_index_loaded_once(self) -> None:
+        """An empty index is kept, not reloaded on every call."""
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "breached.idx"
+            write_index([], path)
+            validator = BreachedPasswordValidator(path)
+            validator.validate("password1")
+            index = validator._index
+            self.assertEqual(len(index), 0)
+            validator.validate("password2")
+            self.assertIs(validator._index, index)
+            index.close()
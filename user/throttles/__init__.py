@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""User related throttles."""
+
+from ._login_throttle import LoginThrottle  # noqa: F401.
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+from hashlib import sha256
+from time import time
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LoginThrottle:
+    """Counts failed logins per email and per client IP in the cache.
+
+    Each key uses a sliding window approximated from two fixed window buckets,
+    incremented atomically so counts are shared across worker processes.
+    Reaching a limit locks the key out, for twice as long on each repeat.
+    """
+
+    key_prefix = "user:login-throttle"
+
+    def __init__(
+        self,
+        cache: str = "default",
+        window: int = 300,
+        email_limit: int = 5,
+        ip_limit: int = 50,
+        backoff: int = 60,
+        max_backoff: int = 3600,
+    ) -> None:
+        """Sets up the limits.
+
+        Args:
+            cache (str): Alias of the cache to count in. Defaults to "default".
+            window (int): Seconds failures are counted over. Defaults to 300.
+            email_limit (int): Failures allowed per email in the window.
+                Defaults to 5.
+            ip_limit (int): Failures allowed per client IP in the window.
+                Defaults to 50.
+            backoff (int): Seconds of the first lockout. Defaults to 60.
+            max_backoff (int): Maximum seconds of a lockout. Defaults to 3600.
+        """
+        self._cache = caches[cache]
+        self._window = window
+        self._limits = {"email": email_limit, "ip": ip_limit}
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+
+    @classmethod
+    def from_settings(cls) -> "LoginThrottle":
+        """A throttle configured by settings.USER_LOGIN_THROTTLE.
+
+        Returns:
+            LoginThrottle: The throttle.
+        """
+        return cls(
+            **{
+                name.lower(): value
+                for name, value in settings.USER_LOGIN_THROTTLE.items()
+            }
+        )
+
+    def _keys(self, email: Optional[str], ip: Optional[str]) -> dict[str, str]:
+        """Cache keys for the email and IP being throttled.
+
+        Args:
+            email (str, optional): The email logged in with.
+            ip (str, optional): The client IP.
+
+        Returns:
+            dict[str, str]: The cache key prefix for each known scope.
+        """
+        keys = {}
+        for scope, value in (("email", email), ("ip", ip)):
+            if value:
+                digest = sha256(value.strip().lower().encode()).hexdigest()[:32]
+                keys[scope] = f"{self.key_prefix}:{scope}:{digest}"
+        return keys
+
+    def blocked_for(self, email: Optional[str], ip: Optional[str]) -> int:
+        """Seconds until a login for the email from the IP may be attempted.
+
+        Args:
+            email (str, optional): The email logged in with.
+            ip (str, optional): The client IP.
+
+        Returns:
+            int: The seconds to wait, 0 if not blocked.
+        """
+        locks = self._cache.get_many(
+            [f"{key}:lock" for key in self._keys(email, ip).values()]
+        )
+        return max((int(until - time()) + 1 for until in locks.values()), default=0)
+
+    def record_failure(self, email: Optional[str], ip: Optional[str]) -> None:
+        """Count a failed login, locking out any scope over its limit.
+
+        Args:
+            email (str, optional): The email logged in with.
+            ip (str, optional): The client IP.
+        """
+        now = time()
+        for scope, key in self._keys(email, ip).items():
+            if self._increment(key, now) >= self._limits[scope]:
+                self._lock(key, now)
+
+    def reset(self, email: Optional[str]) -> None:
+        """Forget failures for an email after a successful login.
+
+        Args:
+            email (str, optional): The email logged in with.
+        """
+        bucket = int(time() // self._window)
+        for key in self._keys(email, None).values():
+            self._cache.delete_many(
+                [f"{key}:{bucket}", f"{key}:{bucket - 1}", f"{key}:strikes"]
+            )
+
+    async def ablocked_for(self, email: Optional[str], ip: Optional[str]) -> int:
+        """As blocked_for(), without blocking the event loop.
+
+        Args:
+            email (str, optional): The email logged in with.
+            ip (str, optional): The client IP.
+
+        Returns:
+            int: The seconds to wait, 0 if not blocked.
+        """
+        return await sync_to_async(self.blocked_for)(email, ip)
+
+    async def arecord_failure(self, email: Optional[str], ip: Optional[str]) -> None:
+        """As record_failure(), without blocking the event loop.
+
+        Args:
+            email (str, optional): The email logged in with.
+            ip (str, optional): The client IP.
+        """
+        await sync_to_async(self.record_failure)(email, ip)
+
+    async def areset(self, email: Optional[str]) -> None:
+        """As reset(), without blocking the event loop.
+
+        Args:
+            email (str, optional): The email logged in with.
+        """
+        await sync_to_async(self.reset)(email)
+
+    def _increment(self, key: str, now: float) -> float:
+        """Count a failure for a key.
+
+        Args:
+            key (str): The scope's cache key prefix.
+            now (float): The current time.
+
+        Returns:
+            float: The failures in the sliding window, including this one.
+        """
+        bucket = int(now // self._window)
+        previous = self._cache.get(f"{key}:{bucket - 1}", 0)
+        current = self._incr(f"{key}:{bucket}", 2 * self._window)
+        return current + previous * (1 - (now % self._window) / self._window)
+
+    def _lock(self, key: str, now: float) -> None:
+        """Lock a key out, for twice as long as the last time.
+
+        Args:
+            key (str): The scope's cache key prefix.
+            now (float): The current time.
+        """
+        strikes = self._incr(f"{key}:strikes", self._max_backoff)
+        duration = min(self._backoff * 2 ** min(strikes - 1, 32), self._max_backoff)
+        self._cache.set(f"{key}:lock", now + duration, timeout=duration)
+
+    def _incr(self, key: str, timeout: int) -> int:
+        """Atomically increment a counter, creating it if needed.
+
+        Args:
+            key (str): The counter's cache key.
+            timeout (int): Seconds to keep a new counter for.
+
+        Returns:
+            int: The incremented count.
+        """
+        self._cache.add(key, 0, timeout=timeout)
+        try:
+            return self._cache.incr(key)
+        except ValueError:
+            # Expired between add and incr.
+            self._cache.add(key, 1, timeout=timeout)
+            return 1
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""User URL Configuration, of the async JSON API."""
+from django.urls import path
+
+from . import views
+
+app_name = "user"
+urlpatterns = [
+    path("register", views.register, name="register"),
+    path("login", views.login, name="login"),
+    path("profile", views.profile, name="profile"),
+    path("email-available", views.email_available, name="email_available"),
+]
@@ -2,5 +2,17 @@
 """User related validators."""
 
 from ._alpha_and_numeric_validator import AlphaAndNumericValidator  # noqa: F401.
+from ._breached_password_index import (  # noqa: F401.
+    DEFAULT_BUCKET_BITS,
+    BreachedPasswordIndex,
+    hash_prefix,
+    password_prefix,
+    write_index,
+)
+from ._breached_password_validator import BreachedPasswordValidator  # noqa: F401.
 from ._each_case_validator import EachCaseValidator  # noqa: F401.
+from ._password_policy_validator import PasswordPolicyValidator  # noqa: F401.
 from ._special_characters_validator import SpecialCharactersValidator  # noqa: F401.
+from ._user_attribute_similarity_validator import (  # noqa: F401.
+    UserAttributeSimilarityValidator,
+)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# Magic, version, bucket bits and entry count, then the bucket offsets and the
+# sorted entries, all little-endian unsigned 64 bit integers.
+HEADER = struct.Struct("<4sHHQ")
+MAGIC = b"BPWI"
+VERSION = 1
+DEFAULT_BUCKET_BITS = 16
+
+
+def password_prefix(password: str) -> int:
+    """The first 64 bits of a password's SHA-1, as breach dumps list them.
+
+    Args:
+        password (str): The password.
+
+    Returns:
+        int: The prefix.
+    """
+    return int.from_bytes(hashlib.sha1(password.encode()).digest()[:8], "big")
+
+
+def hash_prefix(sha1_hex: str) -> int:
+    """The first 64 bits of a hex encoded SHA-1.
+
+    Args:
+        sha1_hex (str): The hash.
+
+    Returns:
+        int: The prefix.
+    """
+    return int(sha1_hex[:16], 16)
+
+
+def write_index(
+    prefixes: Iterable[int],
+    path: Path,
+    bucket_bits: int = DEFAULT_BUCKET_BITS,
+) -> int:
+    """Write an index of sorted hash prefixes, dropping duplicates.
+
+    The entries are streamed to the file, then the bucket offsets, counted as
+    they go, are written before them.
+
+    Args:
+        prefixes (Iterable[int]): The prefixes, in ascending order.
+        path (Path): The index file.
+        bucket_bits (int): The leading bits of a prefix that pick its bucket.
+
+    Returns:
+        int: The number of entries written.
+
+    Raises:
+        ValueError: If the prefixes aren't in order.
+    """
+    buckets = array("Q", bytes(8 * ((1 << bucket_bits) + 1)))
+    shift = 64 - bucket_bits
+    count = 0
+    previous: Optional[int] = None
+    chunk = array("Q")
+    with open(path, "wb") as file:
+        file.seek(HEADER.size + buckets.itemsize * len(buckets))
+        for prefix in prefixes:
+            if prefix == previous:
+                continue
+            if previous is not None and prefix < previous:
+                raise ValueError("The prefixes must be sorted.")
+            previous = prefix
+            buckets[(prefix >> shift) + 1] += 1
+            chunk.append(prefix)
+            count += 1
+            if len(chunk) >= 65536:
+                _write_little_endian(file, chunk)
+                chunk = array("Q")
+        _write_little_endian(file, chunk)
+        for bucket in range(1, len(buckets)):
+            buckets[bucket] += buckets[bucket - 1]
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, bucket_bits, count))
+        _write_little_endian(file, buckets)
+    return count
+
+
+def _write_little_endian(file: BinaryIO, values: array) -> None:
+    """Write unsigned 64 bit integers little-endian.
+
+    Args:
+        file (BinaryIO): The binary file.
+        values (array): The integers.
+    """
+    if sys.byteorder == "big":
+        values = array("Q", values)
+        values.byteswap()
+    values.tofile(file)
+
+
+class BreachedPasswordIndex:
+    """A memory mapped index of breached passwords' SHA-1 prefixes.
+
+    The file is mapped read-only, so every process shares the same pages of
+    the page cache, and only the pages a lookup touches are read. A lookup
+    finds the prefix's bucket from its leading bits, then binary searches
+    the bucket's sorted entries.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Map the index.
+
+        Args:
+            path (Path): The index file.
+
+        Raises:
+            ValueError: If the file isn't an index this version can read.
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.bucket_bits, self.count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} isn't a version {VERSION} password index.")
+        if sys.byteorder == "big":
+            raise ValueError("Password indexes can only be read little-endian.")
+        self._view = memoryview(self._map)
+        start = HEADER.size
+        end = start + 8 * ((1 << self.bucket_bits) + 1)
+        self._buckets = self._view[start:end].cast("Q")
+        self._entries = self._view[end : end + 8 * self.count].cast("Q")
+        self._shift = 64 - self.bucket_bits
+
+    def __len__(self) -> int:
+        """The number of entries.
+
+        Returns:
+            int: The count.
+        """
+        return self.count
+
+    def contains_prefix(self, prefix: int) -> bool:
+        """Whether a SHA-1 prefix is in the index.
+
+        Args:
+            prefix (int): The prefix.
+
+        Returns:
+            bool: True if it is.
+        """
+        bucket = prefix >> self._shift
+        low, high = self._buckets[bucket], self._buckets[bucket + 1]
+        index = bisect_left(self._entries, prefix, low, high)
+        return index < high and self._entries[index] == prefix
+
+    def __contains__(self, password: str) -> bool:
+        """Whether a password is in the index.
+
+        Args:
+            password (str): The password.
+
+        Returns:
+            bool: True if it is.
+        """
+        return self.contains_prefix(password_prefix(password))
+
+    def close(self) -> None:
+        """Unmap the index."""
+        self._buckets.release()
+        self._entries.release()
+        self._view.release()
+        self._map.close()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+
+from ._breached_password_index import BreachedPasswordIndex
+
+if TYPE_CHECKING:
+    from ..models import User
+
+logger = logging.getLogger(__name__)
+
+
+class BreachedPasswordValidator:
+    """Validates a password hasn't appeared in a data breach.
+
+    Looks passwords up in an index built by `manage.py
+    build_breached_password_index`, mapped into memory on first use. Like
+    Django's common password list, passwords are also looked up lowercased and
+    stripped, so an index built with --include-common rejects what that list
+    does. Without an index it falls back to the common password list.
+    """
+
+    def __init__(self, index_path: Union[str, Path]) -> None:
+        """Sets up the index to check passwords against.
+
+        Args:
+            index_path (Union[str, Path]): The index file.
+        """
+        self.index_path = Path(index_path)
+        self._index: Optional[Union[BreachedPasswordIndex, CommonPasswordValidator]]
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Union[BreachedPasswordIndex, CommonPasswordValidator]:
+        """Map the index, or load the fallback if there isn't one.
+
+        Returns:
+            BreachedPasswordIndex | CommonPasswordValidator: The index, or the
+                common password validator.
+        """
+        with self._lock:
+            if self._index is None:
+                if self.index_path.is_file():
+                    self._index = BreachedPasswordIndex(self.index_path)
+                else:
+                    logger.warning(
+                        "No breached password index at %s, falling back to the"
+                        " common password list.",
+                        self.index_path,
+                    )
+                    self._index = CommonPasswordValidator()
+        return self._index
+
+    def validate(
+        self,
+        password: str,
+        user: Optional[type["User"]] = None,
+    ) -> None:
+        """Validates the password.
+
+        Args:
+            password (str): Password to be validated.
+            user (user.models.User, optional): User trying
+                to set the password. Defaults to None.
+
+        Raises:
+            ValidationError: If the password has been breached.
+        """
+        index = self._load() if self._index is None else self._index
+        if isinstance(index, CommonPasswordValidator):
+            index.validate(password, user)
+        elif password in index or password.lower().strip() in index:
+            raise ValidationError(
+                _("This password has appeared in a data breach."),
+                code="password_breached",
+            )
+
+    def get_help_text(self) -> str:
+        """Returns help text.
+
+        Returns:
+            str: Help text.
+        """
+        return _("Your password can’t be one that has appeared in a data breach.")
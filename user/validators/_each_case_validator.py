@@ -1,14 +1,10 @@
 # -*- coding: utf-8 -*-
 from typing import Optional
 
-from django.core.exceptions import ValidationError
-from django.utils.functional import Promise
-from django.utils.translation import gettext_lazy as _
+from ._password_policy_validator import PasswordPolicyValidator
 
-from ..models import User
 
-
-class EachCaseValidator:
+class EachCaseValidator(PasswordPolicyValidator):
     """Validates upper and lowercase characters are present in a password."""
 
     def __init__(
@@ -24,63 +20,10 @@ class EachCaseValidator:
             min_lowercase (Optional[int], optional): Minimum number of
                 lowercase characters to require. Defaults to 1.
         """
-        self._min_uppercase = min_uppercase
-        self._min_lowercase = min_lowercase
-
-    @property
-    def _message(self) -> type[Promise]:
-        """Validation message.
-
-        Returns:
-            django.utils.functional.Promise: Lazy translated validation message.
-        """
-        return _(
-            "This password must contain at least %(number_upper)d"
-            " uppercase and %(number_lower)d lowercase characters.",
+        super().__init__(
+            min_alpha=0,
+            min_numeric=0,
+            min_uppercase=min_uppercase,
+            min_lowercase=min_lowercase,
+            min_special=0,
         )
-
-    @property
-    def _message_params(self) -> dict[str:int]:
-        """Validation message parameters.
-
-        Returns:
-            dict[str: int]: A dictionary of validation message formatting values.
-        """
-        return {
-            "number_upper": self._min_uppercase,
-            "number_lower": self._min_lowercase,
-        }
-
-    def validate(
-        self,
-        password: str,
-        user: Optional[type[User]] = None,
-    ) -> None:
-        """Validates the password.
-
-        Args:
-            password (str): Password to be validated.
-            user (user.models.User, optional): User trying
-                to set the password. Defaults to None.
-
-        Raises:
-            ValidationError: If not enough uppercase or
-                lowercase characters are in the password.
-        """
-        if (
-            len([c for c in password if c.isupper()]) < self._min_uppercase
-            or len([c for c in password if c.islower()]) < self._min_lowercase
-        ):
-            raise ValidationError(
-                self._message,
-                code="password_case_not_varied",
-                params=self._message_params,
-            )
-
-    def get_help_text(self) -> str:
-        """Returns help text.
-
-        Returns:
-            str: Help text.
-        """
-        return self._message % self._message_params
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+from collections import Counter
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from django.core.exceptions import ValidationError
+from django.utils.functional import Promise
+from django.utils.translation import gettext_lazy as _
+
+if TYPE_CHECKING:
+    from ..models import User
+
+
+SPECIAL_CHARACTERS = ";<=>?@[\\]^_`{|}~¡¢£¤¥¦§¨©«¬®¯°±´¶·¸»¼½¾¿×÷"
+
+ALPHA = 1
+NUMERIC = 2
+UPPERCASE = 4
+LOWERCASE = 8
+SPECIAL = 16
+CHARACTER_CLASSES = (ALPHA, NUMERIC, UPPERCASE, LOWERCASE, SPECIAL)
+
+_SPECIAL_CHARACTERS = frozenset(SPECIAL_CHARACTERS)
+
+
+@lru_cache(maxsize=4096)
+def _classify(character: str) -> int:
+    """Character classes of a character.
+
+    Args:
+        character (str): A single character.
+
+    Returns:
+        int: The character's class flags or'ed together.
+    """
+    return (
+        (character.isalpha() and ALPHA)
+        | (character.isdigit() and NUMERIC)
+        | (character.isupper() and UPPERCASE)
+        | (character.islower() and LOWERCASE)
+        | (character in _SPECIAL_CHARACTERS and SPECIAL)
+    )
+
+
+# Translates each Latin-1 character to the character whose code point is its
+# class flags. Anything else is left as is, so is never mistaken for flags.
+_CLASS_TABLE = {code: _classify(chr(code)) for code in range(256)}
+
+
+def count_character_classes(password: str) -> dict[int, int]:
+    """Count the characters of each class in a password in a single pass.
+
+    Args:
+        password (str): The password to count.
+
+    Returns:
+        dict[int, int]: The number of characters in each class.
+    """
+    totals = dict.fromkeys(CHARACTER_CLASSES, 0)
+    for key, count in Counter(password.translate(_CLASS_TABLE)).items():
+        flags = ord(key)
+        if flags > 255:
+            flags = _classify(key)
+        for character_class in CHARACTER_CLASSES:
+            if flags & character_class:
+                totals[character_class] += count
+    return totals
+
+
+class _Rule(NamedTuple):
+    """A policy rule and the character class minimums it requires."""
+
+    code: str
+    message: Promise
+    params: dict[str, object]
+    minimums: tuple[tuple[int, int], ...]
+
+    def is_violated(self, totals: dict[int, int]) -> bool:
+        """Whether character class totals fall short of the rule.
+
+        Args:
+            totals (dict[int, int]): The number of characters in each class.
+
+        Returns:
+            bool: True if any minimum isn't met.
+        """
+        return any(totals[cls] < minimum for cls, minimum in self.minimums)
+
+    def error(self) -> ValidationError:
+        """The validation error for the rule.
+
+        Returns:
+            ValidationError: The error with the rule's message and code.
+        """
+        return ValidationError(self.message, code=self.code, params=self.params)
+
+    def help_text(self) -> str:
+        """Help text for the rule.
+
+        Returns:
+            str: Help text.
+        """
+        return self.message % self.params
+
+
+class PasswordPolicyValidator:
+    """Validates the character classes present in a password.
+
+    Every character is classified once using a precomputed lookup table, then
+    all rules are checked against the totals so every violation is reported.
+    """
+
+    def __init__(
+        self,
+        min_alpha: Optional[int] = 1,
+        min_numeric: Optional[int] = 1,
+        min_uppercase: Optional[int] = 1,
+        min_lowercase: Optional[int] = 1,
+        min_special: Optional[int] = 1,
+    ) -> None:
+        """Sets up the number of characters of each class to require.
+
+        A rule is skipped if all of its minimums are zero.
+
+        Args:
+            min_alpha (int, optional): Minimum number of
+                alpha characters to require. Defaults to 1.
+            min_numeric (int, optional): Minimum number of
+                numeric characters to require. Defaults to 1.
+            min_uppercase (int, optional): Minimum number of
+                uppercase characters to require. Defaults to 1.
+            min_lowercase (int, optional): Minimum number of
+                lowercase characters to require. Defaults to 1.
+            min_special (int, optional): Minimum number of
+                special characters to require. Defaults to 1.
+        """
+        rules = (
+            _Rule(
+                code="password_not_alphanumeric",
+                message=_(
+                    "This password must contain at least %(number_alpha)d"
+                    " alpha and %(number_numeric)d numeric characters.",
+                ),
+                params={"number_alpha": min_alpha, "number_numeric": min_numeric},
+                minimums=((ALPHA, min_alpha), (NUMERIC, min_numeric)),
+            ),
+            _Rule(
+                code="password_case_not_varied",
+                message=_(
+                    "This password must contain at least %(number_upper)d"
+                    " uppercase and %(number_lower)d lowercase characters.",
+                ),
+                params={"number_upper": min_uppercase, "number_lower": min_lowercase},
+                minimums=((UPPERCASE, min_uppercase), (LOWERCASE, min_lowercase)),
+            ),
+            _Rule(
+                code="password_not_enough_specials",
+                message=_(
+                    "This password must contain at least %(number_required)d"
+                    " special characters. i.e %(special_characters)s",
+                ),
+                params={
+                    "number_required": min_special,
+                    "special_characters": SPECIAL_CHARACTERS,
+                },
+                minimums=((SPECIAL, min_special),),
+            ),
+        )
+        self._rules = tuple(
+            rule
+            for rule in rules
+            if any(minimum > 0 for _cls, minimum in rule.minimums)
+        )
+
+    def errors(self, password: str) -> list[ValidationError]:
+        """Every rule the password violates.
+
+        Args:
+            password (str): Password to be checked.
+
+        Returns:
+            list[ValidationError]: An error per violated rule, in rule order.
+        """
+        totals = count_character_classes(password)
+        return [rule.error() for rule in self._rules if rule.is_violated(totals)]
+
+    def validate(
+        self,
+        password: str,
+        user: Optional[type["User"]] = None,
+    ) -> None:
+        """Validates the password.
+
+        Args:
+            password (str): Password to be validated.
+            user (user.models.User, optional): User trying
+                to set the password. Defaults to None.
+
+        Raises:
+            ValidationError: With every violated rule, if any are.
+        """
+        errors = self.errors(password)
+        if errors:
+            # A single error keeps its code and params, as before the rules
+            # were checked together.
+            raise ValidationError(errors[0] if len(errors) == 1 else errors)
+
+    def validate_many(
+        self,
+        passwords: Iterable[str],
+    ) -> list[Optional[ValidationError]]:
+        """Validates many passwords, e.g. for bulk imports and audits.
+
+        Args:
+            passwords (Iterable[str]): Passwords to be validated.
+
+        Returns:
+            list[ValidationError | None]: For each password in order, an error
+                with every violated rule, or None if it is valid.
+        """
+        return [
+            ValidationError(errors[0] if len(errors) == 1 else errors)
+            if errors
+            else None
+            for errors in map(self.errors, passwords)
+        ]
+
+    def get_help_text(self) -> str:
+        """Returns help text.
+
+        Returns:
+            str: Help text.
+        """
+        return " ".join(rule.help_text() for rule in self._rules)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import re
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from django.contrib.auth import password_validation
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.utils.translation import gettext_lazy as _
+
+if TYPE_CHECKING:
+    from ..models import User
+
+NON_WORD = re.compile(r"\W+")
+MESSAGE = _("The password is too similar to the %(verbose_name)s.")
+
+
+class _Part(NamedTuple):
+    """A lowercased user attribute value, or a word of it, to compare with."""
+
+    attribute_name: str
+    value: str
+
+
+class UserAttributeSimilarityValidator(
+    password_validation.UserAttributeSimilarityValidator
+):
+    """Validates a password isn't too similar to the user's attributes.
+
+    Makes the same decisions as Django's validator, which rejects a password
+    when SequenceMatcher.quick_ratio() with an attribute value, or a word of
+    it, reaches max_similarity. Values too short or too long to reach the
+    threshold are skipped by length alone. For the others, rather than
+    building a SequenceMatcher, the ratio is worked out from how often each of
+    the value's characters appears in both, which the length checks bound to
+    a few passes over at most 19 times the value's length.
+    """
+
+    def _parts(self, user: "User") -> list[_Part]:
+        """The attribute values and their words, in Django's order.
+
+        Args:
+            user (User): User trying to set the password.
+
+        Returns:
+            list[_Part]: The parts to compare the password with.
+        """
+        parts = []
+        for attribute_name in self.user_attributes:
+            value = getattr(user, attribute_name, None)
+            if not value or not isinstance(value, str):
+                continue
+            value_lower = value.lower()
+            parts += [
+                _Part(attribute_name, value_part)
+                for value_part in [*NON_WORD.split(value_lower), value_lower]
+            ]
+        return parts
+
+    def _similar_part(self, password: str, parts: list[_Part]) -> Optional[_Part]:
+        """The first part the password is too similar to.
+
+        Args:
+            password (str): Password to be checked.
+            parts (list[_Part]): The parts to compare it with.
+
+        Returns:
+            _Part | None: The part, or None if the password is far enough from
+                all of them.
+        """
+        password = password.lower()
+        password_length = len(password)
+        length_bound = self.max_similarity / 2 * password_length
+        for part in parts:
+            part_length = len(part.value)
+            # Django's exceeds_maximum_length_ratio().
+            if password_length >= 10 * part_length and part_length < length_bound:
+                continue
+            total = password_length + part_length
+            if not total:
+                return part
+            # The ratio can't beat the shorter string matching entirely, as
+            # SequenceMatcher.real_quick_ratio() bounds it.
+            if 2.0 * min(password_length, part_length) / total < self.max_similarity:
+                continue
+            matches = sum(
+                min(part.value.count(character), password.count(character))
+                for character in set(part.value)
+            )
+            if 2.0 * matches / total >= self.max_similarity:
+                return part
+        return None
+
+    def _verbose_name(self, user: "User", part: _Part) -> str:
+        """The name of the attribute a part is from, for the error message.
+
+        Args:
+            user (User): User trying to set the password.
+            part (_Part): The part the password is too similar to.
+
+        Returns:
+            str: The attribute's field's verbose name, or else its name.
+        """
+        try:
+            return str(user._meta.get_field(part.attribute_name).verbose_name)
+        except FieldDoesNotExist:
+            return part.attribute_name
+
+    def validate(
+        self,
+        password: str,
+        user: Optional[type["User"]] = None,
+    ) -> None:
+        """Validates the password.
+
+        Args:
+            password (str): Password to be validated.
+            user (user.models.User, optional): User trying
+                to set the password. Defaults to None.
+
+        Raises:
+            ValidationError: If the password is too similar to an attribute.
+        """
+        if not user:
+            return
+        part = self._similar_part(password, self._parts(user))
+        if part is not None:
+            raise ValidationError(
+                MESSAGE,
+                code="password_too_similar",
+                params={"verbose_name": self._verbose_name(user, part)},
+            )
+
+    def validate_many(
+        self,
+        passwords: Iterable[str],
+        user: Optional[type["User"]] = None,
+    ) -> list[Optional[ValidationError]]:
+        """Validates many passwords for a user, splitting its attributes once.
+
+        Args:
+            passwords (Iterable[str]): Passwords to be validated.
+            user (user.models.User, optional): User trying
+                to set the passwords. Defaults to None.
+
+        Returns:
+            list[ValidationError | None]: For each password in order, an error
+                if it is too similar to an attribute, or None if it is valid.
+        """
+        if not user:
+            return [None for _password in passwords]
+        parts = self._parts(user)
+        return [
+            None
+            if part is None
+            else ValidationError(
+                MESSAGE,
+                code="password_too_similar",
+                params={"verbose_name": self._verbose_name(user, part)},
+            )
+            for part in (self._similar_part(password, parts) for password in passwords)
+        ]
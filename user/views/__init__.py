@@ -1,2 +1,11 @@
 # -*- coding: utf-8 -*-
 """User related views."""
+
+from ._user_api import (  # noqa: F401.
+    ApiError,
+    api_view,
+    email_available,
+    login,
+    profile,
+    register,
+)
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+import json
+from collections.abc import Awaitable
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.contrib import auth
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed, JsonResponse
+
+from ..caches import UserCache
+from ..hashers import get_hashing_service
+from ..middleware import aget_user
+from ..models import User
+from ..throttles import LoginThrottle
+
+View = Callable[..., Awaitable[HttpResponse]]
+BACKEND = "user.backends.UserBackend"
+PROFILE_FIELDS = ("first_name", "last_name")
+EMAIL_TAKEN = "A user with that email address already exists."
+
+
+class ApiError(Exception):
+    """An error to respond to a JSON API request with."""
+
+    def __init__(
+        self,
+        errors: dict[str, list[str]],
+        status: int = 400,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        """Sets up the error response.
+
+        Args:
+            errors (dict[str, list[str]]): Messages by field, or "__all__".
+            status (int): The response status. Defaults to 400.
+            headers (dict[str, str], optional): Extra response headers.
+                Defaults to None.
+        """
+        super().__init__(errors)
+        self.errors = errors
+        self.status = status
+        self.headers = headers
+
+    def response(self) -> JsonResponse:
+        """The error response.
+
+        Returns:
+            JsonResponse: The messages, as {"errors": {field: [message]}}.
+        """
+        return JsonResponse(
+            {"errors": self.errors}, status=self.status, headers=self.headers
+        )
+
+
+def api_view(*methods: str) -> Callable[[View], View]:
+    """Make an async view a JSON API view, allowing only some methods.
+
+    Django's view decorators wrap views in sync functions, which would run
+    async views in a thread, so this checks the method itself. Requests with
+    bodies must be JSON, which forms can't send cross-site, so the views are
+    exempt from CSRF checks.
+
+    Args:
+        methods (str): The allowed methods.
+
+    Returns:
+        Callable[[View], View]: The decorator.
+    """
+
+    def decorator(view: View) -> View:
+        @wraps(view)
+        async def api(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            try:
+                return await view(request, *args, **kwargs)
+            except ApiError as error:
+                return error.response()
+
+        api.csrf_exempt = True
+        return api
+
+    return decorator
+
+
+def _body(request: HttpRequest) -> dict[str, Any]:
+    """The request's JSON object.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        dict[str, Any]: The object.
+
+    Raises:
+        ApiError: If the body isn't a JSON object.
+    """
+    if request.content_type != "application/json":
+        raise ApiError({"__all__": ["Send application/json."]}, status=415)
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        raise ApiError({"__all__": ["Send a JSON object."]})
+    return body
+
+
+def _strings(body: dict[str, Any], *names: str) -> dict[str, str]:
+    """Fields of a request's JSON object, which must be strings.
+
+    Args:
+        body (dict[str, Any]): The object.
+        names (str): The fields, all required.
+
+    Returns:
+        dict[str, str]: The fields' values by name.
+
+    Raises:
+        ApiError: If any are missing or not strings.
+    """
+    errors = {
+        name: ["This field is required." if name not in body else "Send a string."]
+        for name in names
+        if not isinstance(body.get(name), str)
+    }
+    if errors:
+        raise ApiError(errors)
+    return {name: body[name] for name in names}
+
+
+def _email(email: str) -> str:
+    """Normalize and validate an email address.
+
+    Args:
+        email (str): The email address.
+
+    Returns:
+        str: The normalized email address.
+
+    Raises:
+        ApiError: If it isn't an email address.
+    """
+    email = User.objects.normalize_email(email.strip())
+    try:
+        validate_email(email)
+    except ValidationError as error:
+        raise ApiError({"email": error.messages}) from error
+    return email
+
+
+def _profile(user: User) -> dict[str, Any]:
+    """A user's profile, as the API returns it.
+
+    Args:
+        user (User): The user.
+
+    Returns:
+        dict[str, Any]: The profile.
+    """
+    return {
+        "id": user.pk,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "date_joined": user.date_joined,
+        "last_login": user.last_login,
+    }
+
+
+async def _authenticated_user(request: HttpRequest) -> User:
+    """The request's logged in user.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        User: The user.
+
+    Raises:
+        ApiError: If no one is logged in.
+    """
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        raise ApiError({"__all__": ["Log in first."]}, status=401)
+    return user
+
+
+@api_view("POST")
+async def register(request: HttpRequest) -> JsonResponse:
+    """Create a user.
+
+    Takes {"email", "password", "first_name", "last_name"}, the names
+    optional but strings if given.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        JsonResponse: The new user's profile.
+
+    Raises:
+        ApiError: If a field is invalid or the email is taken.
+    """
+    body = _body(request)
+    fields = _strings(body, "email", "password")
+    profile = _strings(
+        body, *(name for name in PROFILE_FIELDS if body.get(name) is not None)
+    )
+    user = User(
+        email=_email(fields["email"]),
+        **{name: profile.get(name, "") for name in PROFILE_FIELDS},
+    )
+    try:
+        user.clean_fields(exclude=["password"])
+    except ValidationError as error:
+        raise ApiError(error.message_dict) from error
+    try:
+        validate_password(fields["password"], user)
+    except ValidationError as error:
+        raise ApiError({"password": error.messages}) from error
+    if await User.objects.filter_by_email(user.email).aexists():
+        raise ApiError({"email": [EMAIL_TAKEN]})
+    try:
+        user = await User.objects.acreate(
+            email=user.email,
+            password=await get_hashing_service().amake_password(fields["password"]),
+            **{name: getattr(user, name) for name in PROFILE_FIELDS},
+        )
+    except IntegrityError as error:
+        raise ApiError({"email": [EMAIL_TAKEN]}) from error  # Since the check.
+    return JsonResponse(_profile(user), status=201)
+
+
+@api_view("POST")
+async def login(request: HttpRequest) -> JsonResponse:
+    """Log a user in, as UserBackend would but hashing without blocking.
+
+    Takes {"email", "password"}.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        JsonResponse: The user's profile.
+
+    Raises:
+        ApiError: If the credentials are wrong or the login is throttled.
+    """
+    fields = _strings(_body(request), "email", "password")
+    email = fields["email"]
+    throttle = LoginThrottle.from_settings()
+    ip = request.META.get("REMOTE_ADDR")
+    blocked_for = await throttle.ablocked_for(email, ip)
+    if blocked_for:
+        raise ApiError(
+            {"__all__": ["Too many failed logins, try again later."]},
+            status=429,
+            headers={"Retry-After": str(blocked_for)},
+        )
+    try:
+        user = await User.objects.filter_by_email(email).aget()
+    except User.DoesNotExist:
+        # Hash anyway, so unknown emails take as long as wrong passwords.
+        await get_hashing_service().amake_password(fields["password"])
+    else:
+        valid = await user.acheck_password(fields["password"])
+        if valid and auth.load_backend(BACKEND).user_can_authenticate(user):
+            await throttle.areset(email)
+            await sync_to_async(auth.login)(request, user, backend=BACKEND)
+            return JsonResponse(_profile(user))
+    await throttle.arecord_failure(email, ip)
+    user_login_failed.send(
+        sender=__name__, credentials={"email": email}, request=request
+    )
+    raise ApiError({"__all__": ["The email or password is wrong."]}, status=401)
+
+
+@api_view("GET", "PATCH")
+async def profile(request: HttpRequest) -> JsonResponse:
+    """Read or update the logged in user's profile.
+
+    PATCH takes any of {"first_name", "last_name"}.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        JsonResponse: The profile.
+
+    Raises:
+        ApiError: If no one is logged in or a field is invalid.
+    """
+    user = await _authenticated_user(request)
+    if request.method == "GET":
+        return JsonResponse(_profile(user))
+    body = _body(request)
+    changes = _strings(body, *(name for name in PROFILE_FIELDS if name in body))
+    for name, value in changes.items():
+        setattr(user, name, value)
+    try:
+        user.clean_fields(
+            exclude=[
+                field.name for field in User._meta.fields if field.name not in changes
+            ]
+        )
+    except ValidationError as error:
+        raise ApiError(error.message_dict) from error
+    if changes:
+        await User.objects.filter(pk=user.pk).aupdate(**changes)
+        # Updates skip post_save, which would forget the cached row.
+        await UserCache.from_settings().ainvalidate([user.pk])
+    return JsonResponse(_profile(user))
+
+
+@api_view("GET")
+async def email_available(request: HttpRequest) -> JsonResponse:
+    """Whether an email address is free to register, from ?email=.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        JsonResponse: {"email", "available"}.
+    """
+    email = _email(request.GET.get("email", ""))
+    taken = await User.objects.filter_by_email(email).aexists()
+    return JsonResponse({"email": email, "available": not taken})